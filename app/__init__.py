@@ -1,17 +1,27 @@
-from flask import Flask
+from flask import Flask, jsonify
 from flask_cors import CORS
 from app.config import Config
 from app.routes.ai_routes import ai_bp
+from app.services import warmup
+from app.utils import tracing
+from app.utils.http_caching import finalize_response
+from app.utils.uploads import UploadRequest
 import logging
 
 def create_app():
     # Create the Flask app instance
     app = Flask(__name__)
+    # Stream uploads into size-checked, hashed spool files instead of memory
+    app.request_class = UploadRequest
 
     logging.basicConfig(
         level=logging.INFO,  # Or DEBUG for more verbosity
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+        format="%(asctime)s [%(levelname)s] %(name)s [trace=%(trace_id)s span=%(span_id)s]: %(message)s"
     )
+    # Stamp every log line with the current trace/span ids
+    for handler in logging.getLogger().handlers:
+        if not any(isinstance(f, tracing.TraceContextFilter) for f in handler.filters):
+            handler.addFilter(tracing.TraceContextFilter())
     logger = logging.getLogger(__name__)
     logger.info("Initializing AI Hiring Backend API...")
 
@@ -23,9 +33,21 @@ def create_app():
     # such as job description generation, resume screening, etc.
     app.register_blueprint(ai_bp)
 
+    # One server span per request, continuing the caller's W3C traceparent if sent
+    app.before_request(tracing.start_request_span)
+    app.after_request(tracing.finish_request_span)
+    app.teardown_request(tracing.end_request_span)
+
     # Enable CORS (allow frontend to access backend)
     CORS(app)
 
+    # ETags, If-None-Match -> 304 and gzip/brotli compression for every response
+    app.after_request(finalize_response)
+
+    # Warm pools, caches and the upstream connection before taking traffic
+    if Config.WARMUP_ON_STARTUP:
+        warmup.start()
+
     # (Optional) Import and register blueprints here
     # from app.routes.ai_routes import ai_bp
     # app.register_blueprint(ai_bp)
@@ -63,9 +85,18 @@ def create_app():
 
 
 
-    # Simple health check route
+    @app.errorhandler(413)
+    def request_too_large(e):
+        return jsonify({"error": "Request body too large"}), 413
+
+    # Simple health check route; reports not-ready until warm-up has finished
     @app.route("/health")
     def health_check():
+        if Config.WARMUP_ON_STARTUP:
+            # A worker forked after create_app() warms itself up on its first health check
+            warmup.start()
+            if not warmup.is_ready():
+                return {"status": "warming_up", "warmup": warmup.status()}, 503
         return {"status": "ok"}
 
     return app
@@ -6,6 +6,17 @@ import logging
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+
+def _parse_mapping(value):
+    # Parses "key=value,key2=value2" environment strings into a dict
+    mapping = {}
+    for item in (value or "").split(","):
+        key, sep, val = item.partition("=")
+        if sep and key.strip():
+            mapping[key.strip()] = val.strip()
+    return mapping
+
+
 class Config:
     # print(f"OpenAI API Key: {os.getenv('OPENAI_API_KEY')}")  # Debugging line to check if the key is loaded
     # Environment variables for configuration
@@ -16,6 +27,147 @@ class Config:
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     # Example: Add a default model name if you want
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1")
+    OPENAI_FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-4.1-mini")
+    # Per-task model routing, keyed by task (prompt template name); override with
+    # e.g. MODEL_ROUTES="screen_resume=gpt-4.1,feedback_email=gpt-4.1-nano"
+    MODEL_ROUTES = {
+        "generate_jd": OPENAI_MODEL,
+        "screen_resume": OPENAI_MODEL,
+        "generate_questions": OPENAI_FAST_MODEL,
+        "evaluate_answers": OPENAI_MODEL,
+        "feedback_email": OPENAI_FAST_MODEL,
+        "summarize_resume_chunk": OPENAI_FAST_MODEL,
+        **_parse_mapping(os.getenv("MODEL_ROUTES", "")),
+    }
+    # Optional screening cascade, cheapest model first, e.g. "gpt-4.1-mini,gpt-4.1".
+    # A tier's answer is kept unless its fit score is unparseable or lands within
+    # SCREEN_ESCALATION_BAND points of SCREEN_DECISION_THRESHOLD.
+    SCREEN_CASCADE_MODELS = [m.strip() for m in os.getenv("SCREEN_CASCADE_MODELS", "").split(",") if m.strip()]
+    SCREEN_DECISION_THRESHOLD = int(os.getenv("SCREEN_DECISION_THRESHOLD", "70"))
+    SCREEN_ESCALATION_BAND = int(os.getenv("SCREEN_ESCALATION_BAND", "10"))
+    # Resumes over SCREEN_CHUNKED_MIN_TOKENS (0 = never) are screened map-reduce style:
+    # chunks of ~SCREEN_CHUNK_TOKENS are summarized concurrently (summaries cached for
+    # SCREEN_CHUNK_SUMMARY_TTL seconds), then the summaries are screened in one call
+    SCREEN_CHUNKED_MIN_TOKENS = int(os.getenv("SCREEN_CHUNKED_MIN_TOKENS", "6000"))
+    SCREEN_CHUNK_TOKENS = int(os.getenv("SCREEN_CHUNK_TOKENS", "1500"))
+    SCREEN_CHUNK_CONCURRENCY = int(os.getenv("SCREEN_CHUNK_CONCURRENCY", "8"))
+    SCREEN_CHUNK_SUMMARY_TTL = int(os.getenv("SCREEN_CHUNK_SUMMARY_TTL", str(30 * 24 * 3600)))
+    # Prompt template versions, e.g. "screen_resume=v2" or "screen_resume=v1:90|v2:10"
+    PROMPT_VERSIONS = _parse_mapping(os.getenv("PROMPT_VERSIONS", ""))
+    # Completion cache keyed by (template id, model, prompt); 0 disables it
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "0"))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+    # Opt-in hedged requests: if a task in HEDGED_TASKS hasn't streamed its first
+    # token within the HEDGE_PERCENTILE of recent time-to-first-token, a duplicate
+    # request is raced against it. HEDGE_MAX_RATE caps hedges as a share of calls.
+    HEDGED_TASKS = [t.strip() for t in os.getenv("HEDGED_TASKS", "").split(",") if t.strip()]
+    HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+    HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    HEDGE_MAX_RATE = float(os.getenv("HEDGE_MAX_RATE", "0.1"))
+    HEDGE_MAX_WORKERS = int(os.getenv("HEDGE_MAX_WORKERS", "16"))
+    # Upload limits: Flask rejects bodies over MAX_CONTENT_LENGTH before reading
+    # them; uploaded files stay in memory up to UPLOAD_SPOOL_SIZE, then spool to disk
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", str(10 * 1024 * 1024)))
+    UPLOAD_MAX_FILE_SIZE = int(os.getenv("UPLOAD_MAX_FILE_SIZE", str(5 * 1024 * 1024)))
+    UPLOAD_SPOOL_SIZE = int(os.getenv("UPLOAD_SPOOL_SIZE", str(512 * 1024)))
+    # Parallel PDF parsing for bulk ingestion (process pool) and archive limits
+    PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", str(os.cpu_count() or 2)))
+    # Parser workers are recycled once one exceeds this resident memory (0 = never)
+    PARSER_MAX_RSS_MB = int(os.getenv("PARSER_MAX_RSS_MB", "512"))
+    INGEST_MAX_IN_FLIGHT = int(os.getenv("INGEST_MAX_IN_FLIGHT", str(2 * (os.cpu_count() or 2))))
+    INGEST_SCREEN_CONCURRENCY = int(os.getenv("INGEST_SCREEN_CONCURRENCY", "4"))
+    INGEST_MAX_ARCHIVE_SIZE = int(os.getenv("INGEST_MAX_ARCHIVE_SIZE", str(200 * 1024 * 1024)))
+    # Send resumes to the LLM as compact, sectioned text instead of raw page text
+    COMPACT_RESUME_TEXT = os.getenv("COMPACT_RESUME_TEXT", "True").lower() == "true"
+    # Local skill matching: taxonomy of canonical skills and aliases (defaults to app/data/skills.json)
+    SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH")
+    SKILL_MATCH_IN_SCREENING = os.getenv("SKILL_MATCH_IN_SCREENING", "True").lower() == "true"
+    # Near-duplicate resume detection (MinHash + LSH): screenings of resumes at least
+    # NEAR_DUP_THRESHOLD similar to one already screened for the same JD are reused
+    NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "True").lower() == "true"
+    NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.9"))
+    NEAR_DUP_NUM_PERM = int(os.getenv("NEAR_DUP_NUM_PERM", "64"))
+    NEAR_DUP_BANDS = int(os.getenv("NEAR_DUP_BANDS", "8"))
+    NEAR_DUP_MAX_ENTRIES = int(os.getenv("NEAR_DUP_MAX_ENTRIES", "10000"))
+    # Local state shared by all workers on a host (JD registry, idempotency keys, ...)
+    DATA_DIR = os.getenv("DATA_DIR", ".data")
+    # Response compression (gzip, or brotli when installed) above a size threshold
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+    # Idempotency-Key handling: stored responses are replayed for IDEMPOTENCY_TTL seconds;
+    # a key still marked in-flight after IDEMPOTENCY_LOCK_TTL (e.g. a crashed worker) is released
+    IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))
+    IDEMPOTENCY_LOCK_TTL = int(os.getenv("IDEMPOTENCY_LOCK_TTL", "300"))
+    IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "120"))
+    # Request profiling: requests with "X-Profile: 1", plus a random PROFILE_SAMPLE_RATE
+    # fraction of all API requests (0 = off), are profiled into PROFILE_DIR
+    PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(DATA_DIR, "profiles"))
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    # Tracing: W3C traceparent in/out and per-stage spans; TRACE_EXPORTER is
+    # "none", "console" (log lines) or "file" (JSON lines in TRACE_FILE)
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "True").lower() == "true"
+    TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none").lower()
+    TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(DATA_DIR, "traces.jsonl"))
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+    # Screening question bank: questions are generated once per skill and per title
+    # (QUESTION_BANK_SIZE each) and assembled per request; registered JDs prefill it
+    QUESTION_BANK_ENABLED = os.getenv("QUESTION_BANK_ENABLED", "True").lower() == "true"
+    QUESTION_BANK_PREFILL = os.getenv("QUESTION_BANK_PREFILL", "True").lower() == "true"
+    QUESTION_BANK_SIZE = int(os.getenv("QUESTION_BANK_SIZE", "5"))
+    QUESTION_BANK_WORKERS = int(os.getenv("QUESTION_BANK_WORKERS", "4"))
+    QUESTIONS_PER_TITLE = int(os.getenv("QUESTIONS_PER_TITLE", "2"))
+    QUESTIONS_PER_SKILL = int(os.getenv("QUESTIONS_PER_SKILL", "2"))
+    # Bulk feedback emails: LLM-written templates are cached per (job title, outcome, tone, variant)
+    FEEDBACK_TEMPLATE_TTL = int(os.getenv("FEEDBACK_TEMPLATE_TTL", str(7 * 24 * 3600)))
+    FEEDBACK_MAX_VARIANTS = int(os.getenv("FEEDBACK_MAX_VARIANTS", "5"))
+    FEEDBACK_BULK_MAX_CANDIDATES = int(os.getenv("FEEDBACK_BULK_MAX_CANDIDATES", "10000"))
+    # Answer evaluation: score each question/answer pair separately (concurrently),
+    # caching pair scores by question, normalized answer and rubric version
+    EVALUATE_PER_QUESTION = os.getenv("EVALUATE_PER_QUESTION", "True").lower() == "true"
+    EVALUATION_CONCURRENCY = int(os.getenv("EVALUATION_CONCURRENCY", "8"))
+    ANSWER_SCORE_TTL = int(os.getenv("ANSWER_SCORE_TTL", str(30 * 24 * 3600)))
+    # Requisition pipeline (JD -> questions/screening -> feedback as one task graph)
+    PIPELINE_CONCURRENCY = int(os.getenv("PIPELINE_CONCURRENCY", "8"))
+    PIPELINE_MAX_APPLICANTS = int(os.getenv("PIPELINE_MAX_APPLICANTS", "200"))
+    PIPELINE_MAX_UPLOAD_SIZE = int(os.getenv("PIPELINE_MAX_UPLOAD_SIZE", str(100 * 1024 * 1024)))
+    # Start-up warm-up (templates, skill matcher, store, PDF extraction, parser pool,
+    # upstream connection); /health reports 503 until it finishes
+    WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "False").lower() == "true"
+    WARMUP_UPSTREAM_TIMEOUT = float(os.getenv("WARMUP_UPSTREAM_TIMEOUT", "5"))
+    # Admission control for LLM-backed routes: at most ADMISSION_MAX_IN_FLIGHT requests
+    # run per route and ADMISSION_MAX_QUEUE wait up to ADMISSION_MAX_WAIT seconds;
+    # the rest get 503 + Retry-After. Per-route overrides keyed by view name
+    # (in-flight:queue), e.g. ADMISSION_LIMITS="screen_resume=8:16,run_pipeline=2:0"
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "True").lower() == "true"
+    ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "16"))
+    ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+    ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "10"))
+    ADMISSION_MAX_RETRY_AFTER = int(os.getenv("ADMISSION_MAX_RETRY_AFTER", "120"))
+    ADMISSION_LIMITS = _parse_mapping(os.getenv("ADMISSION_LIMITS", ""))
+    # Request deadlines: each deadline-aware route gets REQUEST_TIMEOUT seconds (0 = none),
+    # or its ROUTE_TIMEOUTS entry (keyed by view name), unless the client sends a shorter
+    # or longer X-Request-Timeout (capped at REQUEST_TIMEOUT_MAX); late requests get 504
+    REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "60"))
+    REQUEST_TIMEOUT_MAX = float(os.getenv("REQUEST_TIMEOUT_MAX", "300"))
+    ROUTE_TIMEOUTS = {
+        "screen_resume": "90",
+        "evaluate_candidate_answers": "90",
+        "generate_feedback_emails": "120",
+        **_parse_mapping(os.getenv("ROUTE_TIMEOUTS", "")),
+    }
+    # Semantic candidate search: screened resumes are embedded once (EMBEDDING_PROVIDER
+    # "openai", or "hashing" for deterministic local vectors) into a memory-mapped
+    # index under DATA_DIR/vectors, searched VECTOR_SEARCH_BATCH rows at a time
+    CANDIDATE_INDEX_ENABLED = os.getenv("CANDIDATE_INDEX_ENABLED", "True").lower() == "true"
+    EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai").lower()
+    EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "512"))
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "128"))
+    EMBEDDING_MAX_TOKENS = int(os.getenv("EMBEDDING_MAX_TOKENS", "8000"))
+    VECTOR_SEARCH_BATCH = int(os.getenv("VECTOR_SEARCH_BATCH", "65536"))
+    CANDIDATE_SEARCH_MAX_K = int(os.getenv("CANDIDATE_SEARCH_MAX_K", "100"))
     USERNAME = os.getenv("USERNAME")
     PASSWORD = os.getenv("PASSWORD")
     
@@ -1,8 +1,16 @@
-from flask import Blueprint, request, jsonify
-from app.services import openai_service
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context
+from app.services import jd_registry, openai_service, requisition_pipeline, resume_ingestion
+from app.utils.admission import admission_controlled
+from app.utils.deadlines import with_deadline
+from app.utils.idempotency import idempotent
 from app.utils.resume_parser import extract_text_from_resume
+from app.utils.resume_sections import PAGE_BREAK
+from app.utils.skill_matcher import get_matcher
+from app.utils.uploads import detach_upload
+import json
 import logging
 from app.config import Config
+from app.utils import admission, metrics, profiling, tracing
 
 # Create the Blueprint for AI-related routes
 ai_bp = Blueprint("ai", __name__)
@@ -10,14 +18,37 @@ logger = logging.getLogger(__name__)
 
 @ai_bp.before_request
 def require_auth_for_all():
-    auth = request.authorization
-    if not auth or auth.username != Config.USERNAME or auth.password != Config.PASSWORD:
+    with tracing.span("auth"):
+        auth = request.authorization
+        authorized = auth and auth.username == Config.USERNAME and auth.password == Config.PASSWORD
+    if not authorized:
         return jsonify({"ERROR": "Unauthorized. Please provide proper username and password to access MY paid-for OpenAI endpoints"}), 401 
-    
+
+# Profiling hooks run after the auth check, so only authenticated callers can profile
+ai_bp.before_request(profiling.start_request_profile)
+ai_bp.after_request(profiling.finish_request_profile)
+ai_bp.teardown_request(profiling.abort_request_profile)
+
+def _template_id(result):
+    # Service results carry the prompt template id; mocked/plain strings don't
+    return getattr(result, "template_id", None)
+
+def _prefill_question_bank(skills, title=None):
+    # Registered JDs tell us which skills questions will be asked about next; bank them in the background
+    if not (Config.QUESTION_BANK_ENABLED and Config.QUESTION_BANK_PREFILL):
+        return
+    try:
+        openai_service.prefill_question_bank(skills, title)
+    except Exception as e:
+        logger.error(f"Error queueing question bank prefill: {e}")
+
 # -----------------------------------------
 # 1. Job Description Generator
 # -----------------------------------------
 @ai_bp.route("/generate-jd", methods=["POST"])
+@with_deadline
+@admission_controlled
+@idempotent
 def generate_jd():
     # Get the job details from the JSON request body
     data = request.json
@@ -39,26 +70,49 @@ def generate_jd():
         logger.error(f"Error generating job description: {e}")
         return jsonify({"error": "Failed to generate job description"}), 500
     
+    # Auto-register the generated JD so screenings can refer to it by id
+    jd_id = None
+    try:
+        record = jd_registry.register_jd(jd, source="generate-jd")[0]
+        jd_id = record["id"]
+        _prefill_question_bank(record["required_skills"] + skills, title)
+    except Exception as e:
+        logger.error(f"Error registering generated job description: {e}")
+
     logger.info("Job description generated successfully")
-    return jsonify({"job_description": jd})
+    return jsonify({"job_description": jd, "jd_id": jd_id, "template_id": _template_id(jd)})
 
 # -----------------------------------------
 # 2. Resume Screening & Fit Scoring
 # -----------------------------------------
 @ai_bp.route("/screen-resume", methods=["POST"])
+@with_deadline
+@admission_controlled
+@idempotent
 def screen_resume():
-    # Expect multipart/form-data with a resume file and job description as text
+    # Expect multipart/form-data with a resume file and either the job description
+    # text or the id of a registered job description (jd_id)
     job_desc = request.form.get("job_description")
+    jd_id = request.form.get("jd_id")
     resume_file = request.files.get("resume")
 
     # Extract resume text
     try:
-        if not (job_desc and resume_file):
+        if not ((job_desc or jd_id) and resume_file):
             logger.error("Missing job description or resume file")
             return jsonify({"error": "Missing required fields"}), 400
-        
+
+        required_skills = None
+        if jd_id:
+            jd_record = jd_registry.get_jd(jd_id)
+            if jd_record is None:
+                logger.error(f"Unknown job description id {jd_id}")
+                return jsonify({"error": "Unknown jd_id"}), 404
+            job_desc, required_skills = jd_record["text"], jd_record["required_skills"]
+
+
         logger.info("Extracting text from resume file")
-        resume_text = extract_text_from_resume(resume_file)
+        resume_text = extract_text_from_resume(resume_file, page_separator=PAGE_BREAK)
     except Exception as e:
         logger.error(f"Error extracting text from resume: {e}")
         return jsonify({"error": "Failed to extract resume text"}), 500
@@ -69,19 +123,34 @@ def screen_resume():
             logger.warning("Resume text is empty after extraction")
             return jsonify({"error": "Resume text is empty"}), 400
         
+        # Skill overlap is plain string matching, so it's done locally rather than by the LLM
+        # (registered JDs already carry their required skills, so only the resume is scanned)
+        skill_match = None
+        if Config.SKILL_MATCH_IN_SCREENING:
+            skill_match = get_matcher().match(required_skills if required_skills is not None else job_desc, resume_text)
+
         logger.info(f"Screening resume for job description: {job_desc[:50]}...")  # Log first 50 chars
-        result = openai_service.screen_resume(job_desc, resume_text)
+        result = openai_service.screen_resume(job_desc, resume_text, skill_match=skill_match)
     except Exception as e:
         logger.error(f"Error screening resume: {e}")
         return jsonify({"error": "Failed to screen resume"}), 500
     
     logger.info("Resume screening completed successfully")
-    return jsonify({"screening_result": result})
+    return jsonify({
+        "screening_result": result,
+        "skill_match": skill_match,
+        "near_duplicate_of": getattr(result, "near_duplicate_of", None),
+        "jd_id": jd_id,
+        "template_id": _template_id(result),
+    })
 
 # -----------------------------------------
 # 3. Screening Questions Generator
 # -----------------------------------------
 @ai_bp.route("/generate-questions", methods=["POST"])
+@with_deadline
+@admission_controlled
+@idempotent
 def generate_questions():
     # Get job title and skills from request JSON
     data = request.json
@@ -105,12 +174,15 @@ def generate_questions():
         return jsonify({"error": "Failed to generate screening questions"}), 500
     
     logger.info("Screening questions generated successfully")
-    return jsonify({"questions": questions})
+    return jsonify({"questions": questions, "template_id": _template_id(questions)})
 
 # -----------------------------------------
 # 4. Candidate Answer Evaluation
 # -----------------------------------------
 @ai_bp.route("/evaluate", methods=["POST"])
+@with_deadline
+@admission_controlled
+@idempotent
 def evaluate_candidate_answers():
     # Get questions and answers from request JSON
     data = request.json
@@ -130,12 +202,19 @@ def evaluate_candidate_answers():
         return jsonify({"error": "Failed to evaluate candidate answers"}), 500
     
     logger.info("Candidate answers evaluated successfully")
-    return jsonify({"evaluation": evaluation})
+    return jsonify({
+        "evaluation": evaluation,
+        "scores": getattr(evaluation, "scores", None),
+        "template_id": _template_id(evaluation),
+    })
 
 # -----------------------------------------
 # 5. Feedback Email Generator
 # -----------------------------------------
 @ai_bp.route("/generate-feedback", methods=["POST"])
+@with_deadline
+@admission_controlled
+@idempotent
 def generate_feedback_email():
     # Get candidate info and outcome from request JSON
     data = request.json
@@ -165,4 +244,196 @@ def generate_feedback_email():
         return jsonify({"error": "Failed to generate feedback email"}), 500
     
     logger.info("Feedback email generated successfully")
-    return jsonify({"email": email})
+    return jsonify({"email": email, "template_id": _template_id(email)})
+
+# -----------------------------------------
+# 6. Bulk Resume Ingestion (zip archive)
+# -----------------------------------------
+@ai_bp.route("/ingest-resumes", methods=["POST"])
+@admission_controlled
+def ingest_resumes():
+    # Expect multipart/form-data with a zip archive of PDFs and an optional job description
+    request.max_content_length = Config.INGEST_MAX_ARCHIVE_SIZE
+    request.max_file_size = Config.INGEST_MAX_ARCHIVE_SIZE
+    archive_file = request.files.get("archive")
+    job_desc = request.form.get("job_description")
+
+    try:
+        if not archive_file:
+            logger.error("Missing archive file")
+            return jsonify({"error": "Missing required fields"}), 400
+
+        # The archive must outlive the request context while results stream out
+        archive = detach_upload(archive_file)
+        results = resume_ingestion.ingest_archive(archive, job_desc)
+    except ValueError as e:
+        logger.error(f"Error opening resume archive: {e}")
+        archive.close()
+        return jsonify({"error": "Archive must be a valid zip file"}), 400
+
+    def generate():
+        # One JSON object per line, flushed as each entry completes
+        try:
+            for record in results:
+                yield json.dumps(record) + "\n"
+        finally:
+            archive.close()
+
+    logger.info("Streaming resume ingestion results")
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+# -----------------------------------------
+# 7. Local Skill Matching
+# -----------------------------------------
+@ai_bp.route("/match-skills", methods=["POST"])
+def match_skills():
+    # Get job description and resume text from request JSON; no LLM call involved
+    data = request.json
+    job_desc = data.get("job_description")
+    resume_text = data.get("resume_text")
+
+    if not job_desc or not resume_text:
+        logger.error("Job description or resume text missing in request")
+        return jsonify({"error": "Job description and resume text are required"}), 400
+    if not isinstance(job_desc, str) or not isinstance(resume_text, str):
+        logger.error("Job description and resume text must be strings")
+        return jsonify({"error": "Job description and resume text must be strings"}), 400
+
+    return jsonify({"skill_match": get_matcher().match(job_desc, resume_text)})
+
+# -----------------------------------------
+# 8. Job Description Registry
+# -----------------------------------------
+@ai_bp.route("/jds", methods=["POST"])
+def register_job_description():
+    # Register a JD once and screen against it by id afterwards
+    data = request.json
+    job_desc = data.get("job_description")
+
+    try:
+        if not job_desc or not isinstance(job_desc, str):
+            logger.error("Job description missing in request")
+            return jsonify({"error": "Job description is required"}), 400
+
+        record, created = jd_registry.register_jd(job_desc)
+    except Exception as e:
+        logger.error(f"Error registering job description: {e}")
+        return jsonify({"error": "Failed to register job description"}), 500
+
+    if created:
+        _prefill_question_bank(record["required_skills"])
+
+    return jsonify(record), 201 if created else 200
+
+@ai_bp.route("/jds/<jd_id>", methods=["GET"])
+def get_job_description(jd_id):
+    record = jd_registry.get_jd(jd_id)
+    if record is None:
+        return jsonify({"error": "Unknown jd_id"}), 404
+    return jsonify(record)
+
+# -----------------------------------------
+# 9. Service Metrics
+# -----------------------------------------
+@ai_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    # Latency, token usage and cache counters, keyed by prompt template id,
+    # plus each route's current in-flight and queued requests
+    return jsonify({**metrics.snapshot(), "admission": admission.snapshot()})
+
+# -----------------------------------------
+# 10. Request Profiles
+# -----------------------------------------
+@ai_bp.route("/profiles", methods=["GET"])
+def get_profiles():
+    # Ids of profiles captured via "X-Profile: 1" or PROFILE_SAMPLE_RATE, newest first
+    return jsonify({"profiles": profiling.list_profiles()})
+
+@ai_bp.route("/profiles/<profile_id>", methods=["GET"])
+def get_profile(profile_id):
+    # ?format=folded (default) for flamegraph tools, ?format=prof for pstats/snakeviz
+    kind = request.args.get("format", "folded")
+    path = profiling.profile_path(profile_id, kind)
+    if path is None:
+        return jsonify({"error": "Unknown profile"}), 404
+    mimetype = "text/plain" if kind == "folded" else "application/octet-stream"
+    return send_file(path, mimetype=mimetype, as_attachment=kind == "prof")
+
+# -----------------------------------------
+# 11. Bulk Feedback Emails
+# -----------------------------------------
+@ai_bp.route("/generate-feedback/bulk", methods=["POST"])
+@with_deadline
+@admission_controlled
+@idempotent
+def generate_feedback_emails():
+    # One LLM-written template per (job_title, outcome, tone), rendered locally per candidate
+    data = request.json
+    candidate_names = data.get("candidate_names")
+    job_title = data.get("job_title")
+    outcome = data.get("outcome")
+    tone = data.get("tone", "professional")
+    variants = data.get("variants", 1)
+
+    try:
+        if not candidate_names or not job_title or not outcome:
+            logger.error("Candidate names, job title, and outcome are required")
+            return jsonify({"error": "Candidate names, job title, and outcome are required"}), 400
+        if not isinstance(candidate_names, list) or not all(isinstance(name, str) and name.strip() for name in candidate_names):
+            logger.error("Candidate names must be a list of non-empty strings")
+            return jsonify({"error": "Candidate names must be a list of non-empty strings"}), 400
+        if len(candidate_names) > Config.FEEDBACK_BULK_MAX_CANDIDATES:
+            logger.error("Too many candidates in bulk feedback request")
+            return jsonify({"error": f"At most {Config.FEEDBACK_BULK_MAX_CANDIDATES} candidates are allowed"}), 400
+        if outcome not in ["accepted", "rejected"]:
+            logger.error("Outcome must be 'accepted' or 'rejected'")
+            return jsonify({"error": "Outcome must be 'accepted' or 'rejected'"}), 400
+        if tone not in ["professional", "friendly", "formal"]:
+            logger.error("Tone must be 'professional', 'friendly', or 'formal'")
+            return jsonify({"error": "Tone must be 'professional', 'friendly', or 'formal'"}), 400
+        if not isinstance(variants, int) or isinstance(variants, bool) or not 1 <= variants <= Config.FEEDBACK_MAX_VARIANTS:
+            logger.error("Invalid number of template variants")
+            return jsonify({"error": f"Variants must be an integer between 1 and {Config.FEEDBACK_MAX_VARIANTS}"}), 400
+
+        logger.info(f"Generating {len(candidate_names)} feedback emails for {job_title} with outcome {outcome}")
+        emails, template_ids = openai_service.generate_feedback_emails(candidate_names, job_title, outcome, tone, variants)
+    except Exception as e:
+        logger.error(f"Error generating feedback emails: {e}")
+        return jsonify({"error": "Failed to generate feedback emails"}), 500
+
+    logger.info("Feedback emails generated successfully")
+    return jsonify({"emails": emails, "count": len(emails), "template_id": ",".join(template_ids)})
+
+# -----------------------------------------
+# 12. Requisition Pipeline
+# -----------------------------------------
+@ai_bp.route("/pipeline", methods=["POST"])
+@admission_controlled
+def run_pipeline():
+    # JSON body with the spec, or multipart/form-data with a "spec" JSON field plus resume files
+    request.max_content_length = Config.PIPELINE_MAX_UPLOAD_SIZE
+    resume_files = {}
+    try:
+        if request.mimetype == "multipart/form-data":
+            spec = json.loads(request.form.get("spec") or "null")
+            # Uploads must outlive the request context while results stream out
+            resume_files = {name: detach_upload(file) for name, file in request.files.items()}
+        else:
+            spec = request.get_json(silent=True)
+        if not spec:
+            logger.error("Missing pipeline spec")
+            return jsonify({"error": "Missing required fields"}), 400
+        events = requisition_pipeline.build_pipeline(spec, resume_files)
+    except ValueError as e:
+        logger.error(f"Invalid pipeline spec: {e}")
+        for stream in resume_files.values():
+            stream.close()
+        return jsonify({"error": str(e)}), 400
+
+    def generate():
+        # One JSON object per line, flushed as each stage completes
+        for event in events:
+            yield json.dumps(event) + "\n"
+
+    logger.info("Streaming requisition pipeline results")
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
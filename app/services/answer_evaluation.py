@@ -0,0 +1,105 @@
+import hashlib
+import re
+import time
+
+from app.config import Config
+from app.utils.kv_store import get_store
+
+# Answer evaluation one question/answer pair at a time, with each pair's score
+# cached so unchanged and commonly repeated answers ("Yes", "5 years") are
+# never sent to the LLM twice.
+_NAMESPACE = "answer_scores"
+_ITEM_RE = re.compile(r"^\s*(?:(?:q|question|a|answer)\s*)?(\d{1,3})\s*[.):]\s*(.*)$", re.IGNORECASE)
+_SCORE_RE = re.compile(r"score\D{0,10}?(\d{1,2})(?:\s*/\s*10)?", re.IGNORECASE)
+
+
+def _numbered_items(text):
+    """Returns {number: text} for a numbered list, or None if `text` isn't one."""
+    items = {}
+    current = None
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        match = _ITEM_RE.match(line)
+        if match:
+            current = int(match.group(1))
+            if current in items:
+                return None
+            items[current] = match.group(2).strip()
+        elif current is None:
+            return None
+        else:
+            items[current] = f"{items[current]}\n{line.strip()}".strip()
+    return items or None
+
+
+def split_pairs(questions, answers):
+    """
+    Pairs up questions with answers.
+
+    Accepts two equally long lists, two numbered lists with the same numbers
+    ("1. ...", "Q2: ...", "Answer 3) ..."), or two texts with one question and
+    one answer per line. Returns [(question, answer)], or None if the input
+    can't be split unambiguously.
+    """
+    if isinstance(questions, list) and isinstance(answers, list):
+        if len(questions) != len(answers):
+            return None
+        return [(str(q).strip(), str(a).strip()) for q, a in zip(questions, answers)]
+    if not isinstance(questions, str) or not isinstance(answers, str):
+        return None
+
+    numbered_questions, numbered_answers = _numbered_items(questions), _numbered_items(answers)
+    if numbered_questions and numbered_answers and numbered_questions.keys() == numbered_answers.keys():
+        return [(numbered_questions[n], numbered_answers[n]) for n in sorted(numbered_questions)]
+
+    question_lines = [line.strip() for line in questions.splitlines() if line.strip()]
+    answer_lines = [line.strip() for line in answers.splitlines() if line.strip()]
+    if question_lines and len(question_lines) == len(answer_lines):
+        return list(zip(question_lines, answer_lines))
+    return None
+
+
+def normalize_answer(text):
+    """Case- and whitespace-insensitive form of an answer, ignoring surrounding punctuation."""
+    return " ".join(text.casefold().split()).strip(" .,!?;:'\"")
+
+
+def cache_key(template_id, model, question, answer):
+    raw = "\0".join([template_id, model, " ".join(question.casefold().split()), normalize_answer(answer)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_cached(key):
+    record = get_store().get(_NAMESPACE, key)
+    return record["evaluation"] if record is not None else None
+
+
+def store(key, evaluation, template_id):
+    get_store().set(
+        _NAMESPACE,
+        key,
+        {"evaluation": evaluation, "template_id": template_id, "created_at": time.time()},
+        ttl=Config.ANSWER_SCORE_TTL,
+    )
+
+
+def parse_score(evaluation):
+    """Returns the 1-10 score stated in a pair evaluation, or None."""
+    match = _SCORE_RE.search(evaluation or "")
+    if not match:
+        return None
+    score = int(match.group(1))
+    return score if 1 <= score <= 10 else None
+
+
+def aggregate(pairs, evaluations):
+    """Joins per-pair evaluations into one report and appends the average score. Returns (text, scores)."""
+    sections, scores = [], []
+    for number, ((question, _), evaluation) in enumerate(zip(pairs, evaluations), start=1):
+        sections.append(f"{number}. {question}\n{evaluation}")
+        scores.append(parse_score(evaluation))
+    valid = [score for score in scores if score is not None]
+    if valid:
+        sections.append(f"Overall score: {sum(valid) / len(valid):.1f}/10")
+    return "\n\n".join(sections), scores
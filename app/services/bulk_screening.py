@@ -0,0 +1,186 @@
+import csv
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.config import Config
+from app.services import openai_service
+from app.utils import parser_pool
+from app.utils.resume_sections import PAGE_BREAK
+from app.utils.skill_matcher import get_matcher
+
+logger = logging.getLogger(__name__)
+
+# Offline bulk screening of resume files (see screen_resumes.py). Results are
+# appended to a JSON lines file as they complete; that file is also the
+# checkpoint, so an interrupted run picks up where it stopped.
+CSV_FIELDS = [
+    "file", "status", "fit_score", "matched_skills", "missing_skills", "template_id",
+    "extract_ms", "screen_ms", "total_ms", "sha256", "duplicate_of", "error", "screening_result",
+]
+
+
+def find_resumes(patterns):
+    """Expands directories (searched recursively) and glob patterns into a sorted list of PDF paths."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(glob.escape(pattern), "**", "*"), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        paths.update(path for path in matches if path.lower().endswith(".pdf") and os.path.isfile(path))
+    return sorted(paths)
+
+
+def jd_fingerprint(job_description):
+    return hashlib.sha256(" ".join(job_description.split()).encode()).hexdigest()
+
+
+def load_checkpoint(results_path, jd_sha256):
+    """
+    Reads the results of an earlier run. Returns {file: sha256} of files already screened against this JD.
+
+    A line cut short by an interrupted write is truncated away so appending
+    continues from a clean record boundary. Errors aren't checkpointed: those
+    files are retried.
+    """
+    done = {}
+    if not os.path.exists(results_path):
+        return done
+    with open(results_path, "rb+") as f:
+        content = f.read()
+        complete = content.rfind(b"\n") + 1
+        if complete < len(content):
+            logger.warning(f"Dropping a partial record at the end of {results_path}")
+            f.truncate(complete)
+    for line in content[:complete].splitlines():
+        record = json.loads(line)
+        if record.get("jd_sha256") == jd_sha256 and record.get("status") in ("ok", "duplicate"):
+            done[record["file"]] = record["sha256"]
+    return done
+
+
+def screen_files(paths, job_description, concurrency, done=None):
+    """
+    Extracts and screens resume files, yielding one result dict per file in completion order.
+
+    PDFs are parsed in the shared process pool with at most INGEST_MAX_IN_FLIGHT
+    files held in memory, and at most `concurrency` screenings run at once.
+    Files whose path and content hash are in `done` are skipped; files with the
+    same content as one already screened in this run are marked duplicates.
+
+    Parameters:
+    - paths (list): PDF file paths.
+    - job_description (str): The job description to screen against.
+    - concurrency (int): Maximum concurrent screen_resume calls.
+    - done (dict): {file: sha256} from load_checkpoint().
+    Returns:
+    - generator of dict: {"file", "status", "sha256", timings in ms, ...} per file,
+      then {"status": "summary", ...}.
+    """
+    done = done or {}
+    jd_sha256 = jd_fingerprint(job_description)
+    required_skills = sorted(get_matcher().find(job_description)) if Config.SKILL_MATCH_IN_SCREENING else None
+    screen_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bulk-screen")
+    files = iter(paths)
+    seen = {}
+    pending = {}
+    counts = {"files": len(paths), "ok": 0, "duplicate": 0, "error": 0, "skipped": 0}
+    started_at = time.perf_counter()
+
+    def finish(record, status, **fields):
+        counts[status] += 1
+        record = {**record, "status": status, **fields}
+        record["total_ms"] = round((time.perf_counter() - record.pop("started")) * 1000, 1)
+        return record
+
+    def screen(resume_text):
+        skill_match = get_matcher().match(required_skills, resume_text) if required_skills is not None else None
+        return openai_service.screen_resume(job_description, resume_text, skill_match=skill_match), skill_match
+
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < Config.INGEST_MAX_IN_FLIGHT:
+                path = next(files, None)
+                if path is None:
+                    exhausted = True
+                    break
+                record = {"file": path, "jd_sha256": jd_sha256, "started": time.perf_counter()}
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                except OSError as e:
+                    logger.error(f"Error reading {path}: {e}")
+                    yield finish(record, "error", stage="read", error=str(e))
+                    continue
+                record["sha256"] = sha256 = hashlib.sha256(data).hexdigest()
+                if done.get(path) == sha256:
+                    counts["skipped"] += 1
+                    continue
+                if sha256 in seen:
+                    yield finish(record, "duplicate", duplicate_of=seen[sha256])
+                    continue
+                seen[sha256] = path
+                pending[parser_pool.submit(data, PAGE_BREAK)] = ("extract", record, time.perf_counter())
+
+            if not pending:
+                break
+
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                stage, record, stage_started = pending.pop(future)
+                elapsed_ms = round((time.perf_counter() - stage_started) * 1000, 1)
+                try:
+                    result = future.result()
+                    if stage == "extract" and not result.strip():
+                        raise ValueError("Resume text is empty")
+                except Exception as e:
+                    logger.error(f"Error processing {record['file']} ({stage}): {e}")
+                    yield finish(record, "error", stage=stage, error=str(e), **{f"{stage}_ms": elapsed_ms})
+                    continue
+
+                if stage == "extract":
+                    record["extract_ms"] = elapsed_ms
+                    pending[screen_pool.submit(screen, result)] = ("screen", record, time.perf_counter())
+                    continue
+                screening, skill_match = result
+                yield finish(
+                    record,
+                    "ok",
+                    screening_result=screening,
+                    fit_score=openai_service.parse_fit_score(screening),
+                    skill_match=skill_match,
+                    template_id=getattr(screening, "template_id", None),
+                    screen_ms=elapsed_ms,
+                )
+    finally:
+        for future in pending:
+            future.cancel()
+        screen_pool.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(f"Bulk screening finished: {counts}")
+    yield {"status": "summary", **counts, "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 1)}
+
+
+def write_csv(results_path, csv_path):
+    """Renders the latest result per file from a results JSON lines file as CSV. Returns the row count."""
+    latest = {}
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            latest[record["file"]] = record
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for file in sorted(latest):
+            record = dict(latest[file])
+            skill_match = record.pop("skill_match", None) or {}
+            record["matched_skills"] = ", ".join(skill_match.get("matched", []))
+            record["missing_skills"] = ", ".join(skill_match.get("missing", []))
+            writer.writerow(record)
+    return len(latest)
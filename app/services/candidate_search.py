@@ -0,0 +1,92 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from app.config import Config
+from app.services import embeddings
+from app.utils import metrics, tracing
+from app.utils.kv_store import get_store
+from app.utils.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+# Every screened resume is embedded once and appended to a memory-mapped vector
+# index, so "who matches this new JD?" is a vector search instead of an LLM
+# call per resume. Per-candidate details live in the shared key/value store.
+_NAMESPACE = "candidates"
+_PREVIEW_CHARS = 300
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Returns the vector index for the configured embedding provider, opening it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            provider = embeddings.get_provider()
+            directory = os.path.join(Config.DATA_DIR, "vectors", f"{provider.name}-{provider.dim}")
+            _index = VectorIndex(directory, provider.dim)
+            logger.info(f"Opened candidate vector index at {directory} ({len(_index)} candidates)")
+        return _index
+
+
+def resume_key(resume_text):
+    return hashlib.sha256(" ".join(resume_text.split()).encode()).hexdigest()
+
+
+def index_resume(resume_text, fit_score=None):
+    """
+    Adds a resume to the candidate index unless it's already there, and records its latest fit score.
+
+    Returns:
+    - str: The resume key.
+    """
+    key = resume_key(resume_text)
+    index = get_index()
+    store = get_store()
+    record = store.get(_NAMESPACE, key)
+    if key not in index:
+        with tracing.span("candidates.embed"):
+            index.add([key], embeddings.get_provider().embed([resume_text]))
+        metrics.increment("candidates.indexed")
+    record = record or {"preview": " ".join(resume_text.split())[:_PREVIEW_CHARS], "indexed_at": time.time()}
+    if fit_score is not None:
+        record["last_fit_score"] = fit_score
+    record["last_screened_at"] = time.time()
+    store.set(_NAMESPACE, key, record)
+    return key
+
+
+def search(job_descriptions, top_k):
+    """
+    Finds the indexed candidates most similar to each job description.
+
+    Parameters:
+    - job_descriptions (list): Job description texts, embedded and searched as one batch.
+    - top_k (int): Candidates to return per job description.
+    Returns:
+    - list of list of dict: per job description, {"resume_key", "similarity",
+      "preview", "last_fit_score"} best first.
+    """
+    with tracing.span("candidates.search", **{"search.queries": len(job_descriptions), "search.top_k": top_k}):
+        queries = embeddings.get_provider().embed(job_descriptions)
+        hits = get_index().search(queries, top_k, batch_size=Config.VECTOR_SEARCH_BATCH)
+
+    store = get_store()
+    results = []
+    for query_hits in hits:
+        candidates = []
+        for key, similarity in query_hits:
+            record = store.get(_NAMESPACE, key) or {}
+            candidates.append({
+                "resume_key": key,
+                "similarity": round(similarity, 4),
+                "preview": record.get("preview"),
+                "last_fit_score": record.get("last_fit_score"),
+            })
+        results.append(candidates)
+    return results
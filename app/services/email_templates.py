@@ -0,0 +1,62 @@
+import hashlib
+import logging
+import time
+
+from app.config import Config
+from app.utils.kv_store import get_store
+
+logger = logging.getLogger(__name__)
+
+# LLM-written feedback emails with a name placeholder, generated once per
+# (job title, outcome, tone, variant) and rendered locally for each candidate.
+NAME_PLACEHOLDER = "[CANDIDATE_NAME]"
+_NAMESPACE = "feedback_templates"
+
+
+class EmailTemplate:
+    """
+    A feedback email body split around its name placeholders.
+
+    Rendering is a single str.join, so thousands of personalized emails can be
+    produced per second without touching the LLM.
+    """
+
+    def __init__(self, text, template_id, variant=0):
+        if NAME_PLACEHOLDER not in text:
+            raise ValueError(f"Email template has no {NAME_PLACEHOLDER} placeholder.")
+        self.text = text
+        self.template_id = template_id
+        self.variant = variant
+        self._parts = text.split(NAME_PLACEHOLDER)
+
+    def render(self, candidate_name):
+        return candidate_name.join(self._parts)
+
+
+def cache_key(template_id, model, job_title, outcome, tone, variant):
+    job_title = " ".join(job_title.split()).lower()
+    raw = "\0".join([template_id, model, job_title, outcome, tone, str(variant)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_cached(key, variant):
+    record = get_store().get(_NAMESPACE, key)
+    if record is None:
+        return None
+    return EmailTemplate(record["text"], record["template_id"], variant)
+
+
+def store(key, template):
+    get_store().set(
+        _NAMESPACE,
+        key,
+        {"text": template.text, "template_id": template.template_id, "created_at": time.time()},
+        ttl=Config.FEEDBACK_TEMPLATE_TTL,
+    )
+
+
+def pick_variant(candidate_name, variants):
+    """Assigns a candidate to one of `variants` template variants, stably across requests."""
+    if variants <= 1:
+        return 0
+    return int.from_bytes(hashlib.blake2b(candidate_name.encode(), digest_size=4).digest(), "big") % variants
@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import re
+import threading
+
+import numpy as np
+
+from app.config import Config
+from app.utils import deadlines, metrics, tracing
+from app.utils.tokens import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+class HashingEmbeddingProvider:
+    """
+    Deterministic local embeddings: signed feature hashing of words and word pairs.
+
+    No network and no model, so it suits tests and offline use. Similarity is
+    lexical (shared terms), not semantic.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim):
+        self.dim = dim
+
+    def _features(self, text):
+        words = [word.rstrip(".") for word in _WORD_RE.findall(text.lower())]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                vectors[row, digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        return vectors
+
+
+class OpenAIEmbeddingProvider:
+    """Embeddings from the OpenAI API (EMBEDDING_MODEL), requested in batches of EMBEDDING_BATCH_SIZE."""
+
+    name = "openai"
+
+    def __init__(self, model, dim):
+        self.model = model
+        self.dim = dim
+
+    def embed(self, texts):
+        # Imported here so the local provider works without an API client
+        from app.services.openai_service import client
+
+        max_chars = Config.EMBEDDING_MAX_TOKENS * CHARS_PER_TOKEN
+        vectors = []
+        for start in range(0, len(texts), Config.EMBEDDING_BATCH_SIZE):
+            batch = [text[:max_chars] for text in texts[start:start + Config.EMBEDDING_BATCH_SIZE]]
+            with tracing.span("llm.embedding", **{"gen_ai.request.model": self.model, "embedding.batch_size": len(batch)}):
+                response = client.embeddings.create(
+                    model=self.model,
+                    input=batch,
+                    dimensions=self.dim,
+                    **deadlines.timeout_kwargs()
+                )
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+            metrics.increment("embeddings.texts", len(batch))
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """Returns the provider selected by Config.EMBEDDING_PROVIDER ("openai" or "hashing"), creating it on first use."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            if Config.EMBEDDING_PROVIDER == "hashing":
+                _provider = HashingEmbeddingProvider(Config.EMBEDDING_DIM)
+            elif Config.EMBEDDING_PROVIDER == "openai":
+                _provider = OpenAIEmbeddingProvider(Config.EMBEDDING_MODEL, Config.EMBEDDING_DIM)
+            else:
+                raise ValueError(f"Unknown EMBEDDING_PROVIDER '{Config.EMBEDDING_PROVIDER}'.")
+            logger.info(f"Using {_provider.name} embeddings ({Config.EMBEDDING_DIM} dimensions)")
+        return _provider
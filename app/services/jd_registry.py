@@ -0,0 +1,61 @@
+import hashlib
+import logging
+import time
+
+from app.utils.kv_store import get_store
+from app.utils.skill_matcher import get_matcher
+from app.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_NAMESPACE = "jd"
+
+
+def normalize_jd(text):
+    """Collapses whitespace within lines and drops blank lines, so cosmetic spacing doesn't change a JD's id."""
+    lines = (" ".join(line.split()) for line in (text or "").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def jd_id_for(text):
+    return "jd_" + hashlib.sha256(normalize_jd(text).encode()).hexdigest()[:16]
+
+
+def register_jd(text, source="api"):
+    """
+    Registers a job description and precomputes what screening needs from it.
+
+    Registration is idempotent: the id is derived from the normalized text, so
+    registering the same JD twice returns the existing record.
+
+    Parameters:
+    - text (str): The job description.
+    - source (str): Where it came from (e.g. "api", "generate-jd").
+    Returns:
+    - tuple: (record dict with id, text, required_skills, token_count, source, created_at; created flag)
+    Raises:
+    - ValueError: If the text is empty.
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("Job description text is required.")
+    normalized = normalize_jd(text)
+    jd_id = jd_id_for(normalized)
+    record = {
+        "id": jd_id,
+        "text": normalized,
+        "required_skills": sorted(get_matcher().find(normalized)),
+        "token_count": estimate_tokens(normalized),
+        "source": source,
+        "created_at": time.time(),
+    }
+    created = get_store().add(_NAMESPACE, jd_id, record)
+    if not created:
+        record = get_store().get(_NAMESPACE, jd_id)
+    else:
+        logger.info(f"Registered job description {jd_id} ({record['token_count']} tokens, source: {source})")
+    return record, created
+
+
+def get_jd(jd_id):
+    """Returns the registered record for `jd_id`, or None."""
+    return get_store().get(_NAMESPACE, jd_id)
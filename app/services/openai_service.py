@@ -1,12 +1,202 @@
 from openai import OpenAI
 from app.config import Config
+from app.services import answer_evaluation, candidate_search, email_templates, prompt_templates, question_bank, resume_chunks, screening_memo
+from app.utils import deadlines, metrics, tracing
+from app.utils.cache import LRUCache
+from app.utils.hedging import Hedger
+from app.utils.resume_sections import compact_resume
+from app.utils.tokens import estimate_tokens
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import logging
+import re
+import threading
+import time
 
 client = OpenAI(
     api_key=Config.OPENAI_API_KEY
 )
 logger = logging.getLogger(__name__)
 
+_FIT_SCORE_RE = re.compile(r"fit\s*score(?:\s*\(?\s*(?:out of|/)\s*100\s*\)?)?\D{0,20}?(\d{1,3})", re.IGNORECASE)
+
+_response_cache = LRUCache(max_size=Config.RESPONSE_CACHE_SIZE, ttl=Config.RESPONSE_CACHE_TTL)
+_hedger = Hedger(max_rate=Config.HEDGE_MAX_RATE, max_workers=Config.HEDGE_MAX_WORKERS)
+# Question bank generation runs here, both for requests waiting on unseen skills and for background prefill
+_bank_executor = ThreadPoolExecutor(max_workers=Config.QUESTION_BANK_WORKERS, thread_name_prefix="question-bank")
+_bank_futures = {}
+_bank_lock = threading.Lock()
+# One writer per feedback email template; concurrent callers wait for it instead of duplicating the call
+_feedback_template_locks = {}
+# Per-question answer scoring runs these concurrently
+_evaluation_executor = ThreadPoolExecutor(max_workers=Config.EVALUATION_CONCURRENCY, thread_name_prefix="answer-eval")
+# Chunk summaries of long resumes (the map step of chunked screening) run these concurrently
+_chunk_executor = ThreadPoolExecutor(max_workers=Config.SCREEN_CHUNK_CONCURRENCY, thread_name_prefix="resume-chunks")
+
+
+class LLMText(str):
+    """
+    Completion text returned by the service functions.
+
+    Behaves exactly like a str, but also records which prompt template and
+    model produced it so routes can report them alongside the result.
+    """
+    template_id = None
+    model = None
+    cached = False
+    near_duplicate_of = None
+    scores = None
+
+
+def _llm_text(content, template_id, model, cached=False):
+    text = LLMText(content)
+    text.template_id = template_id
+    text.model = model
+    text.cached = cached
+    return text
+
+
+def parse_fit_score(text):
+    """Returns the 0-100 fit score stated in a screening result, or None if there isn't a valid one."""
+    match = _FIT_SCORE_RE.search(text or "")
+    if not match:
+        return None
+    score = int(match.group(1))
+    return score if 0 <= score <= 100 else None
+
+
+def model_for(task):
+    """Returns the model routed to a task (prompt template name), falling back to OPENAI_MODEL."""
+    return Config.MODEL_ROUTES.get(task) or Config.OPENAI_MODEL
+
+
+def _complete(template, prompt, model=None, task=None):
+    """
+    Sends a rendered prompt to OpenAI and returns the stripped completion text.
+
+    `task` names the routing/hedging entry to use and defaults to the template
+    name. The model comes from Config.MODEL_ROUTES unless one is passed explicitly.
+    Results are cached by (template id, model, prompt) when RESPONSE_CACHE_SIZE
+    is set, and latency/token usage is recorded per template id and per model
+    so prompt versions and model tiers can be compared side by side.
+    """
+    task = task or template.name
+    model = model or model_for(task)
+    with tracing.span("llm.completion", **{"gen_ai.request.model": model, "prompt.template_id": template.id}) as span:
+        cache_key = (template.id, model, prompt)
+        cached = _response_cache.get(cache_key)
+        span.set_attribute("llm.cache_hit", cached is not None)
+        if cached is not None:
+            metrics.increment(f"llm.cache_hits.{template.id}")
+            return _llm_text(cached, template.id, model, cached=True)
+
+        messages = [{"role": "user", "content": prompt}]
+        started = time.perf_counter()
+        hedged = task in Config.HEDGED_TASKS
+        span.set_attribute("llm.hedged", hedged)
+        if hedged:
+            content, usage = _create_hedged(template, model, messages)
+        else:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                **deadlines.timeout_kwargs()
+            )
+            content, usage = response.choices[0].message.content, getattr(response, "usage", None)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metrics.observe(f"llm.latency_ms.{template.id}", elapsed_ms)
+        metrics.observe(f"llm.model_latency_ms.{model}", elapsed_ms)
+        if usage is not None:
+            metrics.observe(f"llm.prompt_tokens.{template.id}", usage.prompt_tokens)
+            metrics.observe(f"llm.completion_tokens.{template.id}", usage.completion_tokens)
+            span.set_attributes({
+                "gen_ai.usage.input_tokens": usage.prompt_tokens,
+                "gen_ai.usage.output_tokens": usage.completion_tokens,
+            })
+
+        content = content.strip()
+        _response_cache.set(cache_key, content)
+        return _llm_text(content, template.id, model)
+
+
+def _create_hedged(template, model, messages):
+    """
+    Streams a completion, racing a duplicate request if the first token is slow.
+
+    The hedge delay is the HEDGE_PERCENTILE of this template's recent
+    time-to-first-token; until HEDGE_MIN_SAMPLES have been seen no hedge is
+    fired. The losing stream is closed as soon as the winner completes.
+    """
+    ttft_metric = f"llm.ttft_ms.{template.id}"
+    delay = None
+    if metrics.sample_count(ttft_metric) >= Config.HEDGE_MIN_SAMPLES:
+        delay = metrics.percentile(ttft_metric, Config.HEDGE_PERCENTILE) / 1000
+
+    def attempt(handle):
+        started = time.perf_counter()
+        stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **deadlines.timeout_kwargs(),
+        )
+        parts, usage = [], None
+        try:
+            for chunk in stream:
+                if handle.cancelled.is_set():
+                    return None
+                deadlines.check("end of stream")
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if not handle.first_output.is_set():
+                        handle.first_output.set()
+                        metrics.observe(ttft_metric, (time.perf_counter() - started) * 1000)
+                    parts.append(chunk.choices[0].delta.content)
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+        finally:
+            stream.close()
+        return "".join(parts), usage
+
+    return _hedger.run(attempt, delay, name=template.name)
+
+
+def _screen_with_cascade(template, prompt, models):
+    """
+    Runs a screening prompt through increasingly strong models.
+
+    Each tier's answer is accepted unless its fit score can't be parsed or sits
+    within SCREEN_ESCALATION_BAND of SCREEN_DECISION_THRESHOLD, in which case
+    the next tier is asked. The last tier's answer is always accepted.
+    """
+    metrics.increment("cascade.screen_resume.requests")
+    for tier, model in enumerate(models):
+        started = time.perf_counter()
+        result = _complete(template, prompt, model=model, task="screen_resume")
+        metrics.observe(f"cascade.screen_resume.tier{tier}.latency_ms", (time.perf_counter() - started) * 1000)
+        if tier == len(models) - 1:
+            break
+        score = parse_fit_score(result)
+        if score is not None and abs(score - Config.SCREEN_DECISION_THRESHOLD) > Config.SCREEN_ESCALATION_BAND:
+            break
+        logger.info(f"Escalating resume screening from {model} (fit score: {score})")
+        metrics.increment("cascade.screen_resume.escalations")
+        metrics.increment(f"cascade.screen_resume.tier{tier}.escalations")
+    metrics.increment(f"cascade.screen_resume.tier{tier}.accepted")
+    return result
+
+
+def _require_skills(skills):
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError("Skills must be a list of strings.")
+
+
+def _require_text(value, label):
+    if not isinstance(value, str):
+        raise ValueError(f"{label} must be a string.")
+    if not value.strip():
+        raise ValueError(f"{label} cannot be empty.")
+
 # =========================================
 # 1. Job Description Generator
 # =========================================
@@ -33,40 +223,44 @@ def generate_job_description(title, seniority, skills, location="remote", descri
             location = "remote"
         if not seniority:
             raise ValueError("Seniority level is required to generate a job description.")
-        if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
-            raise ValueError("Skills must be a list of strings.")
-        
-        prompt = (
-            f"Write a detailed job description for a {seniority} {title} role. "
-            f"Key skills: {', '.join(skills)}. "
-            f"Location: {location}."
-            f"{' Extra Description of Role: ' + description if description else ''}"
+        _require_skills(skills)
+
+        template, prompt = prompt_templates.render(
+            "generate_jd",
+            seniority=seniority,
+            title=title,
+            skills=", ".join(skills),
+            location=location,
+            extra_description=f" Extra Description of Role: {description}" if description else "",
         )
-    
+
         logger.info(f"Generating job description for {title} ({seniority}) with skills {skills} at {location}")
-        response = client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        jd = _complete(template, prompt)
     except Exception as e:
         logger.error(f"Error generating job description: {e}")
         raise RuntimeError("Failed to generate job description")
-    
+
     logger.info("Job description generated successfully")
-    return response.choices[0].message.content.strip()
+    return jd
 
 
 # =========================================
 # 2. Resume Screening & Fit Scoring
 # =========================================
-def screen_resume(job_desc, resume_text):
+def screen_resume(job_desc, resume_text, skill_match=None):
     """
     Uses OpenAI to analyze a candidate resume against a job description.
     Outputs a fit score, strengths, weaknesses, and missing skills.
 
+    Resumes longer than SCREEN_CHUNKED_MIN_TOKENS are summarized in chunks
+    first (concurrently, with summaries cached across job descriptions) and
+    the summaries are screened in one final call with the same output format.
+
     Parameters:
     - job_desc (str): The job description to screen against.
     - resume_text (str): The candidate's resume text.
+    - skill_match (dict): Optional result of SkillMatcher.match(); when given, the
+      matched/missing skills are passed in and the LLM isn't asked to find them.
     Returns:
     - str: Analysis result containing fit score, strengths, weaknesses, and missing skills.
     Raises:
@@ -77,37 +271,97 @@ def screen_resume(job_desc, resume_text):
     try:
         if not job_desc or not resume_text:
             raise ValueError("Job description and resume text are required for screening.")
-        if not isinstance(resume_text, str):
-            raise ValueError("Resume text must be a string.")
-        if not isinstance(job_desc, str):
-            raise ValueError("Job description must be a string.")
-        if not resume_text.strip():
-            raise ValueError("Resume text cannot be empty.")
-        if not job_desc.strip():
-            raise ValueError("Job description cannot be empty.")
-        
-        prompt = (
-            "You are an AI hiring assistant. Evaluate the following resume for the job below.\n\n"
-            f"Job Description:\n{job_desc}\n\n"
-            f"Resume:\n{resume_text}\n\n"
-            "Provide:\n"
-            "- Fit score out of 100\n"
-            "- 3 strengths\n"
-            "- 3 areas for improvement\n"
-            "- Any missing keywords or skills"
-        )
+        _require_text(resume_text, "Resume text")
+        _require_text(job_desc, "Job description")
+        if Config.COMPACT_RESUME_TEXT:
+            resume_text = compact_resume(resume_text) or resume_text
+
+        prior = screening_memo.find_prior_result(job_desc, resume_text)
+        if prior is not None:
+            previous, duplicate_of, similarity = prior
+            result = _llm_text(previous, previous.template_id, previous.model, cached=True)
+            result.near_duplicate_of = {"resume_key": duplicate_of, "similarity": round(similarity, 3)}
+            tracing.set_attributes(**{"screening.near_duplicate_similarity": round(similarity, 3)})
+            logger.info("Resume screening reused from near-duplicate submission")
+            _index_candidate(resume_text, result)
+            return result
+
+        if Config.SCREEN_CHUNKED_MIN_TOKENS and estimate_tokens(resume_text) > Config.SCREEN_CHUNKED_MIN_TOKENS:
+            template, prompt = _chunked_screening_prompt(job_desc, resume_text, skill_match)
+        elif skill_match is not None:
+            template, prompt = prompt_templates.render(
+                "screen_resume_with_skills",
+                job_desc=job_desc,
+                resume_text=resume_text,
+                matched_skills=", ".join(skill_match["matched"]) or "none",
+                missing_skills=", ".join(skill_match["missing"]) or "none",
+            )
+        else:
+            template, prompt = prompt_templates.render("screen_resume", job_desc=job_desc, resume_text=resume_text)
 
         logger.info("Screening resume against job description")
-        response = client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        if Config.SCREEN_CASCADE_MODELS:
+            result = _screen_with_cascade(template, prompt, Config.SCREEN_CASCADE_MODELS)
+        else:
+            result = _complete(template, prompt, task="screen_resume")
+        screening_memo.record_result(job_desc, resume_text, result)
     except Exception as e:
         logger.error(f"Error screening resume: {e}")
         raise RuntimeError("Failed to screen resume")
-    
+
+    _index_candidate(resume_text, result)
     logger.info("Resume screening completed successfully")
-    return response.choices[0].message.content.strip()
+    return result
+
+
+def _index_candidate(resume_text, result):
+    # Candidate search is a side index: failing to update it must not fail the screening
+    if not Config.CANDIDATE_INDEX_ENABLED:
+        return
+    try:
+        candidate_search.index_resume(resume_text, fit_score=parse_fit_score(result))
+    except Exception as e:
+        logger.error(f"Error indexing candidate for search: {e}")
+
+
+def _chunked_screening_prompt(job_desc, resume_text, skill_match):
+    """
+    Map step of chunked screening: summarizes the resume chunk by chunk and
+    renders the reduce prompt over the summaries. Returns (template, prompt).
+    """
+    chunks = resume_chunks.split_chunks(resume_text, Config.SCREEN_CHUNK_TOKENS)
+    logger.info(f"Screening long resume ({estimate_tokens(resume_text)} tokens) in {len(chunks)} chunks")
+    metrics.increment("screening.chunked")
+    futures = [_chunk_executor.submit(contextvars.copy_context().run, _summarize_chunk, chunk) for chunk in chunks]
+    summaries = [future.result(timeout=deadlines.remaining()) for future in futures]
+    tracing.set_attributes(**{
+        "screening.chunks": len(chunks),
+        "screening.chunk_cache_hits": sum(summary.cached for summary in summaries),
+    })
+    resume_summary = "\n\n".join(summaries)
+    if skill_match is not None:
+        return prompt_templates.render(
+            "screen_resume_chunked_with_skills",
+            job_desc=job_desc,
+            resume_summary=resume_summary,
+            matched_skills=", ".join(skill_match["matched"]) or "none",
+            missing_skills=", ".join(skill_match["missing"]) or "none",
+        )
+    return prompt_templates.render("screen_resume_chunked", job_desc=job_desc, resume_summary=resume_summary)
+
+
+def _summarize_chunk(chunk):
+    template, prompt = prompt_templates.render("summarize_resume_chunk", resume_chunk=chunk)
+    model = model_for("summarize_resume_chunk")
+    key = resume_chunks.cache_key(template.id, model, chunk)
+    cached = resume_chunks.get_cached(key)
+    if cached is not None:
+        metrics.increment(f"screening.chunk_cache_hits.{template.id}")
+        return _llm_text(cached, template.id, model, cached=True)
+    metrics.increment(f"screening.chunk_cache_misses.{template.id}")
+    summary = _complete(template, prompt)
+    resume_chunks.store(key, str(summary), template.id)
+    return summary
 
 
 # =========================================
@@ -117,6 +371,10 @@ def generate_screening_questions(title, skills):
     """
     Uses OpenAI to generate 3-5 screening questions for the specified job title and skills.
 
+    With QUESTION_BANK_ENABLED the questions are assembled from the question
+    bank instead: a few general questions for the title plus a few per skill.
+    Only titles and skills the bank hasn't seen yet cost an LLM call.
+
     Parameters:
     - title (str): The job title (e.g., "Software Engineer").
     - skills (list): List of required skills (e.g., ["Python", "Flask"]).
@@ -130,28 +388,88 @@ def generate_screening_questions(title, skills):
     try:
         if not title or not skills:
             raise ValueError("Title and skills are required to generate questions.")
-        if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
-            raise ValueError("Skills must be a list of strings.")
-        if not skills:
-            raise ValueError("Skills list cannot be empty.")
-        if len(skills) < 1:
-            raise ValueError("At least one skill is required to generate questions.")
-
-        prompt = (
-            f"Generate 5 screening questions for a {title} position that requires these skills: {', '.join(skills)}."
-        )   
-        
-        logger.info(f"Generating screening questions for {title} with skills {skills}")
-        response = client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        _require_skills(skills)
+
+        if Config.QUESTION_BANK_ENABLED:
+            logger.info(f"Assembling screening questions for {title} with skills {skills} from the question bank")
+            questions = _questions_from_bank(title, skills)
+        else:
+            template, prompt = prompt_templates.render("generate_questions", title=title, skills=", ".join(skills))
+
+            logger.info(f"Generating screening questions for {title} with skills {skills}")
+            questions = _complete(template, prompt)
     except Exception as e:
         logger.error(f"Error generating screening questions: {e}")
         raise RuntimeError("Failed to generate screening questions")
-    
+
     logger.info("Screening questions generated successfully")
-    return response.choices[0].message.content.strip()
+    return questions
+
+
+def _generate_bank_entry(kind, key, name):
+    template, prompt = prompt_templates.render(f"generate_{kind}_questions", count=Config.QUESTION_BANK_SIZE, **{kind: name})
+    questions = question_bank.parse_questions(_complete(template, prompt, task="generate_questions"))
+    if not questions:
+        raise ValueError(f"No questions generated for {kind} {name!r}")
+    return question_bank.store_entry(kind, key, name, questions, template.id)
+
+
+def _bank_future(kind, key, name):
+    # One generation per entry at a time, shared by every caller that needs it
+    with _bank_lock:
+        future = _bank_futures.get((kind, key))
+        if future is None:
+            # Entries outlive the request that asked for them, so generation runs without its deadline
+            future = _bank_executor.submit(deadlines.detached_context().run, _generate_bank_entry, kind, key, name)
+            _bank_futures[(kind, key)] = future
+            future.add_done_callback(lambda _: _bank_futures.pop((kind, key), None))
+        return future
+
+
+def _questions_from_bank(title, skills):
+    wanted = [("title", *question_bank.normalize_title(title))]
+    wanted += [("skill", key, name) for key, name in question_bank.normalize_skills(skills)]
+
+    entries = {(kind, key): question_bank.get_entry(kind, key) for kind, key, _ in wanted}
+    missing = [(kind, key, name) for kind, key, name in wanted if entries[(kind, key)] is None]
+    metrics.increment("question_bank.hits", len(wanted) - len(missing))
+    metrics.increment("question_bank.misses", len(missing))
+
+    # Unseen entries are generated concurrently; everything else is a store lookup
+    futures = {(kind, key): _bank_future(kind, key, name) for kind, key, name in missing}
+    for entry_key, future in futures.items():
+        entries[entry_key] = future.result(timeout=deadlines.remaining())
+
+    per_entry = {"title": Config.QUESTIONS_PER_TITLE, "skill": Config.QUESTIONS_PER_SKILL}
+    text = question_bank.assemble([(kind, entries[(kind, key)]) for kind, key, _ in wanted], per_entry)
+    template_ids = sorted({entries[(kind, key)]["template_id"] for kind, key, _ in wanted})
+    return _llm_text(text, ",".join(template_ids), model_for("generate_questions"), cached=not missing)
+
+
+def prefill_question_bank(skills=(), title=None):
+    """
+    Queues background generation of bank entries for skills (and a title) the bank hasn't seen.
+
+    Returns:
+    - int: The number of entries queued.
+    """
+    wanted = [("skill", key, name) for key, name in question_bank.normalize_skills(skills)]
+    if title:
+        wanted.append(("title", *question_bank.normalize_title(title)))
+    queued = 0
+    for kind, key, name in wanted:
+        if question_bank.get_entry(kind, key) is None:
+            future = _bank_future(kind, key, name)
+            future.add_done_callback(_log_prefill_failure)
+            queued += 1
+    if queued:
+        metrics.increment("question_bank.prefill_queued", queued)
+    return queued
+
+
+def _log_prefill_failure(future):
+    if future.exception() is not None:
+        logger.error(f"Error prefilling question bank: {future.exception()}")
 
 
 # =========================================
@@ -161,9 +479,16 @@ def evaluate_candidate_answers(questions, answers):
     """
     Uses OpenAI to score candidate answers to screening questions and provide feedback.
 
+    When the input splits into question/answer pairs (see
+    answer_evaluation.split_pairs), each pair is scored on its own and
+    concurrently, and the results are joined with an overall average. Pair
+    scores are cached by (question, normalized answer, rubric template
+    version), so only new or edited answers reach the LLM. Input that can't
+    be split is evaluated in a single call.
+
     Parameters:
-    - questions (str): The screening questions.
-    - answers (str): The candidate's answers to the questions.
+    - questions (str or list): The screening questions.
+    - answers (str or list): The candidate's answers to the questions.
     Returns:
     - str: Evaluation of the candidate's answers, including scores and feedback.
     Raises:
@@ -173,31 +498,59 @@ def evaluate_candidate_answers(questions, answers):
     try:
         if not questions or not answers:
             raise ValueError("Both questions and answers are required for evaluation.")
-        if not isinstance(questions, str) or not isinstance(answers, str):
-            raise ValueError("Questions and answers must be strings.")
-        if not questions.strip():
-            raise ValueError("Questions cannot be empty.")
-        if not answers.strip():
-            raise ValueError("Answers cannot be empty.")
-
-        prompt = (
-            "You are an AI interviewer. Here are some screening questions and a candidate's answers.\n\n"
-            f"Questions:\n{questions}\n\n"
-            f"Answers:\n{answers}\n\n"
-            "Score each answer from 1–10 and explain your evaluation."
-        )
+        if isinstance(questions, list) or isinstance(answers, list):
+            if not all(isinstance(item, str) and item.strip() for item in [*questions, *answers]):
+                raise ValueError("Questions and answers must be non-empty strings.")
+        else:
+            _require_text(questions, "Questions")
+            _require_text(answers, "Answers")
 
-        logger.info("Evaluating candidate answers")
-        response = client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        pairs = answer_evaluation.split_pairs(questions, answers) if Config.EVALUATE_PER_QUESTION else None
+        if pairs is not None:
+            logger.info(f"Evaluating {len(pairs)} candidate answers individually")
+            evaluation = _evaluate_pairs(pairs)
+        else:
+            if isinstance(questions, list) or isinstance(answers, list):
+                raise ValueError("Questions and answers lists must have the same length.")
+            template, prompt = prompt_templates.render("evaluate_answers", questions=questions, answers=answers)
+
+            logger.info("Evaluating candidate answers")
+            evaluation = _complete(template, prompt)
     except Exception as e:
         logger.error(f"Error evaluating candidate answers: {e}")
         raise RuntimeError("Failed to evaluate candidate answers")
-    
+
     logger.info("Candidate answers evaluated successfully")
-    return response.choices[0].message.content.strip()
+    return evaluation
+
+
+def _evaluate_pair(question, answer):
+    template, prompt = prompt_templates.render("evaluate_answer", question=question, answer=answer)
+    model = model_for("evaluate_answers")
+    key = answer_evaluation.cache_key(template.id, model, question, answer)
+    cached = answer_evaluation.get_cached(key)
+    if cached is not None:
+        metrics.increment(f"evaluation.pair_cache_hits.{template.id}")
+        return _llm_text(cached, template.id, model, cached=True)
+    metrics.increment(f"evaluation.pair_cache_misses.{template.id}")
+    evaluation = _complete(template, prompt, task="evaluate_answers")
+    answer_evaluation.store(key, str(evaluation), template.id)
+    return evaluation
+
+
+def _evaluate_pairs(pairs):
+    futures = [
+        _evaluation_executor.submit(contextvars.copy_context().run, _evaluate_pair, question, answer)
+        for question, answer in pairs
+    ]
+    evaluations = [future.result(timeout=deadlines.remaining()) for future in futures]
+    text, scores = answer_evaluation.aggregate(pairs, evaluations)
+    result = _llm_text(text, evaluations[0].template_id, evaluations[0].model, cached=all(e.cached for e in evaluations))
+    result.scores = [
+        {"question": question, "score": score, "cached": evaluation.cached}
+        for (question, _), score, evaluation in zip(pairs, scores, evaluations)
+    ]
+    return result
 
 
 # =========================================
@@ -234,19 +587,96 @@ def generate_feedback_email(candidate_name, job_title, outcome, tone="profession
         else:
             status_text = 'rejection'
 
-        prompt = (
-            f"Write a {tone} {status_text} email to {candidate_name} for the position of {job_title}. "
-            "Include one sentence of general positive feedback."
+        template, prompt = prompt_templates.render(
+            "feedback_email",
+            tone=tone,
+            status_text=status_text,
+            candidate_name=candidate_name,
+            job_title=job_title,
         )
 
         logger.info(f"Generating feedback email for {candidate_name} ({job_title}) with outcome {outcome} and tone {tone}")
-        response = client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        email = _complete(template, prompt)
     except Exception as e:
         logger.error(f"Error generating feedback email: {e}")
         raise RuntimeError("Failed to generate feedback email")
-    
+
     logger.info("Feedback email generated successfully")
-    return response.choices[0].message.content.strip()
+    return email
+
+
+def generate_feedback_emails(candidate_names, job_title, outcome, tone="professional", variants=1):
+    """
+    Generates feedback emails for many candidates from one LLM-written template.
+
+    The LLM writes the email once per (job_title, outcome, tone) with a name
+    placeholder; the template is cached in the shared key/value store and
+    rendered locally for each candidate. With `variants` > 1 that many
+    differently worded templates are generated and each candidate is assigned
+    one of them by a stable hash of their name.
+
+    Parameters:
+    - candidate_names (list): Names of the candidates.
+    - job_title (str): The job title for which the candidates applied.
+    - outcome (str): The outcome of the applications ('accepted' or 'rejected').
+    - tone (str): The tone of the emails ('professional', 'friendly', 'formal').
+    - variants (int): Number of template variants (1 to FEEDBACK_MAX_VARIANTS).
+    Returns:
+    - tuple: (list of {"candidate_name", "email", "variant"} dicts, list of the template ids used)
+    Raises:
+    - ValueError: If required parameters are missing or invalid.
+    - RuntimeError: If OpenAI API call fails.
+    """
+    try:
+        if not candidate_names or not job_title or not outcome:
+            raise ValueError("Candidate names, job title, and outcome are required.")
+        if not isinstance(candidate_names, list) or not all(isinstance(name, str) and name.strip() for name in candidate_names):
+            raise ValueError("Candidate names must be a list of non-empty strings.")
+        if len(candidate_names) > Config.FEEDBACK_BULK_MAX_CANDIDATES:
+            raise ValueError(f"At most {Config.FEEDBACK_BULK_MAX_CANDIDATES} candidates are allowed per request.")
+        if outcome not in ['accepted', 'rejected']:
+            raise ValueError("Outcome must be either 'accepted' or 'rejected'.")
+        if tone not in ['professional', 'friendly', 'formal']:
+            raise ValueError("Tone must be one of: professional, friendly, formal.")
+        if not isinstance(variants, int) or not 1 <= variants <= Config.FEEDBACK_MAX_VARIANTS:
+            raise ValueError(f"Variants must be between 1 and {Config.FEEDBACK_MAX_VARIANTS}.")
+
+        job_title = job_title.strip()
+        templates = [_feedback_email_template(job_title, outcome, tone, variant) for variant in range(variants)]
+
+        logger.info(f"Rendering {len(candidate_names)} feedback emails for {job_title} with outcome {outcome} and tone {tone}")
+        emails = []
+        for name in candidate_names:
+            name = name.strip()
+            template = templates[email_templates.pick_variant(name, variants)]
+            emails.append({"candidate_name": name, "email": template.render(name), "variant": template.variant})
+    except Exception as e:
+        logger.error(f"Error generating feedback emails: {e}")
+        raise RuntimeError("Failed to generate feedback emails")
+
+    metrics.increment("feedback_emails.rendered", len(emails))
+    logger.info("Feedback emails generated successfully")
+    return emails, sorted({template.template_id for template in templates})
+
+
+def _feedback_email_template(job_title, outcome, tone, variant):
+    """Returns the cached email template for this variant, asking the LLM to write it on a miss."""
+    template, prompt = prompt_templates.render(
+        "feedback_email_template",
+        tone=tone,
+        status_text="acceptance" if outcome == "accepted" else "rejection",
+        job_title=job_title,
+        name_placeholder=email_templates.NAME_PLACEHOLDER,
+        variation=f"Word it differently from other versions of this email (version {variant + 1})." if variant else "",
+    )
+    model = model_for("feedback_email")
+    key = email_templates.cache_key(template.id, model, job_title, outcome, tone, variant)
+    with _feedback_template_locks.setdefault(key, threading.Lock()):
+        cached = email_templates.get_cached(key, variant)
+        if cached is not None:
+            metrics.increment(f"feedback_templates.cache_hits.{template.id}")
+            return cached
+
+        email_template = email_templates.EmailTemplate(_complete(template, prompt, task="feedback_email"), template.id, variant)
+        email_templates.store(key, email_template)
+        return email_template
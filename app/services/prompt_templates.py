@@ -0,0 +1,119 @@
+import logging
+import os
+import random
+import re
+from string import Formatter
+
+from app.config import Config
+from app.utils import tracing
+from app.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+
+# Template files are named <name>.<version>.txt, e.g. screen_resume.v2.txt
+_FILENAME_RE = re.compile(r"^(?P<name>[a-z0-9_]+)\.(?P<version>v\d+)\.txt$")
+
+
+class PromptTemplate:
+    """
+    A prompt template compiled once at load time.
+
+    Templates use str.format-style placeholders ("{resume_text}"). The source is
+    split into literal/field pairs up front, so rendering is a single join and
+    unknown or missing placeholders are caught at startup rather than per call.
+    """
+
+    def __init__(self, name, version, source):
+        self.name = name
+        self.version = version
+        self.id = f"{name}@{version}"
+        self._parts = []
+        for literal, field, format_spec, conversion in Formatter().parse(source):
+            if field is not None and (not field.isidentifier() or format_spec or conversion):
+                raise ValueError(f"Unsupported placeholder '{{{field}}}' in prompt template {self.id}.")
+            self._parts.append((literal, field))
+        self.fields = frozenset(field for _, field in self._parts if field)
+
+    def render(self, **values):
+        missing = self.fields - values.keys()
+        if missing:
+            raise ValueError(f"Missing values for prompt template {self.id}: {', '.join(sorted(missing))}")
+        return "".join(literal + (str(values[field]) if field else "") for literal, field in self._parts)
+
+
+class PromptRegistry:
+    """
+    Holds every version of every prompt template and picks the one to serve.
+
+    Version selection is driven by Config.PROMPT_VERSIONS, e.g.
+    PROMPT_VERSIONS="screen_resume=v2" pins a version, and
+    PROMPT_VERSIONS="screen_resume=v1:90|v2:10" splits traffic by weight.
+    Templates without an entry are served at their highest version.
+    """
+
+    def __init__(self, templates=(), versions=None):
+        self._templates = {}
+        for template in templates:
+            self._templates.setdefault(template.name, {})[template.version] = template
+        self._rollouts = {}
+        for name, spec in (versions or {}).items():
+            self._rollouts[name] = self._parse_rollout(name, spec)
+
+    @classmethod
+    def from_directory(cls, directory, versions=None):
+        templates = []
+        for filename in sorted(os.listdir(directory)):
+            match = _FILENAME_RE.match(filename)
+            if not match:
+                continue
+            with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                source = f.read()
+            if source.endswith("\n"):
+                source = source[:-1]
+            templates.append(PromptTemplate(match["name"], match["version"], source))
+        logger.info(f"Loaded {len(templates)} prompt templates from {directory}")
+        return cls(templates, versions)
+
+    def _parse_rollout(self, name, spec):
+        if name not in self._templates:
+            raise ValueError(f"Unknown prompt template '{name}' in PROMPT_VERSIONS.")
+        rollout = []
+        for entry in spec.split("|"):
+            version, _, weight = entry.strip().partition(":")
+            if version not in self._templates[name]:
+                raise ValueError(f"Unknown version '{version}' for prompt template '{name}'.")
+            rollout.append((version, float(weight) if weight else 1.0))
+        return rollout
+
+    def names(self):
+        return sorted(self._templates)
+
+    def versions(self, name):
+        return sorted(self._templates.get(name, {}), key=lambda version: int(version[1:]))
+
+    def get(self, name, version=None):
+        """Returns the template to serve for `name`, honouring any configured rollout."""
+        if name not in self._templates:
+            raise KeyError(f"Unknown prompt template '{name}'.")
+        if version is None:
+            rollout = self._rollouts.get(name)
+            if rollout:
+                versions, weights = zip(*rollout)
+                version = random.choices(versions, weights=weights)[0] if len(versions) > 1 else versions[0]
+            else:
+                version = self.versions(name)[-1]
+        return self._templates[name][version]
+
+
+registry = PromptRegistry.from_directory(PROMPTS_DIR, Config.PROMPT_VERSIONS)
+
+
+def render(name, **values):
+    """Picks the served version of template `name` and renders it. Returns (template, prompt)."""
+    with tracing.span("prompt.render") as span:
+        template = registry.get(name)
+        prompt = template.render(**values)
+        span.set_attributes({"prompt.template_id": template.id, "prompt.estimated_tokens": estimate_tokens(prompt)})
+    return template, prompt
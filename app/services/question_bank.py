@@ -0,0 +1,73 @@
+import logging
+import re
+import time
+
+from app.utils.kv_store import get_store
+from app.utils.skill_matcher import get_matcher
+
+logger = logging.getLogger(__name__)
+
+# Screening questions generated once per skill and per job title, stored in the
+# shared key/value store and assembled into question sets on request.
+_NAMESPACE = "question_bank"
+_NUMBERING_RE = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+
+
+def normalize_skill(skill):
+    """
+    Returns (key, display name) for a requested skill.
+
+    Skills that are exactly one taxonomy skill (e.g. "k8s", "Kubernetes ")
+    map to its canonical name; anything else falls back to its whitespace-
+    collapsed text. The key is the lower-cased display name.
+    """
+    text = " ".join(skill.split())
+    found = get_matcher().find(text)
+    display = next(iter(found)) if len(found) == 1 else text
+    return display.lower(), display
+
+
+def normalize_skills(skills):
+    """Normalizes and de-duplicates skills, keeping the first spelling of each. Returns [(key, display)]."""
+    seen = {}
+    for skill in skills:
+        key, display = normalize_skill(skill)
+        if key and key not in seen:
+            seen[key] = display
+    return list(seen.items())
+
+
+def normalize_title(title):
+    text = " ".join(title.split())
+    return text.lower(), text
+
+
+def parse_questions(text):
+    """Splits an LLM answer into questions, one per non-empty line, without list numbering or bullets."""
+    questions = []
+    for line in (text or "").splitlines():
+        question = _NUMBERING_RE.sub("", line).strip()
+        if question:
+            questions.append(question)
+    return questions
+
+
+def get_entry(kind, key):
+    """Returns the banked entry for a "skill" or "title" key, or None if it hasn't been generated yet."""
+    return get_store().get(_NAMESPACE, f"{kind}:{key}")
+
+
+def store_entry(kind, key, name, questions, template_id):
+    entry = {"name": name, "questions": questions, "template_id": template_id, "created_at": time.time()}
+    get_store().set(_NAMESPACE, f"{kind}:{key}", entry)
+    logger.info(f"Banked {len(questions)} screening questions for {kind} {name!r}")
+    return entry
+
+
+def assemble(entries, per_entry):
+    """Numbers up to `per_entry[kind]` questions from each (kind, entry) pair into one list, skipping repeats."""
+    questions = []
+    for kind, entry in entries:
+        fresh = [question for question in entry["questions"] if question not in questions]
+        questions.extend(fresh[:per_entry[kind]])
+    return "\n".join(f"{number}. {question}" for number, question in enumerate(questions, start=1))
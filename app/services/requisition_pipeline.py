@@ -0,0 +1,191 @@
+import logging
+import time
+
+from app.config import Config
+from app.services import jd_registry, openai_service
+from app.utils import parser_pool
+from app.utils.dag import Task, run_dag
+from app.utils.resume_sections import PAGE_BREAK
+from app.utils.skill_matcher import get_matcher
+
+logger = logging.getLogger(__name__)
+
+_TONES = ("professional", "friendly", "formal")
+
+
+def build_pipeline(spec, resume_files=None):
+    """
+    Validates a requisition spec and returns a generator that runs it end to end.
+
+    The spec holds a "requisition" and a list of "applicants". The requisition
+    either describes the job to generate a JD for (title, seniority, skills,
+    location, description) or names an existing one (job_description or
+    jd_id). It may also set "tone" and "pass_score" for feedback emails. Each
+    applicant has a candidate_name plus either resume_text or resume_file (the
+    name of an uploaded file in `resume_files`).
+
+    The steps run as a dependency graph: resumes are parsed while the JD is
+    generated, questions are generated from the title and skills alongside
+    everything else, each screening starts once the JD and that resume are
+    ready, and each feedback email as soon as its screening is done.
+
+    Parameters:
+    - spec (dict): The requisition spec.
+    - resume_files (dict): Uploaded resume streams by form field name.
+    Returns:
+    - generator of dict: one event per stage as it completes, then a summary.
+    Raises:
+    - ValueError: If the spec is invalid.
+    """
+    resume_files = resume_files or {}
+    if not isinstance(spec, dict):
+        raise ValueError("Pipeline spec must be a JSON object.")
+    requisition = spec.get("requisition")
+    applicants = spec.get("applicants")
+    if not isinstance(requisition, dict):
+        raise ValueError("A requisition is required.")
+    if not isinstance(applicants, list) or not applicants:
+        raise ValueError("At least one applicant is required.")
+    if len(applicants) > Config.PIPELINE_MAX_APPLICANTS:
+        raise ValueError(f"At most {Config.PIPELINE_MAX_APPLICANTS} applicants are allowed per pipeline.")
+
+    title = requisition.get("title")
+    skills = requisition.get("skills")
+    if not (requisition.get("jd_id") or requisition.get("job_description") or (title and skills)):
+        raise ValueError("The requisition needs a jd_id, a job_description, or a title and skills.")
+    if skills is not None and (not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills)):
+        raise ValueError("Skills must be a list of strings.")
+    if requisition.get("jd_id") and jd_registry.get_jd(requisition["jd_id"]) is None:
+        raise ValueError("Unknown jd_id.")
+    tone = requisition.get("tone", "professional")
+    if tone not in _TONES:
+        raise ValueError("Tone must be one of: professional, friendly, formal.")
+    pass_score = requisition.get("pass_score", Config.SCREEN_DECISION_THRESHOLD)
+    if not isinstance(pass_score, int) or not 0 <= pass_score <= 100:
+        raise ValueError("pass_score must be an integer between 0 and 100.")
+
+    for applicant in applicants:
+        if not isinstance(applicant, dict) or not isinstance(applicant.get("candidate_name"), str) or not applicant["candidate_name"].strip():
+            raise ValueError("Each applicant needs a candidate_name.")
+        if applicant.get("resume_file") is not None:
+            if applicant["resume_file"] not in resume_files:
+                raise ValueError(f"No uploaded file named {applicant['resume_file']!r}.")
+        elif not isinstance(applicant.get("resume_text"), str) or not applicant["resume_text"].strip():
+            raise ValueError("Each applicant needs resume_text or resume_file.")
+
+    tasks = _build_tasks(requisition, applicants, resume_files, tone, pass_score)
+    return _stream(run_dag(tasks, Config.PIPELINE_CONCURRENCY), resume_files)
+
+
+def _build_tasks(requisition, applicants, resume_files, tone, pass_score):
+    title = requisition.get("title")
+    skills = requisition.get("skills")
+
+    def resolve_jd(_):
+        if requisition.get("jd_id"):
+            record = jd_registry.get_jd(requisition["jd_id"])
+            return {"jd_id": record["id"], "job_description": record["text"], "required_skills": record["required_skills"]}
+        text = requisition.get("job_description")
+        template_id = None
+        if not text:
+            text = openai_service.generate_job_description(
+                title,
+                requisition.get("seniority", ""),
+                skills,
+                requisition.get("location", "remote"),
+                requisition.get("description"),
+            )
+            template_id = getattr(text, "template_id", None)
+        record = jd_registry.register_jd(text, source="pipeline")[0]
+        return {
+            "jd_id": record["id"],
+            "job_description": record["text"],
+            "required_skills": record["required_skills"],
+            "template_id": template_id,
+        }
+
+    tasks = [Task("jd", resolve_jd, info={"stage": "job_description"})]
+
+    if title:
+        # With explicit skills, questions don't need to wait for the JD
+        def questions(inputs):
+            question_skills = skills or inputs["jd"]["required_skills"]
+            if not question_skills:
+                raise ValueError("No skills to generate questions for.")
+            result = openai_service.generate_screening_questions(title, question_skills)
+            return {"questions": result, "template_id": getattr(result, "template_id", None)}
+
+        tasks.append(Task("questions", questions, () if skills else ("jd",), info={"stage": "questions"}))
+
+    for index, applicant in enumerate(applicants):
+        name = applicant["candidate_name"].strip()
+        info = {"applicant": index, "candidate_name": name}
+        screen_deps = ("jd",)
+
+        if applicant.get("resume_file") is not None:
+            stream = resume_files[applicant["resume_file"]]
+
+            def extract(_, stream=stream):
+                stream.seek(0)
+                data = stream.read()
+                text = parser_pool.submit(data, PAGE_BREAK).result()
+                if not text.strip():
+                    raise ValueError("Resume text is empty.")
+                return {"resume_text": text}
+
+            tasks.append(Task(f"extract:{index}", extract, info={"stage": "extract", **info}))
+            screen_deps = ("jd", f"extract:{index}")
+
+        def screen(inputs, index=index, applicant=applicant):
+            jd = inputs["jd"]
+            resume_text = inputs[f"extract:{index}"]["resume_text"] if f"extract:{index}" in inputs else applicant["resume_text"]
+            skill_match = None
+            if Config.SKILL_MATCH_IN_SCREENING:
+                skill_match = get_matcher().match(jd["required_skills"], resume_text)
+            result = openai_service.screen_resume(jd["job_description"], resume_text, skill_match=skill_match)
+            return {
+                "screening_result": result,
+                "fit_score": openai_service.parse_fit_score(result),
+                "skill_match": skill_match,
+                "template_id": getattr(result, "template_id", None),
+            }
+
+        tasks.append(Task(f"screen:{index}", screen, screen_deps, info={"stage": "screen", **info}))
+
+        if title:
+            def feedback(inputs, index=index, name=name):
+                fit_score = inputs[f"screen:{index}"]["fit_score"]
+                if fit_score is None:
+                    raise ValueError("Screening result has no fit score.")
+                outcome = "accepted" if fit_score >= pass_score else "rejected"
+                emails, template_ids = openai_service.generate_feedback_emails([name], title, outcome, tone)
+                return {"outcome": outcome, "email": emails[0]["email"], "template_id": ",".join(template_ids)}
+
+            tasks.append(Task(f"feedback:{index}", feedback, (f"screen:{index}",), info={"stage": "feedback", **info}))
+
+    return tasks
+
+
+def _stream(events, resume_files):
+    started_at = time.perf_counter()
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+    stage_ms = {}
+    try:
+        for event in events:
+            counts[event["status"]] += 1
+            if event["elapsed_ms"] is not None:
+                stage_ms[event["stage"]] = round(stage_ms.get(event["stage"], 0) + event["elapsed_ms"], 1)
+            yield event
+    finally:
+        events.close()
+        for stream in resume_files.values():
+            stream.close()
+
+    logger.info(f"Requisition pipeline finished: {counts}")
+    yield {
+        "task": "summary",
+        "status": "summary",
+        **counts,
+        "stage_ms": stage_ms,
+        "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 1),
+    }
@@ -0,0 +1,74 @@
+import hashlib
+import time
+
+from app.config import Config
+from app.utils.kv_store import get_store
+from app.utils.resume_sections import segment_resume
+from app.utils.tokens import estimate_tokens
+
+# Long resumes are screened map-reduce style: each chunk of sections is
+# summarized on its own (map), then one call screens the summaries against the
+# JD (reduce). Summaries don't depend on the JD, so they are cached by chunk
+# text and reused when the same resume is screened for another job.
+_NAMESPACE = "resume_chunk_summaries"
+
+
+def _pieces(section, lines, max_tokens):
+    """Splits one section into labelled pieces of at most ~max_tokens, breaking between lines."""
+    label = section.upper()
+    pieces, current, size = [], [], 0
+    for line in lines:
+        tokens = estimate_tokens(line) + 1
+        if current and size + tokens > max_tokens:
+            pieces.append(current)
+            current, size = [], 0
+        current.append(line)
+        size += tokens
+    if current:
+        pieces.append(current)
+    if len(pieces) == 1:
+        return [f"{label}:\n" + "\n".join(pieces[0])]
+    return [f"{label} (part {number}):\n" + "\n".join(piece) for number, piece in enumerate(pieces, start=1)]
+
+
+def split_chunks(resume_text, max_tokens):
+    """
+    Splits resume text into chunks of whole sections, each about `max_tokens` at most.
+
+    Consecutive short sections share a chunk; a section longer than the budget
+    (e.g. a publications list) is split between lines into numbered parts. The
+    contact block is left out, as in compact_resume(). Returns a list of str.
+    """
+    chunks, current, size = [], [], 0
+    for section, lines in segment_resume(resume_text).items():
+        if section == "contact":
+            continue
+        for piece in _pieces(section, lines, max_tokens):
+            tokens = estimate_tokens(piece)
+            if current and size + tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def cache_key(template_id, model, chunk):
+    return hashlib.sha256("\0".join([template_id, model, chunk]).encode()).hexdigest()
+
+
+def get_cached(key):
+    record = get_store().get(_NAMESPACE, key)
+    return record["summary"] if record is not None else None
+
+
+def store(key, summary, template_id):
+    get_store().set(
+        _NAMESPACE,
+        key,
+        {"summary": summary, "template_id": template_id, "created_at": time.time()},
+        ttl=Config.SCREEN_CHUNK_SUMMARY_TTL,
+    )
+
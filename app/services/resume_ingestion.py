@@ -0,0 +1,136 @@
+import contextvars
+import hashlib
+import logging
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.config import Config
+from app.services import openai_service
+from app.utils import parser_pool
+
+logger = logging.getLogger(__name__)
+
+_READ_CHUNK = 64 * 1024
+
+
+def _resume_entries(archive):
+    # Skip directories, macOS resource forks and anything that isn't a PDF
+    for info in archive.infolist():
+        name = info.filename
+        if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+            continue
+        if name.lower().endswith(".pdf"):
+            yield info
+
+
+def _read_entry(archive, info):
+    """Decompresses one archive entry, enforcing the upload size limit on the bytes actually produced."""
+    limit = Config.UPLOAD_MAX_FILE_SIZE
+    if info.file_size > limit:
+        raise ValueError(f"Entry exceeds {limit} bytes")
+    buffer = bytearray()
+    with archive.open(info) as entry:
+        while chunk := entry.read(_READ_CHUNK):
+            buffer += chunk
+            # Guards against entries whose header understates their size
+            if len(buffer) > limit:
+                raise ValueError(f"Entry exceeds {limit} bytes")
+    return bytes(buffer)
+
+
+def ingest_archive(archive_file, job_description=None):
+    """
+    Streams resumes out of a zip archive and yields one result dict per entry.
+
+    Entries are decompressed one at a time and deduplicated by SHA-256 of their
+    content. Unique PDFs are parsed in the shared process pool, and at most
+    INGEST_MAX_IN_FLIGHT entries are held in memory at once, so peak memory does
+    not grow with archive size. If a job description is given, each resume is
+    also screened, with at most INGEST_SCREEN_CONCURRENCY concurrent calls.
+    Results are yielded in completion order, followed by a summary record.
+
+    Parameters:
+    - archive_file (file-like): Seekable zip archive.
+    - job_description (str): Optional job description to screen each resume against.
+    Returns:
+    - generator of dict: {"file", "status", ...} per entry, then {"status": "summary", ...}.
+    Raises:
+    - ValueError: If the file is not a valid zip archive.
+    """
+    try:
+        archive = zipfile.ZipFile(archive_file)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Invalid zip archive: {e}")
+    # Validation happens eagerly above; the work itself is a lazy generator
+    return _ingest(archive, job_description)
+
+
+def _ingest(archive, job_description):
+    screen_pool = ThreadPoolExecutor(max_workers=Config.INGEST_SCREEN_CONCURRENCY) if job_description else None
+    seen = {}
+    pending = {}
+    counts = {"entries": 0, "ok": 0, "duplicate": 0, "error": 0}
+    started_at = time.perf_counter()
+
+    def finish(record):
+        counts[record["status"]] += 1
+        return record
+
+    try:
+        entries = _resume_entries(archive)
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < Config.INGEST_MAX_IN_FLIGHT:
+                info = next(entries, None)
+                if info is None:
+                    exhausted = True
+                    break
+                counts["entries"] += 1
+                try:
+                    data = _read_entry(archive, info)
+                except Exception as e:
+                    logger.error(f"Error reading archive entry {info.filename}: {e}")
+                    yield finish({"file": info.filename, "status": "error", "error": str(e)})
+                    continue
+                sha256 = hashlib.sha256(data).hexdigest()
+                if sha256 in seen:
+                    yield finish({"file": info.filename, "status": "duplicate", "sha256": sha256, "duplicate_of": seen[sha256]})
+                    continue
+                seen[sha256] = info.filename
+                future = parser_pool.submit(data)
+                pending[future] = ("extract", {"file": info.filename, "sha256": sha256}, time.perf_counter())
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, record, stage_started = pending.pop(future)
+                elapsed_ms = round((time.perf_counter() - stage_started) * 1000, 1)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing {record['file']} ({stage}): {e}")
+                    yield finish({**record, "status": "error", "stage": stage, "error": str(e)})
+                    continue
+
+                if stage == "extract":
+                    record.update(resume_text=result, extract_ms=elapsed_ms)
+                    if screen_pool is not None and result.strip():
+                        screen_future = screen_pool.submit(contextvars.copy_context().run, openai_service.screen_resume, job_description, result)
+                        pending[screen_future] = ("screen", record, time.perf_counter())
+                        continue
+                else:
+                    record.update(screening_result=result, screen_ms=elapsed_ms)
+                yield finish({**record, "status": "ok"})
+    finally:
+        for future in pending:
+            future.cancel()
+        if screen_pool is not None:
+            screen_pool.shutdown(wait=False)
+        archive.close()
+
+    logger.info(f"Ingested archive: {counts}")
+    yield {"status": "summary", **counts, "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 1)}
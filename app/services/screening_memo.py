@@ -0,0 +1,49 @@
+import hashlib
+import logging
+
+from app.config import Config
+from app.utils import metrics
+from app.utils.cache import LRUCache
+from app.utils.near_duplicates import LSHIndex, MinHasher
+
+logger = logging.getLogger(__name__)
+
+# Remembers screening results so near-identical resumes screened against the
+# same job description (re-applications, agency duplicates) reuse the prior
+# result instead of paying for another LLM call.
+_hasher = MinHasher(num_perm=Config.NEAR_DUP_NUM_PERM)
+_index = LSHIndex(num_perm=Config.NEAR_DUP_NUM_PERM, bands=Config.NEAR_DUP_BANDS, max_entries=Config.NEAR_DUP_MAX_ENTRIES)
+_results = LRUCache(max_size=Config.NEAR_DUP_MAX_ENTRIES)
+
+
+def _digest(text):
+    return hashlib.sha256(" ".join(text.split()).encode()).hexdigest()
+
+
+def find_prior_result(job_desc, resume_text):
+    """
+    Looks for a previous screening of a near-duplicate resume against the same job description.
+
+    Returns:
+    - tuple: (result, resume key of the earlier submission, estimated similarity),
+      or None if there is no match at or above NEAR_DUP_THRESHOLD.
+    """
+    if not Config.NEAR_DUP_ENABLED:
+        return None
+    jd_key = _digest(job_desc)
+    for resume_key, similarity in _index.query(_hasher.signature(resume_text), Config.NEAR_DUP_THRESHOLD):
+        result = _results.get((resume_key, jd_key))
+        if result is not None:
+            logger.info(f"Reusing screening of near-duplicate resume {resume_key[:12]} (similarity {similarity:.2f})")
+            metrics.increment("screening.near_duplicate_hits")
+            return result, resume_key, similarity
+    return None
+
+
+def record_result(job_desc, resume_text, result):
+    """Stores a screening result and indexes the resume for later near-duplicate lookups. Returns the resume key."""
+    resume_key = _digest(resume_text)
+    if Config.NEAR_DUP_ENABLED:
+        _index.add(resume_key, _hasher.signature(resume_text))
+        _results.set((resume_key, _digest(job_desc)), result)
+    return resume_key
@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+import time
+
+from app.config import Config
+from app.services import openai_service, prompt_templates
+from app.utils import metrics, parser_pool, tracing
+from app.utils.kv_store import get_store
+from app.utils.resume_parser import extract_text_from_resume
+from app.utils.resume_sections import compact_resume
+from app.utils.skill_matcher import get_matcher
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RESUME_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sample_resume.pdf")
+
+# Warm-up state for this process. A forked worker inherits the parent's state
+# but not its thread, so the owning pid decides whether warm-up ran here.
+_lock = threading.Lock()
+_state = {"pid": None, "status": "idle", "steps": {}, "elapsed_ms": None}
+
+
+def _warm_templates():
+    names = prompt_templates.registry.names()
+    for name in names:
+        prompt_templates.registry.get(name)
+    return {"templates": len(names)}
+
+
+def _warm_skill_matcher():
+    get_matcher()
+    return {}
+
+
+def _warm_store():
+    store = get_store()
+    store.purge_expired()
+    return {"path": store.path}
+
+
+def _warm_tracing():
+    return {"exporter": type(tracing.get_exporter()).__name__}
+
+
+def _warm_extraction():
+    # Runs the in-process extraction path end to end on the bundled sample
+    with open(SAMPLE_RESUME_PATH, "rb") as f:
+        text = extract_text_from_resume(f)
+    compact_resume(text)
+    get_matcher().find(text)
+    return {"chars": len(text)}
+
+
+def _warm_parser_pool():
+    # One document per worker, so every worker process is started before traffic arrives
+    with open(SAMPLE_RESUME_PATH, "rb") as f:
+        data = f.read()
+    futures = [parser_pool.submit(data) for _ in range(Config.PARSER_WORKERS)]
+    for future in futures:
+        future.result()
+    return {"workers": Config.PARSER_WORKERS}
+
+
+def _warm_upstream():
+    # Opens (and keeps in the client's pool) a TLS connection to the API; the
+    # copy shares the service client's HTTP connection pool
+    client = openai_service.client.with_options(timeout=Config.WARMUP_UPSTREAM_TIMEOUT, max_retries=0)
+    client.models.list()
+    return {}
+
+
+STEPS = (
+    ("prompt_templates", _warm_templates),
+    ("skill_matcher", _warm_skill_matcher),
+    ("kv_store", _warm_store),
+    ("tracing", _warm_tracing),
+    ("extraction", _warm_extraction),
+    ("parser_pool", _warm_parser_pool),
+    ("upstream", _warm_upstream),
+)
+
+
+def run():
+    """
+    Runs every warm-up step in order and marks this process ready.
+
+    A failing step is logged and recorded but doesn't keep the process out of
+    service: it only means that path pays its start-up cost on first use.
+
+    Returns:
+    - dict: The warm-up status (see status()).
+    """
+    started_at = time.perf_counter()
+    failed = []
+    for name, step in STEPS:
+        step_started = time.perf_counter()
+        try:
+            details = step()
+            result = {"status": "ok", **details}
+        except Exception as e:
+            logger.error(f"Warm-up step {name} failed: {e}")
+            result = {"status": "error", "error": str(e)}
+            failed.append(name)
+        elapsed_ms = (time.perf_counter() - step_started) * 1000
+        result["elapsed_ms"] = round(elapsed_ms, 1)
+        metrics.observe(f"warmup.latency_ms.{name}", elapsed_ms)
+        with _lock:
+            _state["steps"][name] = result
+
+    elapsed_ms = round((time.perf_counter() - started_at) * 1000, 1)
+    with _lock:
+        _state["status"] = "ready"
+        _state["elapsed_ms"] = elapsed_ms
+    logger.info(f"Warm-up finished in {elapsed_ms} ms" + (f" ({', '.join(failed)} failed)" if failed else ""))
+    return status()
+
+
+def start():
+    """Starts warm-up in a background thread, once per process. Returns False if it already started here."""
+    with _lock:
+        if _state["pid"] == os.getpid():
+            return False
+        _state.update(pid=os.getpid(), status="running", steps={}, elapsed_ms=None)
+    logger.info("Starting warm-up")
+    threading.Thread(target=run, name="warmup", daemon=True).start()
+    return True
+
+
+def is_ready():
+    with _lock:
+        return _state["pid"] == os.getpid() and _state["status"] == "ready"
+
+
+def status():
+    """Returns {"status": "idle"|"running"|"ready", "steps": {name: {"status", "elapsed_ms", ...}}, "elapsed_ms"}."""
+    with _lock:
+        if _state["pid"] != os.getpid():
+            return {"status": "idle", "steps": {}, "elapsed_ms": None}
+        return {"status": _state["status"], "steps": dict(_state["steps"]), "elapsed_ms": _state["elapsed_ms"]}
@@ -0,0 +1,188 @@
+import functools
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+from flask import jsonify, make_response
+
+from app.config import Config
+from app.utils import deadlines, metrics
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest request in the moving average of service time
+_SERVICE_TIME_WEIGHT = 0.2
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed. `retry_after` is the suggested wait in seconds."""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Overloaded ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    Bounds the requests a route runs at once, with a bounded FIFO wait queue.
+
+    Up to `max_in_flight` requests run concurrently. Up to `max_queue` more wait
+    for a slot, each for at most `max_wait` seconds. A request is shed right
+    away when the queue is full, or when the expected wait (from the moving
+    average service time) is already longer than `max_wait`, so it doesn't tie
+    up a server thread only to time out.
+    """
+
+    def __init__(self, name, max_in_flight, max_queue, max_wait):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.service_time = None
+        self._waiters = deque()
+        self._cond = threading.Condition()
+
+    def _expected_wait(self, position):
+        # The queue drains max_in_flight requests per average service time
+        if self.service_time is None:
+            return None
+        return position * self.service_time / self.max_in_flight
+
+    def _retry_after(self):
+        expected = self._expected_wait(len(self._waiters) + 1)
+        retry_after = math.ceil(expected) if expected else 1
+        return max(1, min(retry_after, Config.ADMISSION_MAX_RETRY_AFTER))
+
+    def acquire(self, max_wait=None):
+        """
+        Takes a slot, waiting in the queue if needed.
+
+        `max_wait` shortens the route's queue wait, e.g. to the request's remaining deadline.
+
+        Returns:
+        - float: Seconds spent waiting in the queue.
+        Raises:
+        - Overloaded: If the request is shed.
+        """
+        with self._cond:
+            if self.in_flight < self.max_in_flight and not self._waiters:
+                self.in_flight += 1
+                return 0.0
+            if len(self._waiters) >= self.max_queue:
+                raise Overloaded("queue_full", self._retry_after())
+            max_wait = self.max_wait if max_wait is None else max(0.0, min(max_wait, self.max_wait))
+            expected = self._expected_wait(len(self._waiters) + 1)
+            if expected is not None and expected > max_wait:
+                raise Overloaded("expected_wait", self._retry_after())
+
+            ticket = object()
+            self._waiters.append(ticket)
+            started = time.monotonic()
+            deadline = started + max_wait
+            try:
+                while self._waiters[0] is not ticket or self.in_flight >= self.max_in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Overloaded("timeout", self._retry_after())
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+            self.in_flight += 1
+            return time.monotonic() - started
+
+    def release(self, service_time):
+        with self._cond:
+            self.in_flight -= 1
+            if self.service_time is None:
+                self.service_time = service_time
+            else:
+                self.service_time += _SERVICE_TIME_WEIGHT * (service_time - self.service_time)
+            self._cond.notify_all()
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "service_time_ms": round(self.service_time * 1000, 1) if self.service_time is not None else None,
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _limits_for(name):
+    # ADMISSION_LIMITS entries look like "screen_resume=8:16" (in-flight:queue)
+    spec = Config.ADMISSION_LIMITS.get(name)
+    if not spec:
+        return Config.ADMISSION_MAX_IN_FLIGHT, Config.ADMISSION_MAX_QUEUE
+    in_flight, _, queue = spec.partition(":")
+    return int(in_flight), int(queue) if queue else Config.ADMISSION_MAX_QUEUE
+
+
+def get_limiter(name):
+    """Returns the limiter for route `name` (its view function name), creating it from Config on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            max_in_flight, max_queue = _limits_for(name)
+            limiter = _limiters[name] = AdmissionLimiter(name, max_in_flight, max_queue, Config.ADMISSION_MAX_WAIT)
+            logger.info(f"Admission limits for {name}: {max_in_flight} in flight, {max_queue} queued")
+        return limiter
+
+
+def snapshot():
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
+
+
+def admission_controlled(view):
+    """
+    Applies the route's in-flight limit and wait queue to a view.
+
+    Shed requests get 503 with a Retry-After header estimated from the current
+    queue and service time. Queue time is recorded as admission.queue_ms.<route>
+    and sheds as admission.shed.<route>. A streamed response holds its slot
+    until the stream is closed.
+    """
+    name = view.__name__
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not Config.ADMISSION_ENABLED:
+            return view(*args, **kwargs)
+        limiter = get_limiter(name)
+        try:
+            waited = limiter.acquire(deadlines.remaining())
+        except Overloaded as e:
+            logger.warning(f"Shedding request to {name}: {e.reason}")
+            metrics.increment(f"admission.shed.{name}")
+            metrics.increment(f"admission.shed_reason.{e.reason}")
+            response = jsonify({"error": "Service is busy, please retry later."})
+            response.status_code = 503
+            response.headers["Retry-After"] = str(e.retry_after)
+            return response
+
+        metrics.observe(f"admission.queue_ms.{name}", waited * 1000)
+        started = time.monotonic()
+        try:
+            response = make_response(view(*args, **kwargs))
+        except Exception:
+            limiter.release(time.monotonic() - started)
+            raise
+        if response.is_streamed:
+            response.call_on_close(lambda: limiter.release(time.monotonic() - started))
+        else:
+            limiter.release(time.monotonic() - started)
+        return response
+
+    return wrapper
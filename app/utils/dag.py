@@ -0,0 +1,126 @@
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Task:
+    """
+    A node in a task graph.
+
+    `fn` is called with a dict mapping each dependency's name to its result.
+    `info` is carried through untouched into the task's completion event.
+    """
+
+    name: str
+    fn: object
+    deps: tuple = ()
+    info: dict = field(default_factory=dict)
+
+
+def run_dag(tasks, max_workers):
+    """
+    Runs a dependency graph of tasks on a thread pool, each as soon as its dependencies are done.
+
+    Yields one event per task in completion order:
+    {"task", "status" ("ok", "error" or "skipped"), "result" or "error",
+    "started_ms" (offset from the start of the run), "elapsed_ms"}.
+    Tasks whose dependencies failed or were skipped are skipped. Closing the
+    generator early cancels everything that hasn't started.
+
+    Raises:
+    - ValueError: If a dependency is unknown or the graph has a cycle.
+    """
+    tasks = {task.name: task for task in tasks}
+    for task in tasks.values():
+        unknown = [dep for dep in task.deps if dep not in tasks]
+        if unknown:
+            raise ValueError(f"Task {task.name} depends on unknown tasks: {', '.join(unknown)}")
+    _check_acyclic(tasks)
+    return _run(tasks, max_workers)
+
+
+def _check_acyclic(tasks):
+    state = {}
+
+    def visit(name):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Task graph has a cycle through {name}")
+        state[name] = "visiting"
+        for dep in tasks[name].deps:
+            visit(dep)
+        state[name] = "done"
+
+    for name in tasks:
+        visit(name)
+
+
+def _timed(fn, inputs):
+    # Runs in a pool thread; errors are returned rather than raised so their timing survives
+    started = time.perf_counter()
+    try:
+        result = fn(inputs)
+        return started, time.perf_counter(), result, None
+    except Exception as e:
+        return started, time.perf_counter(), None, e
+
+
+def _run(tasks, max_workers):
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dag")
+    run_started = time.perf_counter()
+    waiting = dict(tasks)
+    results, failed = {}, set()
+    running = {}
+
+    def event(task, status, started=None, finished=None, **extra):
+        return {
+            "task": task.name,
+            **task.info,
+            "status": status,
+            "started_ms": round((started - run_started) * 1000, 1) if started else None,
+            "elapsed_ms": round((finished - started) * 1000, 1) if started else None,
+            **extra,
+        }
+
+    def advance():
+        # Skip tasks that can no longer run, start the ones whose inputs are all ready
+        events = []
+        progressed = True
+        while progressed:
+            progressed = False
+            for name, task in list(waiting.items()):
+                if any(dep in failed for dep in task.deps):
+                    del waiting[name]
+                    failed.add(name)
+                    events.append(event(task, "skipped"))
+                    progressed = True
+                elif all(dep in results for dep in task.deps):
+                    del waiting[name]
+                    inputs = {dep: results[dep] for dep in task.deps}
+                    future = executor.submit(contextvars.copy_context().run, _timed, task.fn, inputs)
+                    running[future] = task
+        return events
+
+    try:
+        yield from advance()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                started, finished, result, error = future.result()
+                if error is not None:
+                    logger.error(f"Task {task.name} failed: {error}")
+                    failed.add(task.name)
+                    yield event(task, "error", started, finished, error=str(error))
+                    continue
+                results[task.name] = result
+                yield event(task, "ok", started, finished, result=result)
+            yield from advance()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
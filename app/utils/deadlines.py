@@ -0,0 +1,118 @@
+import contextvars
+import functools
+import logging
+import time
+from contextlib import contextmanager
+
+from flask import jsonify, make_response, request
+
+from app.config import Config
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+HEADER = "X-Request-Timeout"
+
+# Absolute time.monotonic() deadline of the work in progress, or None. Copy the
+# context into executors (contextvars.copy_context().run) to carry it along.
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is abandoned because its request deadline has passed."""
+
+
+def current():
+    """Returns the absolute monotonic deadline in effect, or None."""
+    return _deadline.get()
+
+
+def remaining():
+    """Returns the seconds left before the deadline (may be negative), or None if there is no deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check(stage="work"):
+    """Raises DeadlineExceeded if the deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {stage}")
+
+
+def timeout_kwargs():
+    """Returns {"timeout": seconds left} for an upstream call, {} without a deadline. Raises DeadlineExceeded if none is left."""
+    left = remaining()
+    if left is None:
+        return {}
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded before upstream call")
+    return {"timeout": left}
+
+
+def detached_context():
+    """Copies the current context without its deadline, for background work that outlives the request."""
+    context = contextvars.copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+@contextmanager
+def scope_until(deadline):
+    """Runs the block with an absolute monotonic deadline; None runs it without one."""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _budget(name):
+    """Returns the route's time budget in seconds: the client's X-Request-Timeout if sent, else its Config default."""
+    default = float(Config.ROUTE_TIMEOUTS.get(name, Config.REQUEST_TIMEOUT))
+    header = request.headers.get(HEADER)
+    if header is None:
+        return default or None
+    seconds = float(header)
+    if not 0 < seconds < float("inf"):
+        raise ValueError(f"{HEADER} must be a positive number of seconds")
+    return min(seconds, Config.REQUEST_TIMEOUT_MAX)
+
+
+def with_deadline(view):
+    """
+    Gives a view a deadline that extraction, queueing and upstream calls respect.
+
+    The budget comes from the X-Request-Timeout header (seconds, capped at
+    REQUEST_TIMEOUT_MAX) or the route's entry in ROUTE_TIMEOUTS, falling back
+    to REQUEST_TIMEOUT. Once it passes, remaining work fails fast with
+    DeadlineExceeded and the request gets 504 instead of a generic error.
+
+    Returns:
+    - 400 if X-Request-Timeout is not a positive number
+    - 504 if the deadline passed before the view produced a successful response
+    """
+    name = view.__name__
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            budget = _budget(name)
+        except ValueError:
+            return jsonify({"error": f"{HEADER} must be a positive number of seconds"}), 400
+        if budget is None:
+            return view(*args, **kwargs)
+
+        with scope_until(time.monotonic() + budget):
+            try:
+                response = make_response(view(*args, **kwargs))
+            except DeadlineExceeded:
+                response = None
+            # Services report failures generically, so an error after the deadline is treated as the timeout
+            if response is None or (response.status_code >= 500 and remaining() <= 0):
+                logger.warning(f"{name} exceeded its {budget:.1f}s deadline")
+                metrics.increment(f"deadline.exceeded.{name}")
+                return jsonify({"error": "Request deadline exceeded", "timeout_seconds": budget}), 504
+        return response
+
+    return wrapper
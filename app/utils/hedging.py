@@ -0,0 +1,83 @@
+import contextvars
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Attempt:
+    """
+    Handle passed to each copy of a hedged call.
+
+    The call sets `first_output` as soon as it has produced anything (e.g. the
+    first streamed token) and should stop early, returning None, once
+    `cancelled` is set because the other copy already won.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.first_output = threading.Event()
+        self.cancelled = threading.Event()
+
+
+class Hedger:
+    """
+    Races a duplicate of a slow call against the original.
+
+    The primary attempt starts immediately. If it hasn't produced first output
+    within `delay` seconds and the hedge budget allows it, a second attempt is
+    started and whichever finishes first wins; the loser is cancelled. The
+    hedge budget caps hedges at `max_rate` of all calls made through `run`.
+    """
+
+    def __init__(self, max_rate=0.1, max_workers=16):
+        self.max_rate = max_rate
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._hedges = 0
+
+    def _take_hedge_budget(self):
+        with self._lock:
+            if self._hedges + 1 > self.max_rate * self._calls:
+                return False
+            self._hedges += 1
+            return True
+
+    def run(self, call, delay, name="call"):
+        with self._lock:
+            self._calls += 1
+
+        primary = Attempt("primary")
+        primary_future = self._executor.submit(contextvars.copy_context().run, call, primary)
+        if delay is None:
+            return primary_future.result()
+
+        done, _ = wait([primary_future], timeout=delay)
+        if done or primary.first_output.wait(0) or not self._take_hedge_budget():
+            return primary_future.result()
+
+        logger.info(f"Hedging slow {name} after {delay * 1000:.0f} ms")
+        metrics.increment(f"hedge.{name}.fired")
+        hedge = Attempt("hedge")
+        attempts = {primary_future: primary, self._executor.submit(contextvars.copy_context().run, call, hedge): hedge}
+        pending = set(attempts)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                winner = attempts[future]
+                for other in attempts.values():
+                    if other is not winner:
+                        other.cancelled.set()
+                metrics.increment(f"hedge.{name}.{winner.label}_wins")
+                return result
+        raise error
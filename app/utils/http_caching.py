@@ -0,0 +1,68 @@
+import gzip
+import hashlib
+
+from flask import request
+
+from app.config import Config
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript")
+
+
+def _compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=Config.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=Config.GZIP_LEVEL)
+
+
+def _negotiate_encoding(response, body):
+    if len(body) < Config.COMPRESSION_MIN_SIZE:
+        return None
+    if not (response.mimetype or "").startswith(_COMPRESSIBLE_TYPES):
+        return None
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def finalize_response(response):
+    """
+    after_request hook adding strong ETags, conditional 304s and negotiated compression.
+
+    The ETag is a hash of the uncompressed body, suffixed per content encoding
+    so each representation has its own validator. A matching If-None-Match
+    returns 304 before any compression work is done. This is also honoured for
+    POST: the generator endpoints are treated as functions of their input, which
+    pays off when combined with the completion cache for deterministic requests.
+    Streamed responses (e.g. NDJSON ingestion) and non-200 responses pass through.
+    """
+    if response.status_code != 200 or response.is_streamed or response.direct_passthrough:
+        return response
+    if "Content-Encoding" in response.headers:
+        return response
+
+    body = response.get_data()
+    encoding = _negotiate_encoding(response, body)
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    etag = f"{digest}-{encoding}" if encoding else digest
+
+    response.set_etag(etag)
+    response.vary.add("Accept-Encoding")
+    if "Cache-Control" not in response.headers:
+        # Authenticated content: let clients keep it, but revalidate every time
+        response.headers["Cache-Control"] = "private, no-cache"
+
+    if request.method in ("GET", "HEAD", "POST") and request.if_none_match.contains_weak(etag):
+        response.status_code = 304
+        response.set_data(b"")
+        response.headers.pop("Content-Type", None)
+        response.headers.pop("Content-Length", None)
+        return response
+
+    if encoding:
+        response.set_data(_compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,122 @@
+import functools
+import hashlib
+import logging
+import time
+
+from flask import jsonify, make_response, request
+
+from app.config import Config
+from app.utils import deadlines, metrics
+from app.utils.kv_store import get_store
+
+logger = logging.getLogger(__name__)
+
+HEADER = "Idempotency-Key"
+NAMESPACE = "idempotency"
+_MAX_KEY_LENGTH = 255
+_POLL_INTERVAL = 0.05
+_MAX_POLL_INTERVAL = 1.0
+
+
+def _store_key(key):
+    # Keys are scoped to the caller and the endpoint, so two clients can't collide
+    user = request.authorization.username if request.authorization else ""
+    return hashlib.sha256(f"{user}\0{request.path}\0{key}".encode()).hexdigest()
+
+
+def _fingerprint():
+    """Hashes the request payload so a reused key with a different body can be rejected."""
+    digest = hashlib.sha256()
+    if request.mimetype == "multipart/form-data":
+        for name, value in sorted(request.form.items(multi=True)):
+            digest.update(f"form\0{name}\0{value}\0".encode())
+        for name, file in sorted(request.files.items(multi=True), key=lambda item: item[0]):
+            # Spooled uploads are hashed while they are received; anything else is read once
+            file_hash = getattr(file.stream, "sha256", None)
+            if file_hash is None:
+                file_hash = hashlib.sha256(file.read()).hexdigest()
+                file.seek(0)
+            digest.update(f"file\0{name}\0{file.filename}\0{file_hash}\0".encode())
+    else:
+        digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _replay(record):
+    response = make_response(record["body"], record["status"])
+    response.content_type = record["content_type"]
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(view):
+    """
+    Makes a POST endpoint honour the Idempotency-Key header.
+
+    The first request with a key claims it in the shared key/value store and
+    runs the view; its response is stored for Config.IDEMPOTENCY_TTL seconds
+    and replayed to later requests with the same key. Duplicates that arrive
+    while the first is still running wait for its result instead of calling
+    the LLM again. Server errors release the key so the client can retry.
+
+    Returns:
+    - 400 if the key is longer than 255 characters
+    - 422 if the key was already used with a different request body
+    - 409 if the original request is still running after IDEMPOTENCY_WAIT_TIMEOUT
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > _MAX_KEY_LENGTH:
+            return jsonify({"error": f"{HEADER} must be at most {_MAX_KEY_LENGTH} characters"}), 400
+
+        store = get_store()
+        store_key = _store_key(key)
+        fingerprint = _fingerprint()
+        pending = {"state": "pending", "fingerprint": fingerprint}
+        wait_timeout = Config.IDEMPOTENCY_WAIT_TIMEOUT
+        if deadlines.remaining() is not None:
+            wait_timeout = min(wait_timeout, deadlines.remaining())
+        deadline = time.monotonic() + wait_timeout
+        interval = _POLL_INTERVAL
+
+        while not store.add(NAMESPACE, store_key, pending, ttl=Config.IDEMPOTENCY_LOCK_TTL):
+            record = store.get(NAMESPACE, store_key)
+            if record is None:
+                # Released or expired between our add and get; try to claim it again
+                continue
+            if record["fingerprint"] != fingerprint:
+                logger.error(f"{HEADER} reused with a different request body on {request.path}")
+                return jsonify({"error": f"{HEADER} was already used with a different request"}), 422
+            if record["state"] == "done":
+                metrics.increment(f"idempotency.replayed.{request.endpoint}")
+                return _replay(record)
+            if time.monotonic() >= deadline:
+                logger.error(f"Timed out waiting for in-flight request with the same {HEADER}")
+                return jsonify({"error": f"A request with this {HEADER} is still in progress"}), 409
+            metrics.increment(f"idempotency.waits.{request.endpoint}")
+            time.sleep(interval)
+            interval = min(interval * 2, _MAX_POLL_INTERVAL)
+
+        try:
+            response = make_response(view(*args, **kwargs))
+        except Exception:
+            store.delete(NAMESPACE, store_key)
+            raise
+
+        if response.status_code >= 500 or response.is_streamed:
+            store.delete(NAMESPACE, store_key)
+        else:
+            store.set(NAMESPACE, store_key, {
+                "state": "done",
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                "content_type": response.content_type,
+                "body": response.get_data(as_text=True),
+            }, ttl=Config.IDEMPOTENCY_TTL)
+        return response
+
+    return wrapper
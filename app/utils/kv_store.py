@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class KVStore:
+    """
+    JSON key/value store on a local SQLite file, shared by every worker process on the host.
+
+    Keys live in namespaces and may carry a TTL. Each thread gets its own
+    connection; WAL mode lets readers proceed while another process writes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " expires_at REAL, PRIMARY KEY (namespace, key))"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace, key, default=None):
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return default
+        return json.loads(row[0])
+
+    def set(self, namespace, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        self._connect().execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), expires_at),
+        )
+
+    def add(self, namespace, key, value, ttl=None):
+        """Stores `value` only if the key is absent or expired. Returns True if it was stored."""
+        expires_at = time.time() + ttl if ttl else None
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM kv WHERE namespace = ? AND key = ? AND expires_at IS NOT NULL AND expires_at < ?",
+                (namespace, key, time.time()),
+            )
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), expires_at),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def delete(self, namespace, key):
+        self._connect().execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def items(self, namespace, prefix=""):
+        """Yields (key, value) pairs in `namespace` whose key starts with `prefix`, skipping expired ones."""
+        rows = self._connect().execute(
+            "SELECT key, value FROM kv WHERE namespace = ? AND key >= ? AND key < ?"
+            " AND (expires_at IS NULL OR expires_at >= ?) ORDER BY key",
+            (namespace, prefix, prefix + "￿", time.time()),
+        ).fetchall()
+        for key, value in rows:
+            yield key, json.loads(value)
+
+    def purge_expired(self):
+        self._connect().execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Returns the shared store at DATA_DIR/store.sqlite3, opening it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = KVStore(os.path.join(Config.DATA_DIR, "store.sqlite3"))
+            logger.info(f"Opened key/value store at {_store.path}")
+        return _store
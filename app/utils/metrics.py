@@ -0,0 +1,81 @@
+import threading
+from collections import defaultdict, deque
+
+# In-process metrics registry. Counters are monotonic totals; timings keep
+# a bounded window of recent samples so percentiles track current behaviour.
+_WINDOW = 1024
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_timings = {}
+
+
+class _Timing:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=_WINDOW)
+
+
+def _pick(sorted_samples, q):
+    index = min(len(sorted_samples) - 1, int(round(q / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def increment(name, value=1):
+    with _lock:
+        _counters[name] += value
+
+
+def observe(name, value):
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = _timings[name] = _Timing()
+        timing.count += 1
+        timing.total += value
+        timing.samples.append(value)
+
+
+def counter(name):
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def sample_count(name):
+    with _lock:
+        timing = _timings.get(name)
+        return timing.count if timing else 0
+
+
+def percentile(name, q, default=None):
+    """Returns the q-th percentile (0-100) of the recent samples for `name`."""
+    with _lock:
+        timing = _timings.get(name)
+        samples = sorted(timing.samples) if timing else []
+    return _pick(samples, q) if samples else default
+
+
+def snapshot():
+    with _lock:
+        counters = dict(_counters)
+        timings = {name: (t.count, t.total, sorted(t.samples)) for name, t in _timings.items()}
+    return {
+        "counters": counters,
+        "timings": {
+            name: {
+                "count": count,
+                "mean": round(total / count, 3) if count else 0.0,
+                "p50": round(_pick(samples, 50), 3) if samples else None,
+                "p95": round(_pick(samples, 95), 3) if samples else None,
+                "p99": round(_pick(samples, 99), 3) if samples else None,
+            }
+            for name, (count, total, samples) in timings.items()
+        },
+    }
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timings.clear()
@@ -0,0 +1,99 @@
+import hashlib
+import random
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text, size=5):
+    """Returns the set of hashed word `size`-grams of `text` (lower-cased, punctuation ignored)."""
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = (" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+    return {int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=4).digest(), "big") for gram in grams}
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures: for each of `num_perm` random hash functions,
+    the minimum hash over a document's shingles. The fraction of positions
+    where two signatures agree estimates the Jaccard similarity of the sets.
+    """
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text):
+        hashes = shingles(text)
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        )
+
+
+def estimate_similarity(signature_a, signature_b):
+    return sum(a == b for a, b in zip(signature_a, signature_b)) / len(signature_a)
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing index over MinHash signatures.
+
+    Signatures are cut into `bands` bands; documents sharing any whole band land
+    in the same bucket and become candidates, so a query touches only a few
+    buckets instead of every stored document. With r = num_perm / bands rows
+    per band, pairs above roughly (1 / bands) ** (1 / r) similarity are likely
+    to collide. Candidates are then ranked by their estimated similarity.
+    The oldest entries are evicted beyond `max_entries`.
+    """
+
+    def __init__(self, num_perm=64, bands=8, max_entries=100_000):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands.")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self._signatures = OrderedDict()
+        self._buckets = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def add(self, key, signature):
+        with self._lock:
+            if key in self._signatures:
+                self._signatures.move_to_end(key)
+                return
+            self._signatures[key] = signature
+            for band_key in self._band_keys(signature):
+                self._buckets[band_key].add(key)
+            while len(self._signatures) > self.max_entries:
+                old_key, old_signature = self._signatures.popitem(last=False)
+                for band_key in self._band_keys(old_signature):
+                    bucket = self._buckets[band_key]
+                    bucket.discard(old_key)
+                    if not bucket:
+                        del self._buckets[band_key]
+
+    def query(self, signature, threshold=0.0):
+        """Returns [(key, estimated similarity)] for stored documents at or above `threshold`, best first."""
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates |= self._buckets.get(band_key, set())
+            scored = [(key, estimate_similarity(signature, self._signatures[key])) for key in candidates]
+        return sorted((item for item in scored if item[1] >= threshold), key=lambda item: -item[1])
+
+    def __len__(self):
+        return len(self._signatures)
@@ -0,0 +1,88 @@
+import io
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from app.config import Config
+from app.utils import deadlines, metrics
+from app.utils.memory import current_rss_bytes
+from app.utils.resume_parser import extract_text_from_resume
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def extract_text_from_bytes(data, page_separator="\n"):
+    # Runs inside a pool worker; bytes are picklable where file objects aren't
+    return extract_text_from_resume(io.BytesIO(data), page_separator=page_separator)
+
+
+def _extract_and_measure(data, page_separator, deadline=None):
+    # Reports the worker's RSS after each document so the parent can spot creeping workers.
+    # The caller's deadline is an absolute monotonic time, which is host-wide on Linux.
+    with deadlines.scope_until(deadline):
+        return extract_text_from_bytes(data, page_separator), current_rss_bytes()
+
+
+def get_pool():
+    """Returns the shared process pool used for CPU-bound PDF parsing, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            logger.info(f"Starting PDF parser pool with {Config.PARSER_WORKERS} workers")
+            _pool = ProcessPoolExecutor(max_workers=Config.PARSER_WORKERS)
+        return _pool
+
+
+def submit(data, page_separator="\n"):
+    """
+    Extracts text from PDF bytes in the shared pool. Returns a Future for the text.
+
+    Each worker reports its resident memory after a document. Once any worker
+    is above PARSER_MAX_RSS_MB, the pool is retired: work already queued on it
+    finishes, its processes then exit, and later submissions start a fresh pool.
+    This keeps long-lived workers from creeping upward across thousands of PDFs.
+    The caller's deadline, if any, carries over so parsing stops once it passes.
+    """
+    pool = get_pool()
+    inner = pool.submit(_extract_and_measure, data, page_separator, deadlines.current())
+    outer = Future()
+
+    def finish(future):
+        if outer.cancelled():
+            return
+        try:
+            text, rss = future.result()
+        except BaseException as e:
+            outer.set_exception(e)
+            return
+        _recycle_if_over_limit(pool, rss)
+        outer.set_result(text)
+
+    inner.add_done_callback(finish)
+    outer.add_done_callback(lambda f: f.cancelled() and inner.cancel())
+    return outer
+
+
+def _recycle_if_over_limit(pool, rss):
+    limit = Config.PARSER_MAX_RSS_MB * 1024 * 1024
+    if not limit or rss <= limit:
+        return
+    global _pool
+    with _pool_lock:
+        if _pool is not pool:
+            return  # Already retired by another result
+        _pool = None
+    logger.info(f"Recycling PDF parser pool: a worker reached {rss / 1024 / 1024:.0f} MB RSS (limit {Config.PARSER_MAX_RSS_MB} MB)")
+    metrics.increment("parser_pool.recycled")
+    pool.shutdown(wait=False)
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
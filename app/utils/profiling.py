@@ -0,0 +1,152 @@
+import cProfile
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from flask import g, request
+
+from app.config import Config
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+HEADER = "X-Profile"
+
+
+class StackSampler:
+    """
+    Samples one thread's Python call stack at a fixed interval from a background thread.
+
+    Each sample is folded into a "root;caller;callee" string and counted, which
+    is the input format of flamegraph.pl, speedscope and similar tools. Unlike
+    cProfile it adds no per-call overhead to the profiled thread and its cost
+    doesn't grow with the number of function calls.
+    """
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def folded(self):
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+
+class RequestProfile:
+    """Runs cProfile and a StackSampler over the current thread until finish() is called."""
+
+    def __init__(self, name, sample_interval):
+        self.id = f"{time.strftime('%Y%m%dT%H%M%S')}-{name}-{uuid.uuid4().hex[:8]}"
+        self.started = time.perf_counter()
+        self.sampler = StackSampler(threading.get_ident(), sample_interval).start()
+        self.profiler = cProfile.Profile()
+        try:
+            self.profiler.enable()
+        except ValueError:
+            # Another profiler owns the interpreter (Python 3.12+ allows only one); sample only
+            self.profiler = None
+
+    def finish(self, directory):
+        """Stops profiling and writes <id>.prof (pstats) and <id>.folded (flamegraph stacks) to `directory`."""
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.sampler.stop()
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+
+        os.makedirs(directory, exist_ok=True)
+        if self.profiler is not None:
+            self.profiler.dump_stats(os.path.join(directory, f"{self.id}.prof"))
+        with open(os.path.join(directory, f"{self.id}.folded"), "w", encoding="utf-8") as f:
+            f.write(self.sampler.folded())
+        return elapsed_ms
+
+
+def _should_profile():
+    if request.headers.get(HEADER) == "1":
+        return True
+    return Config.PROFILE_SAMPLE_RATE > 0 and random.random() < Config.PROFILE_SAMPLE_RATE
+
+
+def start_request_profile():
+    """
+    before_request hook: profiles requests flagged with `X-Profile: 1` or picked by PROFILE_SAMPLE_RATE.
+
+    Register it after the auth check so only authenticated callers can turn
+    profiling on. Unprofiled requests pay for one header lookup.
+    """
+    if not _should_profile():
+        return None
+    g.request_profile = RequestProfile(request.endpoint or "unknown", Config.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+    return None
+
+
+def _finish():
+    profile = g.pop("request_profile", None)
+    if profile is None:
+        return None
+    try:
+        elapsed_ms = profile.finish(Config.PROFILE_DIR)
+    except Exception as e:
+        logger.error(f"Error writing request profile {profile.id}: {e}")
+        return None
+    metrics.increment(f"profiles.written.{request.endpoint}")
+    logger.info(f"Profiled {request.path} in {elapsed_ms:.1f} ms; wrote {profile.id} to {Config.PROFILE_DIR}")
+    return profile
+
+
+def finish_request_profile(response):
+    """after_request hook: writes the profile and reports its id in the X-Profile-Id header."""
+    profile = _finish()
+    if profile is not None:
+        response.headers["X-Profile-Id"] = profile.id
+    return response
+
+
+def abort_request_profile(exc=None):
+    """teardown_request hook: makes sure profiling stops when a view raised."""
+    _finish()
+
+
+def list_profiles(directory=None):
+    """Returns the ids of stored profiles, newest first."""
+    directory = directory or Config.PROFILE_DIR
+    if not os.path.isdir(directory):
+        return []
+    ids = {os.path.splitext(name)[0] for name in os.listdir(directory) if name.endswith((".prof", ".folded"))}
+    return sorted(ids, reverse=True)
+
+
+def profile_path(profile_id, kind, directory=None):
+    """Returns the path of a stored profile artifact (`kind` is "prof" or "folded"), or None."""
+    directory = directory or Config.PROFILE_DIR
+    if kind not in ("prof", "folded") or os.path.basename(profile_id) != profile_id:
+        return None
+    path = os.path.abspath(os.path.join(directory, f"{profile_id}.{kind}"))
+    return path if os.path.isfile(path) else None
@@ -1,14 +1,32 @@
 import pdfplumber
 import logging
+from app.utils import deadlines, tracing
 
 logger = logging.getLogger(__name__)
 
-def extract_text_from_resume(file):
-    # pdfplumber expects a file-like object (e.g., Werkzeug FileStorage from Flask)
+def extract_text_from_resume(file, page_separator="\n"):
+    # pdfplumber expects a file-like object (e.g., Werkzeug FileStorage from Flask).
+    # Pass page_separator="\f" to keep page boundaries (see resume_sections.PAGE_BREAK).
     try:
+        # Uploads spooled by UploadRequest already know whether they start like a PDF
+        if getattr(file, "is_pdf", None) is False:
+            raise ValueError("Uploaded file is not a PDF.")
         file.seek(0)  # Ensure we read from the start of the file
-        with pdfplumber.open(file) as pdf:
-            return "\n".join([text for page in pdf.pages if (text := page.extract_text())])
+        with tracing.span("resume.extract") as span, pdfplumber.open(file) as pdf:
+            texts = []
+            for page in pdf.pages:
+                # Stop parsing once the request this is for has given up
+                deadlines.check("parsing the next page")
+                if text := page.extract_text():
+                    texts.append(text)
+                # Drop the page's parsed layout objects now instead of when the PDF closes,
+                # so memory stays flat in the page count
+                page.close()
+            text = page_separator.join(texts)
+            span.set_attributes({"resume.page_count": len(pdf.pages), "resume.chars": len(text)})
+            return text
+    except deadlines.DeadlineExceeded:
+        raise
     except Exception as e:
         logger.error(f"Error seeking to start of resume file: {e}")
         raise ValueError("Invalid file object provided for text extraction.")
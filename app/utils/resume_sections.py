@@ -0,0 +1,149 @@
+import math
+import re
+from collections import Counter
+
+# Page boundary marker; pass it as extract_text_from_resume(file, page_separator=PAGE_BREAK)
+PAGE_BREAK = "\f"
+
+# Canonical section name -> heading variants seen on real resumes
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "about me", "objective", "career objective"],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "relevant experience", "career history",
+    ],
+    "education": ["education", "academic background", "education and training", "academics"],
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills", "core competencies", "competencies",
+        "technologies", "tools and technologies",
+    ],
+    "projects": ["projects", "personal projects", "selected projects", "side projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications", "licenses & certifications"],
+    "publications": ["publications", "selected publications", "papers"],
+    "awards": ["awards", "honors", "honors and awards", "honors & awards", "achievements"],
+}
+SECTION_ORDER = ["contact", *SECTION_HEADINGS, "other"]
+
+_HEADING_RE = re.compile(
+    "^(?:" + "|".join(
+        f"(?P<{section}>" + "|".join(re.escape(h).replace(r"\ ", r"\s+") for h in headings) + ")"
+        for section, headings in SECTION_HEADINGS.items()
+    ) + r")\s*:?$",
+    re.IGNORECASE,
+)
+_PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?\d+\s*(?:/|of)\s*\d+$|^page\s*\d+$|^-?\s*\d+\s*-?$", re.IGNORECASE)
+_BULLET_RE = re.compile(r"^[•●▪◦‣⁃∙·➢►*\-–]\s*")
+_CONTACT_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+|(?:\+?\d[\d\s().-]{7,}\d)|(?:linkedin|github)\.com/\S+", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\d+")
+_SENTENCE_END = (".", ":", ";", "!", "?")
+
+# How many lines at the top and bottom of each page are header/footer candidates
+_EDGE_LINES = 2
+
+
+def _normalize(line):
+    return _DIGITS_RE.sub("#", line.lower())
+
+
+def strip_page_furniture(pages):
+    """
+    Removes page numbers and headers/footers repeated across pages.
+
+    A line counts as a repeated header/footer when, ignoring case and digits,
+    it appears among the first or last few lines of at least half the pages;
+    only its first occurrence is kept. Returns the pages as lists of cleaned, non-empty lines.
+    """
+    page_lines = [
+        [_WHITESPACE_RE.sub(" ", line).strip() for line in page.splitlines() if line.strip()]
+        for page in pages
+    ]
+    repeated = set()
+    if len(page_lines) > 1:
+        edge_counts = Counter()
+        for lines in page_lines:
+            edges = lines[:_EDGE_LINES] + lines[-_EDGE_LINES:]
+            edge_counts.update({_normalize(line) for line in edges})
+        min_pages = max(2, math.ceil(len(page_lines) / 2))
+        repeated = {key for key, count in edge_counts.items() if count >= min_pages}
+
+    cleaned = []
+    kept = set()
+    for lines in page_lines:
+        last = len(lines) - 1
+        page = []
+        for i, line in enumerate(lines):
+            if _PAGE_NUMBER_RE.match(line):
+                continue
+            key = _normalize(line)
+            if (i < _EDGE_LINES or last - i < _EDGE_LINES) and key in repeated:
+                # Keep the first copy: on page one the "header" is usually the contact block
+                if key in kept:
+                    continue
+                kept.add(key)
+            page.append(line)
+        cleaned.append(page)
+    return cleaned
+
+
+def segment_resume(text):
+    """
+    Splits resume text into canonical sections using precompiled heading patterns.
+
+    Parameters:
+    - text (str): Extracted resume text, optionally with PAGE_BREAK between pages.
+    Returns:
+    - dict: section name -> list of lines, in SECTION_ORDER. Lines before the first
+      heading go to "contact"; unrecognised headings keep their content under "other".
+      Bullets are normalised to "- ", wrapped lines are re-joined and repeated
+      contact lines are dropped.
+    """
+    sections = {}
+    current = "contact"
+    seen_contact = set()
+    for lines in strip_page_furniture((text or "").split(PAGE_BREAK)):
+        for line in lines:
+            match = _HEADING_RE.match(line) if len(line) <= 40 else None
+            if match:
+                current = match.lastgroup
+                continue
+
+            if _CONTACT_RE.search(line):
+                key = _normalize(line)
+                if key in seen_contact:
+                    continue
+                seen_contact.add(key)
+
+            body = sections.setdefault(current, [])
+            bullet = _BULLET_RE.match(line)
+            if bullet and len(line) > bullet.end():
+                body.append("- " + line[bullet.end():])
+            elif body and not body[-1].endswith(_SENTENCE_END) and (
+                line[:1].islower()
+                or body[-1].endswith(",")
+                or (body[-1].startswith("- ") and line[:1].isdigit())
+            ):
+                # Continuation of a line the PDF wrapped
+                body[-1] = f"{body[-1]} {line}"
+            else:
+                body.append(line)
+    return {section: sections[section] for section in SECTION_ORDER if sections.get(section)}
+
+
+def render_sections(sections, include_contact=False):
+    """
+    Renders segmented sections as compact text: an upper-case label per section, then its lines.
+
+    The contact block (name, email, phone, profile links) is left out by default:
+    it doesn't bear on fit and it keeps candidate PII out of the prompt.
+    """
+    return "\n".join(
+        f"{section.upper()}:\n" + "\n".join(lines)
+        for section, lines in sections.items()
+        if include_contact or section != "contact"
+    )
+
+
+def compact_resume(text, include_contact=False):
+    """Segments raw resume text and returns its compact rendering."""
+    return render_sections(segment_resume(text), include_contact)
@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+import threading
+from collections import deque
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skills.json")
+
+
+class SkillMatcher:
+    """
+    Finds skills from a taxonomy in free text with an Aho-Corasick automaton.
+
+    The taxonomy maps a canonical skill name to its aliases, e.g.
+    {"Kubernetes": ["kubernetes", "k8s"]}. All aliases are compiled into one
+    automaton, so a text is scanned in a single linear pass no matter how many
+    skills the taxonomy holds. Matching is case-insensitive and only counts
+    whole-word hits, so "go" doesn't match inside "google".
+    """
+
+    def __init__(self, taxonomy):
+        # Trie as parallel lists: goto transitions, failure links, and per-node outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for skill, aliases in taxonomy.items():
+            for alias in aliases:
+                self._add(alias.lower(), skill)
+        self._build_failure_links()
+        self.skills = sorted(taxonomy)
+
+    def _add(self, alias, skill):
+        node = 0
+        for char in alias:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(alias), skill))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Inherit matches that end at the failure target (suffix aliases)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text):
+        """Returns the set of canonical skills mentioned in `text`."""
+        text = (text or "").lower()
+        found = set()
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for end, char in enumerate(text, start=1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, skill in out[node]:
+                if skill in found:
+                    continue
+                start = end - length
+                if _starts_word(text, start) and (end == len(text) or not text[end].isalnum()):
+                    found.add(skill)
+        return found
+
+    def match(self, job_description, resume_text):
+        """
+        Compares the skills a job description asks for with those a resume shows.
+
+        `job_description` may also be an already-extracted collection of required
+        skills (e.g. from the JD registry), which skips re-scanning the JD.
+
+        Returns:
+        - dict: "required" (skills found in the JD), "matched" and "missing"
+          (required skills present in / absent from the resume) and "extra"
+          (resume skills the JD didn't mention), each sorted.
+        """
+        required = set(job_description) if not isinstance(job_description, str) else self.find(job_description)
+        present = self.find(resume_text)
+        return {
+            "required": sorted(required),
+            "matched": sorted(required & present),
+            "missing": sorted(required - present),
+            "extra": sorted(present - required),
+        }
+
+
+def _starts_word(text, start):
+    # A dot between letters joins a word ("react.js"), so "js" there isn't a separate hit
+    if start == 0:
+        return True
+    before = text[start - 1]
+    if before == ".":
+        return start < 2 or not text[start - 2].isalnum()
+    return not before.isalnum()
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher():
+    """Returns the shared matcher compiled from Config.SKILL_TAXONOMY_PATH, building it on first use."""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            path = Config.SKILL_TAXONOMY_PATH or DEFAULT_TAXONOMY_PATH
+            with open(path, encoding="utf-8") as f:
+                taxonomy = json.load(f)
+            _matcher = SkillMatcher(taxonomy)
+            logger.info(f"Compiled skill matcher with {len(taxonomy)} skills from {path}")
+        return _matcher
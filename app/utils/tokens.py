@@ -0,0 +1,9 @@
+import math
+
+# OpenAI's rule of thumb for English text: roughly 4 characters per token.
+# Good enough for thresholds and budgets; not an exact tokenizer count.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
@@ -0,0 +1,261 @@
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, request
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# W3C Trace Context: version-traceid-parentid-flags, e.g.
+# 00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01
+_TRACEPARENT_RE = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def _new_id(length):
+    return f"{random.getrandbits(length * 4):0{length}x}"
+
+
+def parse_traceparent(header):
+    """Returns (trace_id, parent_span_id, sampled) from a W3C traceparent header, or None if it's invalid."""
+    match = _TRACEPARENT_RE.match((header or "").strip().lower())
+    if not match:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 0x01)
+
+
+class Span:
+    """
+    One timed operation in a trace, shaped after the OpenTelemetry span model.
+
+    Spans nest through a context variable: a span started while another is
+    current becomes its child and shares its trace id. Unsampled spans still
+    carry ids (so they propagate downstream) but are never exported.
+    """
+
+    def __init__(self, name, trace_id, parent_span_id=None, sampled=True, kind="internal", attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(16)
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.status = {"code": "UNSET"}
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano = None
+
+    @property
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def record_exception(self, exc):
+        self.status = {"code": "ERROR", "message": str(exc)}
+        self.attributes["exception.type"] = type(exc).__name__
+
+    def end(self):
+        if self.end_time_unix_nano is not None:
+            return
+        self.end_time_unix_nano = time.time_ns()
+        if self.sampled:
+            get_exporter().export(self)
+
+    def to_dict(self):
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_time_unix_nano,
+            "endTimeUnixNano": self.end_time_unix_nano,
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+def current_span():
+    return _current_span.get()
+
+
+def start_span(name, parent=None, kind="internal", attributes=None):
+    """Starts a span under `parent` (default: the current span), or a new trace if there is none."""
+    parent = parent or _current_span.get()
+    if parent is None:
+        return Span(name, _new_id(32), None, random.random() < Config.TRACE_SAMPLE_RATE, kind, attributes)
+    return Span(name, parent.trace_id, parent.span_id, parent.sampled, kind, attributes)
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Runs the enclosed block in a child span of the current span.
+
+    Usage:
+        with tracing.span("resume.extract") as s:
+            s.set_attribute("resume.page_count", 2)
+    """
+    if not Config.TRACING_ENABLED:
+        yield _NOOP_SPAN
+        return
+    current = start_span(name, attributes=attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def set_attributes(**attributes):
+    """Adds attributes to the current span, if any."""
+    current = _current_span.get()
+    if current is not None:
+        current.set_attributes(attributes)
+
+
+class _NoopSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+# -----------------------------------------
+# Flask hooks: one server span per request
+# -----------------------------------------
+def start_request_span():
+    """before_request hook: opens the server span, continuing the caller's trace from `traceparent`."""
+    if not Config.TRACING_ENABLED:
+        return None
+    attributes = {"http.request.method": request.method, "url.path": request.path}
+    incoming = parse_traceparent(request.headers.get("traceparent"))
+    if incoming is None:
+        server_span = start_span(f"{request.method} {request.path}", kind="server", attributes=attributes)
+    else:
+        trace_id, parent_span_id, sampled = incoming
+        server_span = Span(f"{request.method} {request.path}", trace_id, parent_span_id, sampled, "server", attributes)
+    if request.url_rule is not None:
+        server_span.name = f"{request.method} {request.url_rule.rule}"
+        server_span.set_attribute("http.route", request.url_rule.rule)
+    g.trace_span = server_span
+    g.trace_token = _current_span.set(server_span)
+    return None
+
+
+def finish_request_span(response):
+    """after_request hook: records the status code and returns the trace context to the caller."""
+    server_span = g.get("trace_span")
+    if server_span is not None:
+        server_span.set_attribute("http.response.status_code", response.status_code)
+        if response.status_code >= 500:
+            server_span.status = {"code": "ERROR"}
+        response.headers["traceparent"] = server_span.traceparent
+    return response
+
+
+def end_request_span(exc=None):
+    """teardown_request hook: ends the server span once the response (including streamed bodies) is done."""
+    server_span = g.pop("trace_span", None)
+    token = g.pop("trace_token", None)
+    if server_span is None:
+        return
+    if exc is not None:
+        server_span.record_exception(exc)
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        # Streamed responses tear down in a different context than the one that set the span
+        pass
+    server_span.end()
+
+
+# -----------------------------------------
+# Exporters
+# -----------------------------------------
+class ConsoleExporter:
+    """Logs each finished span as one JSON line."""
+
+    def export(self, span):
+        logger.info(f"span {json.dumps(span.to_dict(), default=str)}")
+
+
+class FileExporter:
+    """Appends each finished span as one JSON line to `path` (readable without a collector)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            logger.error(f"Error exporting span to {self.path}: {e}")
+
+
+class _NoopExporter:
+    def export(self, span):
+        pass
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """Returns the exporter selected by Config.TRACE_EXPORTER ("file", "console" or "none"), creating it on first use."""
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            if Config.TRACE_EXPORTER == "file":
+                _exporter = FileExporter(Config.TRACE_FILE)
+            elif Config.TRACE_EXPORTER == "console":
+                _exporter = ConsoleExporter()
+            else:
+                _exporter = _NoopExporter()
+        return _exporter
+
+
+class TraceContextFilter(logging.Filter):
+    """Adds the current trace and span ids to log records so log lines can be correlated with spans."""
+
+    def filter(self, record):
+        current = _current_span.get()
+        record.trace_id = current.trace_id if current is not None else "-"
+        record.span_id = current.span_id if current is not None else "-"
+        return True
@@ -0,0 +1,79 @@
+import hashlib
+import io
+import tempfile
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app.config import Config
+
+PDF_MAGIC = b"%PDF-"
+# The PDF spec allows junk before the header, but it must start within the first 1024 bytes
+_MAGIC_WINDOW = 1024
+
+
+class SpooledUpload(tempfile.SpooledTemporaryFile):
+    """
+    Destination for an uploaded file while the multipart body is parsed.
+
+    Stays in memory up to `spool_size` bytes and rolls over to a temp file
+    beyond that. Every chunk written is hashed and counted on the way in, so
+    the SHA-256, size and PDF magic check are available without re-reading the
+    file, and oversized files are rejected as soon as they cross `max_file_size`.
+    """
+
+    def __init__(self, spool_size, max_file_size=None):
+        super().__init__(max_size=spool_size)
+        self.max_file_size = max_file_size
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._head = b""
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_file_size and self.size > self.max_file_size:
+            raise RequestEntityTooLarge()
+        self._digest.update(data)
+        if len(self._head) < _MAGIC_WINDOW:
+            self._head += bytes(data[:_MAGIC_WINDOW - len(self._head)])
+        return super().write(data)
+
+    @property
+    def sha256(self):
+        return self._digest.hexdigest()
+
+    @property
+    def is_pdf(self):
+        return PDF_MAGIC in self._head
+
+    @property
+    def spooled_to_disk(self):
+        return self._rolled
+
+
+class UploadRequest(Request):
+    """
+    Flask request class that streams file uploads into SpooledUpload containers.
+
+    Routes that accept larger files (e.g. archives) can raise the per-file
+    limit by setting `request.max_file_size` before touching request.files.
+    """
+
+    max_file_size = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledUpload(Config.UPLOAD_SPOOL_SIZE, self.max_file_size or Config.UPLOAD_MAX_FILE_SIZE)
+
+
+
+def detach_upload(file_storage):
+    """
+    Takes ownership of an uploaded file's stream and returns it.
+
+    Flask closes request files when the request context is torn down, which
+    happens before a streamed response body is produced. Detaching swaps in
+    an empty placeholder so the real stream survives; the caller must close it.
+    """
+    stream = file_storage.stream
+    file_storage.stream = io.BytesIO()
+    return stream
@@ -0,0 +1,131 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndex:
+    """
+    Append-only store of unit vectors in a memory-mapped float32 file, with an id map.
+
+    `vectors.f32` holds one row of `dim` float32s per entry; `ids.txt` holds the
+    matching id on the same line number. Writers take an exclusive file lock,
+    append the vector, then the id, so any id a reader sees has its vector on
+    disk. Readers map the file read-only and remap when it grows: the rows live
+    in the shared page cache, not in each worker's heap.
+    """
+
+    def __init__(self, directory, dim):
+        self.directory = directory
+        self.dim = dim
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._ids_path = os.path.join(directory, "ids.txt")
+        self._lock_path = os.path.join(directory, "index.lock")
+        self._lock = threading.Lock()
+        self._ids = []
+        self._id_set = set()
+        self._ids_offset = 0
+        self._matrix = None
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"dim": dim, "dtype": "float32"}, f)
+        for path in (self._vectors_path, self._ids_path):
+            open(path, "ab").close()
+
+    def _refresh(self):
+        # Picks up rows appended by this or another process since the last call
+        with open(self._ids_path, "rb") as f:
+            f.seek(self._ids_offset)
+            new = f.read()
+        complete = new.rfind(b"\n") + 1
+        if complete:
+            for line in new[:complete].decode().splitlines():
+                self._ids.append(line)
+                self._id_set.add(line)
+            self._ids_offset += complete
+        count = min(len(self._ids), os.path.getsize(self._vectors_path) // (self.dim * 4))
+        if count == 0:
+            self._matrix = None
+        elif self._matrix is None or self._matrix.shape[0] != count:
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+        return count
+
+    def __len__(self):
+        with self._lock:
+            return self._refresh()
+
+    def __contains__(self, item_id):
+        with self._lock:
+            self._refresh()
+            return item_id in self._id_set
+
+    def add(self, ids, vectors):
+        """
+        Appends vectors for ids that aren't in the index yet. Returns the number added.
+
+        Vectors are L2-normalized before they are stored, so search is a dot product.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        with self._lock, open(self._lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._refresh()
+            fresh, seen = [], set(self._id_set)
+            for i, item_id in enumerate(ids):
+                if item_id not in seen:
+                    seen.add(item_id)
+                    fresh.append(i)
+            if not fresh:
+                return 0
+            # A crashed writer may have left a vector without its id; overwrite it
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(len(self._ids) * self.dim * 4)
+                f.seek(0, os.SEEK_END)
+                f.write(vectors[fresh].tobytes())
+            with open(self._ids_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{ids[i]}\n" for i in fresh))
+            self._refresh()
+            return len(fresh)
+
+    def search(self, queries, k, batch_size=65536):
+        """
+        Returns the top-k (id, cosine similarity) pairs for each query vector, best first.
+
+        Rows are scored in blocks of `batch_size` against all queries at once, so
+        memory stays bounded however large the index is.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+        with self._lock:
+            count = self._refresh()
+            matrix, ids = self._matrix, self._ids
+        if count == 0 or k <= 0:
+            return [[] for _ in queries]
+
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, count, batch_size):
+            scores = queries @ np.asarray(matrix[start:start + batch_size]).T
+            rows = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                rows = np.take_along_axis(rows, keep, axis=1)
+            best_scores, best_rows = scores, rows
+
+        order = np.argsort(-best_scores, axis=1)
+        results = []
+        for query_scores, query_rows, query_order in zip(best_scores, best_rows, order):
+            results.append([(ids[query_rows[i]], float(query_scores[i])) for i in query_order])
+        return results
@@ -0,0 +1,83 @@
+"""
+Benchmarks PDF text extraction memory: peak RSS per document size.
+
+Each measurement runs in a fresh process, so peak RSS reflects one document
+only. "retained" keeps every page's parsed layout until the PDF is closed (the
+previous behaviour); "released" is extract_text_from_resume, which closes each
+page as soon as its text is taken.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_parser_memory.py [pages ...]
+
+Defaults to synthetic text-heavy PDFs of 1, 10, 50 and 200 pages.
+"""
+import io
+import multiprocessing
+import sys
+
+DEFAULT_PAGES = [1, 10, 50, 200]
+LINES_PER_PAGE = 50
+
+
+def build_pdf(pages):
+    """Writes a minimal PDF with `pages` pages of Helvetica text (no external dependencies)."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for number in range(pages):
+        lines = "".join(
+            f"(Page {number + 1} line {line}: Python, Flask, Kubernetes, PostgreSQL and AWS experience.) Tj T* "
+            for line in range(LINES_PER_PAGE)
+        )
+        stream = f"BT /F1 10 Tf 12 TL 40 780 Td {lines}ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R /Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode())
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    out.write("".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def _measure(mode, data, queue):
+    import pdfplumber
+
+    from app.utils.memory import current_rss_bytes, peak_rss_bytes
+    from app.utils.resume_parser import extract_text_from_resume
+
+    baseline = current_rss_bytes()
+    if mode == "retained":
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            text = "\n".join(text for page in pdf.pages if (text := page.extract_text()))
+    else:
+        text = extract_text_from_resume(io.BytesIO(data))
+    queue.put((peak_rss_bytes() - baseline, len(text)))
+
+
+def measure(mode, data):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(mode, data, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+if __name__ == "__main__":
+    for pages in [int(arg) for arg in sys.argv[1:]] or DEFAULT_PAGES:
+        data = build_pdf(pages)
+        retained, chars = measure("retained", data)
+        released, _ = measure("released", data)
+        print(
+            f"pages={pages:>4} size={len(data) / 1024:>7.1f} KB chars={chars:>8} | "
+            f"peak RSS growth: retained {retained / 1024 / 1024:6.1f} MB, released {released / 1024 / 1024:6.1f} MB"
+        )
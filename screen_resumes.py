@@ -0,0 +1,81 @@
+"""
+Screens a directory (or glob) of resume PDFs against a job description, without the HTTP API.
+
+PDFs are parsed in a process pool and screened with bounded concurrency.
+Results are appended to a JSON lines file as each file finishes; re-running
+the same command skips files already screened against the same JD, so an
+interrupted run resumes where it stopped. Each record has per-file timings
+(extract_ms, screen_ms, total_ms).
+
+Usage:
+    python screen_resumes.py --jd jd.txt resumes/ "more/**/*.pdf" --output results.jsonl [--csv results.csv]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+from app.config import Config
+from app.services import bulk_screening
+from app.utils import parser_pool
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-screen resume PDFs against a job description.")
+    parser.add_argument("--jd", required=True, help="Text file with the job description.")
+    parser.add_argument("resumes", nargs="+", help="Directories (searched recursively) or glob patterns of PDFs.")
+    parser.add_argument("--output", required=True, help="Results file (JSON lines); also the checkpoint for resuming.")
+    parser.add_argument("--csv", help="Also write the results as CSV to this path when the run finishes.")
+    parser.add_argument("--concurrency", type=int, default=Config.INGEST_SCREEN_CONCURRENCY, help="Concurrent screening calls.")
+    parser.add_argument("--workers", type=int, default=Config.PARSER_WORKERS, help="PDF parser processes.")
+    parser.add_argument("--restart", action="store_true", help="Ignore earlier results and screen every file again.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    with open(args.jd, encoding="utf-8") as f:
+        job_description = f.read().strip()
+    if not job_description:
+        print(f"Job description file {args.jd} is empty.", file=sys.stderr)
+        return 2
+    paths = bulk_screening.find_resumes(args.resumes)
+    if not paths:
+        print("No PDF files found.", file=sys.stderr)
+        return 2
+
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+    done = bulk_screening.load_checkpoint(args.output, bulk_screening.jd_fingerprint(job_description))
+    Config.PARSER_WORKERS = args.workers
+    print(f"Screening {len(paths)} files ({len(done)} already done) with {args.workers} parser processes "
+          f"and {args.concurrency} concurrent screenings", file=sys.stderr)
+
+    summary = None
+    try:
+        with open(args.output, "a", encoding="utf-8") as out:
+            for record in bulk_screening.screen_files(paths, job_description, args.concurrency, done):
+                if record["status"] == "summary":
+                    summary = record
+                    continue
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                print(f"{record['status']:>9} {record['total_ms']:>9.1f} ms  {record['file']}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("Interrupted; re-run the same command to resume.", file=sys.stderr)
+        return 130
+    finally:
+        parser_pool.shutdown()
+
+    if args.csv:
+        rows = bulk_screening.write_csv(args.output, args.csv)
+        print(f"Wrote {rows} rows to {args.csv}", file=sys.stderr)
+    print(json.dumps(summary), file=sys.stderr)
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import pytest
+
+from app.config import Config
+from app.utils import kv_store
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    # Keep the shared key/value store out of the working tree and fresh per test
+    monkeypatch.setattr(kv_store, "_store", kv_store.KVStore(str(tmp_path / "store.sqlite3")))
+    yield kv_store._store
+
+
+@pytest.fixture(autouse=True)
+def local_candidate_index(tmp_path, monkeypatch):
+    # Screenings index candidates; keep that offline (deterministic local embeddings) and per test
+    from app.services import candidate_search, embeddings
+    monkeypatch.setattr(Config, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "EMBEDDING_PROVIDER", "hashing")
+    monkeypatch.setattr(embeddings, "_provider", None)
+    monkeypatch.setattr(candidate_search, "_index", None)
+
+
+@pytest.fixture(autouse=True)
+def no_background_prefill(monkeypatch):
+    # Registering JDs would otherwise queue real LLM calls for the question bank
+    monkeypatch.setattr(Config, "QUESTION_BANK_PREFILL", False)
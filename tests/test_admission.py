@@ -0,0 +1,100 @@
+import base64
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+from app.utils import admission, metrics
+from app.utils.admission import AdmissionLimiter, Overloaded
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+FEEDBACK = {"candidate_name": "Jane", "job_title": "Designer", "outcome": "rejected"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters(monkeypatch):
+    monkeypatch.setattr(admission, "_limiters", {})
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"):
+        yield app
+
+def test_limiter_queues_then_sheds_when_queue_is_full():
+    limiter = AdmissionLimiter("test", max_in_flight=1, max_queue=1, max_wait=5)
+    assert limiter.acquire() == 0.0
+    waited = []
+    waiter = threading.Thread(target=lambda: waited.append(limiter.acquire()))
+    waiter.start()
+    while not limiter.snapshot()["queued"]:
+        time.sleep(0.001)
+
+    with pytest.raises(Overloaded) as shed:
+        limiter.acquire()
+    assert shed.value.reason == "queue_full"
+    assert shed.value.retry_after >= 1
+
+    time.sleep(0.02)
+    limiter.release(0.05)
+    waiter.join(1)
+    assert waited and waited[0] >= 0.02
+    assert limiter.snapshot()["in_flight"] == 1
+
+def test_limiter_times_out_queued_requests():
+    limiter = AdmissionLimiter("test", max_in_flight=1, max_queue=5, max_wait=0.05)
+    limiter.acquire()
+    with pytest.raises(Overloaded) as shed:
+        limiter.acquire()
+    assert shed.value.reason == "timeout"
+    assert limiter.snapshot()["queued"] == 0
+
+def test_limiter_sheds_early_when_expected_wait_is_too_long():
+    limiter = AdmissionLimiter("test", max_in_flight=2, max_queue=10, max_wait=1)
+    limiter.acquire()
+    limiter.acquire()
+    limiter.release(10.0)
+    limiter.acquire()
+    with pytest.raises(Overloaded) as shed:
+        limiter.acquire()
+    # One queued request ahead of two slots that each take ~10s
+    assert shed.value.reason == "expected_wait"
+    assert shed.value.retry_after == 5
+
+def test_route_sheds_excess_load_with_retry_after(app):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_feedback(*args):
+        started.set()
+        release.wait(5)
+        return "Dear Jane"
+
+    shed_before = metrics.counter("admission.shed.generate_feedback_email")
+    responses = []
+    with patch("app.utils.admission.Config.ADMISSION_LIMITS", {"generate_feedback_email": "1:0"}), \
+         patch("app.routes.ai_routes.openai_service.generate_feedback_email", side_effect=slow_feedback):
+        first = threading.Thread(target=lambda: responses.append(app.test_client().post("/generate-feedback", json=FEEDBACK, headers=AUTH)))
+        first.start()
+        assert started.wait(5)
+
+        shed = app.test_client().post("/generate-feedback", json=FEEDBACK, headers=AUTH)
+        # Cheap routes are unaffected
+        assert app.test_client().get("/health").status_code == 200
+        release.set()
+        first.join(5)
+
+        assert app.test_client().post("/generate-feedback", json=FEEDBACK, headers=AUTH).status_code == 200
+
+    assert shed.status_code == 503
+    assert int(shed.headers["Retry-After"]) >= 1
+    assert responses[0].status_code == 200
+    assert metrics.counter("admission.shed.generate_feedback_email") == shed_before + 1
+
+    snapshot = app.test_client().get("/metrics", headers=AUTH).get_json()
+    assert snapshot["admission"]["generate_feedback_email"]["in_flight"] == 0
+    assert snapshot["timings"]["admission.queue_ms.generate_feedback_email"]["count"] >= 2
@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import answer_evaluation, openai_service
+
+QUESTIONS = "1. What is your experience with React?\n2. Can you work weekends?\n3. How many years of Python?"
+ANSWERS = "1. Two years building\n   dashboards.\n2. Yes\n3. 5 years"
+
+
+def fake_completion(content):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    response.usage = None
+    return response
+
+def score_by_answer(**kwargs):
+    prompt = kwargs["messages"][0]["content"]
+    answer = prompt.split("Answer:\n", 1)[1].split("\n\n", 1)[0]
+    return fake_completion(f"Score: {min(10, len(answer))}/10\nScored '{answer}'.")
+
+def test_split_pairs_handles_numbered_lists_lines_and_lists():
+    assert answer_evaluation.split_pairs(QUESTIONS, ANSWERS) == [
+        ("What is your experience with React?", "Two years building\ndashboards."),
+        ("Can you work weekends?", "Yes"),
+        ("How many years of Python?", "5 years"),
+    ]
+    assert answer_evaluation.split_pairs("Q1: Why?\nQ2: How?", "A1: Because\nA2) Carefully") == [
+        ("Why?", "Because"), ("How?", "Carefully"),
+    ]
+    assert answer_evaluation.split_pairs("Why?\nHow?", "Because\nCarefully") == [("Why?", "Because"), ("How?", "Carefully")]
+    assert answer_evaluation.split_pairs(["Why?"], ["Because"]) == [("Why?", "Because")]
+    assert answer_evaluation.split_pairs("1. Why?\n2. How?", "It depends on the context and the team.") is None
+    assert answer_evaluation.split_pairs(["Why?", "How?"], ["Because"]) is None
+
+def test_cache_key_ignores_answer_formatting():
+    key = answer_evaluation.cache_key("evaluate_answer@v1", "model", "Can you work weekends?", "Yes")
+    assert key == answer_evaluation.cache_key("evaluate_answer@v1", "model", "Can you work  weekends?", " yes. ")
+    assert key != answer_evaluation.cache_key("evaluate_answer@v2", "model", "Can you work weekends?", "Yes")
+    assert key != answer_evaluation.cache_key("evaluate_answer@v1", "model", "Can you work weekends?", "No")
+
+def test_pairs_are_scored_individually_and_aggregated():
+    with patch("app.services.openai_service.client.chat.completions.create", side_effect=score_by_answer) as mock_openai:
+        evaluation = openai_service.evaluate_candidate_answers(QUESTIONS, ANSWERS)
+    assert mock_openai.call_count == 3
+    assert evaluation.template_id == "evaluate_answer@v1"
+    assert [item["score"] for item in evaluation.scores] == [10, 3, 7]
+    assert evaluation.startswith("1. What is your experience with React?\nScore: 10/10")
+    assert evaluation.endswith("Overall score: 6.7/10")
+
+def test_only_changed_or_unseen_answers_hit_the_llm():
+    with patch("app.services.openai_service.client.chat.completions.create", side_effect=score_by_answer) as mock_openai:
+        openai_service.evaluate_candidate_answers(QUESTIONS, ANSWERS)
+        # Another candidate edits one answer and gives a differently formatted copy of another
+        edited = openai_service.evaluate_candidate_answers(QUESTIONS, "1. Two years building\n dashboards.\n2. yes!\n3. 7 years")
+        assert mock_openai.call_count == 4
+        assert [item["cached"] for item in edited.scores] == [True, True, False]
+        assert edited.cached is False
+
+        again = openai_service.evaluate_candidate_answers(QUESTIONS, ANSWERS)
+        assert mock_openai.call_count == 4
+        assert again.cached is True
+
+def test_unsplittable_input_falls_back_to_single_call():
+    with patch("app.services.openai_service.client.chat.completions.create", return_value=fake_completion("Score: 6/10")) as mock_openai:
+        evaluation = openai_service.evaluate_candidate_answers("1. Why?\n2. How?", "It depends on the team.")
+    assert mock_openai.call_count == 1
+    assert evaluation.template_id == "evaluate_answers@v1"
+    assert evaluation.scores is None
+
+def test_failed_pair_is_not_cached():
+    with patch("app.services.openai_service.client.chat.completions.create", side_effect=Exception("API Error")):
+        with pytest.raises(RuntimeError):
+            openai_service.evaluate_candidate_answers(["Why?"], ["Because"])
+    with patch("app.services.openai_service.client.chat.completions.create", side_effect=score_by_answer) as mock_openai:
+        openai_service.evaluate_candidate_answers(["Why?"], ["Because"])
+    assert mock_openai.call_count == 1
@@ -0,0 +1,89 @@
+import csv
+import json
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+import screen_resumes
+from app.services import bulk_screening
+from app.utils import parser_pool
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "test_documents", "Ahnaf_Khan_Resume.pdf")
+SAMPLE_RESUME = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app", "data", "sample_resume.pdf")
+
+
+@pytest.fixture(autouse=True)
+def small_parser_pool():
+    with patch("app.utils.parser_pool.Config.PARSER_WORKERS", 1):
+        yield
+        parser_pool.shutdown()
+
+
+@pytest.fixture
+def resume_dir(tmp_path):
+    folder = tmp_path / "resumes"
+    (folder / "nested").mkdir(parents=True)
+    shutil.copy(SAMPLE_PDF, folder / "a.pdf")
+    shutil.copy(SAMPLE_PDF, folder / "nested" / "a-copy.PDF")
+    shutil.copy(SAMPLE_RESUME, folder / "b.pdf")
+    (folder / "notes.txt").write_text("not a resume")
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Backend engineer with Python, Flask and AWS.\n")
+    return folder, jd
+
+
+def read_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_find_resumes_accepts_directories_and_globs(resume_dir):
+    folder, _ = resume_dir
+    assert [os.path.basename(p) for p in bulk_screening.find_resumes([str(folder)])] == ["a.pdf", "b.pdf", "a-copy.PDF"]
+    assert bulk_screening.find_resumes([str(folder / "*.pdf")]) == [str(folder / "a.pdf"), str(folder / "b.pdf")]
+
+def test_cli_screens_files_writes_jsonl_and_csv_and_resumes(resume_dir, tmp_path):
+    folder, jd = resume_dir
+    output, csv_path = tmp_path / "results.jsonl", tmp_path / "results.csv"
+    argv = ["--jd", str(jd), str(folder), "--output", str(output), "--csv", str(csv_path), "--workers", "1"]
+
+    with patch("app.services.openai_service.screen_resume", return_value="Fit score: 75\nStrengths: ...") as mock_screen:
+        assert screen_resumes.main(argv) == 0
+    assert mock_screen.call_count == 2
+
+    records = {os.path.basename(r["file"]): r for r in read_results(output)}
+    assert records["a.pdf"]["status"] == "ok"
+    assert records["a-copy.PDF"]["status"] == "duplicate"
+    assert records["a-copy.PDF"]["duplicate_of"] == records["a.pdf"]["file"]
+    assert records["b.pdf"]["fit_score"] == 75
+    assert records["b.pdf"]["extract_ms"] >= 0 and records["b.pdf"]["screen_ms"] >= 0
+    assert "Python" in records["b.pdf"]["skill_match"]["matched"]
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3 and rows[0].keys() == set(bulk_screening.CSV_FIELDS)
+
+    # An interrupted write leaves a partial line; a re-run drops it and skips finished files
+    with open(output, "a") as f:
+        f.write('{"file": "trunc')
+    with patch("app.services.openai_service.screen_resume", return_value="Fit score: 75") as mock_screen:
+        assert screen_resumes.main(argv) == 0
+    assert mock_screen.call_count == 0
+    assert len(read_results(output)) == 3
+
+def test_changed_jd_or_failed_screening_is_redone(resume_dir, tmp_path):
+    folder, jd = resume_dir
+    output = tmp_path / "results.jsonl"
+    argv = ["--jd", str(jd), str(folder / "b.pdf"), "--output", str(output), "--workers", "1"]
+
+    with patch("app.services.openai_service.screen_resume", side_effect=RuntimeError("Failed to screen resume")):
+        assert screen_resumes.main(argv) == 1
+    assert read_results(output)[0]["status"] == "error"
+    assert read_results(output)[0]["stage"] == "screen"
+
+    with patch("app.services.openai_service.screen_resume", return_value="Fit score: 60") as mock_screen:
+        screen_resumes.main(argv)
+        jd.write_text("Data engineer with Spark.")
+        screen_resumes.main(argv)
+    assert mock_screen.call_count == 2
+    assert [r["status"] for r in read_results(output)] == ["error", "ok", "ok"]
@@ -1,4 +1,6 @@
+import base64
 import pytest
+from unittest.mock import patch
 from app import create_app
 
 @pytest.fixture
@@ -27,3 +29,17 @@ def test_health_check(client):
     response = client.get("/health")
     assert response.status_code == 200
     assert response.get_json() == {"status": "ok"}
+
+
+def test_oversized_request_is_rejected(client):
+    client.application.config["MAX_CONTENT_LENGTH"] = 16
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"):
+        response = client.post(
+            "/screen-resume",
+            data=b"x" * 64,
+            content_type="multipart/form-data; boundary=xyz",
+            headers={"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()},
+        )
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "Request body too large"}
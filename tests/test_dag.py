@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from app.utils.dag import Task, run_dag
+
+
+def test_independent_tasks_run_concurrently_and_dependents_wait():
+    both_started = threading.Barrier(2, timeout=2)
+
+    def independent(_):
+        both_started.wait()
+        return 1
+
+    events = list(run_dag([
+        Task("a", independent),
+        Task("b", independent),
+        Task("sum", lambda inputs: inputs["a"] + inputs["b"], ("a", "b"), info={"stage": "total"}),
+    ], max_workers=4))
+
+    assert [event["task"] for event in events][-1] == "sum"
+    total = events[-1]
+    assert total["status"] == "ok" and total["result"] == 2 and total["stage"] == "total"
+    assert total["started_ms"] >= max(event["started_ms"] for event in events[:2])
+
+def test_failures_skip_dependents_only():
+    def fail(_):
+        raise RuntimeError("boom")
+
+    events = {event["task"]: event for event in run_dag([
+        Task("bad", fail),
+        Task("after_bad", lambda _: "never", ("bad",)),
+        Task("after_after", lambda _: "never", ("after_bad",)),
+        Task("good", lambda _: "fine"),
+    ], max_workers=2)}
+
+    assert events["bad"]["status"] == "error"
+    assert events["bad"]["error"] == "boom"
+    assert events["bad"]["elapsed_ms"] is not None
+    assert events["after_bad"]["status"] == events["after_after"]["status"] == "skipped"
+    assert events["good"]["status"] == "ok"
+
+def test_results_stream_in_completion_order():
+    events = run_dag([
+        Task("slow", lambda _: time.sleep(0.2) or "slow"),
+        Task("fast", lambda _: "fast"),
+    ], max_workers=2)
+    assert next(events)["task"] == "fast"
+    events.close()
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError):
+        run_dag([Task("a", lambda _: 1, ("missing",))], max_workers=1)
+    with pytest.raises(ValueError):
+        run_dag([Task("a", lambda _: 1, ("b",)), Task("b", lambda _: 1, ("a",))], max_workers=1)
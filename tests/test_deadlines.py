@@ -0,0 +1,96 @@
+import base64
+import io
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import create_app
+from app.services import openai_service
+from app.utils import deadlines, metrics, parser_pool
+from app.utils.deadlines import DeadlineExceeded
+from app.utils.resume_parser import extract_text_from_resume
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+FEEDBACK = {"candidate_name": "Jane", "job_title": "Designer", "outcome": "rejected"}
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "test_documents", "Ahnaf_Khan_Resume.pdf")
+
+
+def fake_completion(content):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    response.usage = None
+    return response
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         app.test_client() as client:
+        yield client
+
+def expired():
+    return deadlines.scope_until(time.monotonic() - 1)
+
+def test_client_timeout_header_reaches_the_upstream_call(client):
+    with patch("app.services.openai_service.client.chat.completions.create", return_value=fake_completion("Dear Jane")) as mock_openai:
+        response = client.post("/generate-feedback", json=FEEDBACK, headers={**AUTH, "X-Request-Timeout": "12.5"})
+    assert response.status_code == 200
+    assert 0 < mock_openai.call_args.kwargs["timeout"] <= 12.5
+
+def test_route_default_budget_applies_without_header(client):
+    with patch("app.utils.deadlines.Config.ROUTE_TIMEOUTS", {"generate_feedback_email": "7"}), \
+         patch("app.services.openai_service.client.chat.completions.create", return_value=fake_completion("Dear Jane")) as mock_openai:
+        client.post("/generate-feedback", json=FEEDBACK, headers=AUTH)
+    assert 6 < mock_openai.call_args.kwargs["timeout"] <= 7
+
+def test_late_request_returns_504(client):
+    def slow(*args):
+        time.sleep(0.1)
+        raise RuntimeError("Failed to generate feedback email")
+
+    before = metrics.counter("deadline.exceeded.generate_feedback_email")
+    with patch("app.routes.ai_routes.openai_service.generate_feedback_email", side_effect=slow):
+        response = client.post("/generate-feedback", json=FEEDBACK, headers={**AUTH, "X-Request-Timeout": "0.05"})
+    assert response.status_code == 504
+    assert response.get_json()["error"] == "Request deadline exceeded"
+    assert metrics.counter("deadline.exceeded.generate_feedback_email") == before + 1
+
+def test_errors_before_the_deadline_are_not_reported_as_timeouts(client):
+    with patch("app.routes.ai_routes.openai_service.generate_feedback_email", side_effect=RuntimeError("boom")):
+        response = client.post("/generate-feedback", json=FEEDBACK, headers={**AUTH, "X-Request-Timeout": "30"})
+    assert response.status_code == 500
+
+@pytest.mark.parametrize("value", ["soon", "0", "-3", "nan"])
+def test_invalid_timeout_header_is_rejected(client, value):
+    response = client.post("/generate-feedback", json=FEEDBACK, headers={**AUTH, "X-Request-Timeout": value})
+    assert response.status_code == 400
+
+def test_no_upstream_call_once_the_deadline_has_passed():
+    with expired(), patch("app.services.openai_service.client.chat.completions.create") as mock_openai:
+        with pytest.raises(RuntimeError):
+            openai_service.generate_feedback_email("Jane", "Designer", "rejected")
+    mock_openai.assert_not_called()
+
+def test_deadline_is_carried_into_executor_threads():
+    with deadlines.scope_until(time.monotonic() + 20), \
+         patch("app.services.openai_service.client.chat.completions.create", return_value=fake_completion("Score: 7/10")) as mock_openai:
+        openai_service.evaluate_candidate_answers("1. Why?\n2. How?", "1. Because\n2. Carefully")
+    assert mock_openai.call_count == 2
+    assert all(0 < call.kwargs["timeout"] <= 20 for call in mock_openai.call_args_list)
+
+def test_pdf_extraction_stops_at_the_deadline():
+    with open(SAMPLE_PDF, "rb") as f:
+        data = f.read()
+    with expired():
+        with pytest.raises(DeadlineExceeded):
+            extract_text_from_resume(io.BytesIO(data))
+        with patch("app.utils.parser_pool.Config.PARSER_WORKERS", 1):
+            try:
+                with pytest.raises(DeadlineExceeded):
+                    parser_pool.submit(data).result()
+            finally:
+                parser_pool.shutdown()
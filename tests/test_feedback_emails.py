@@ -0,0 +1,94 @@
+import base64
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import create_app
+from app.services import email_templates, openai_service
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+TEMPLATE = "Dear [CANDIDATE_NAME],\n\nThank you for applying. We will not be moving forward, [CANDIDATE_NAME]."
+
+
+def fake_completion(content):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    response.usage = None
+    return response
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         app.test_client() as client:
+        yield client
+
+def test_email_template_renders_every_placeholder():
+    template = email_templates.EmailTemplate(TEMPLATE, "feedback_email_template@v1")
+    assert template.render("Jane") == "Dear Jane,\n\nThank you for applying. We will not be moving forward, Jane."
+    with pytest.raises(ValueError):
+        email_templates.EmailTemplate("Dear candidate,", "feedback_email_template@v1")
+
+def test_bulk_emails_use_one_cached_llm_template():
+    with patch("app.services.openai_service.client.chat.completions.create", return_value=fake_completion(TEMPLATE)) as mock_openai:
+        emails, template_ids = openai_service.generate_feedback_emails(["Jane", " Ahmed "], "Designer", "rejected")
+        again, _ = openai_service.generate_feedback_emails(["Li"], "designer ", "rejected")
+        openai_service.generate_feedback_emails(["Li"], "Designer", "accepted")
+
+    assert mock_openai.call_count == 2
+    assert [email["candidate_name"] for email in emails] == ["Jane", "Ahmed"]
+    assert emails[1]["email"].startswith("Dear Ahmed,")
+    assert again[0]["email"].startswith("Dear Li,")
+    assert template_ids == ["feedback_email_template@v1"]
+    prompt = mock_openai.call_args_list[0][1]["messages"][0]["content"]
+    assert "[CANDIDATE_NAME]" in prompt and "Designer" in prompt
+
+def test_variants_are_assigned_stably():
+    responses = [fake_completion(f"Variant {n}: Dear [CANDIDATE_NAME].") for n in range(3)]
+    names = [f"Candidate {n}" for n in range(30)]
+    with patch("app.services.openai_service.client.chat.completions.create", side_effect=responses) as mock_openai:
+        emails, _ = openai_service.generate_feedback_emails(names, "Designer", "rejected", variants=3)
+        again, _ = openai_service.generate_feedback_emails(names, "Designer", "rejected", variants=3)
+    assert mock_openai.call_count == 3
+    assert {email["variant"] for email in emails} == {0, 1, 2}
+    assert emails == again
+    assert all(email["email"].startswith(f"Variant {email['variant']}") for email in emails)
+
+def test_template_without_placeholder_is_rejected_and_not_cached():
+    with patch("app.services.openai_service.client.chat.completions.create", return_value=fake_completion("Dear candidate,")):
+        with pytest.raises(RuntimeError):
+            openai_service.generate_feedback_emails(["Jane"], "Designer", "rejected")
+    with patch("app.services.openai_service.client.chat.completions.create", return_value=fake_completion(TEMPLATE)) as mock_openai:
+        openai_service.generate_feedback_emails(["Jane"], "Designer", "rejected")
+    assert mock_openai.call_count == 1
+
+def test_rendering_thousands_of_emails_is_fast():
+    names = [f"Candidate {n}" for n in range(5000)]
+    with patch("app.services.openai_service.client.chat.completions.create", return_value=fake_completion(TEMPLATE)):
+        openai_service.generate_feedback_emails(["Warm up"], "Designer", "rejected")
+        started = time.perf_counter()
+        emails, _ = openai_service.generate_feedback_emails(names, "Designer", "rejected")
+    assert len(emails) == 5000
+    assert time.perf_counter() - started < 1.0
+
+def test_bulk_feedback_route(client):
+    emails = [{"candidate_name": "Jane", "email": "Dear Jane", "variant": 0}]
+    with patch("app.services.openai_service.generate_feedback_emails", return_value=(emails, ["feedback_email_template@v1"])) as mock_bulk:
+        response = client.post("/generate-feedback/bulk", json={
+            "candidate_names": ["Jane"], "job_title": "Designer", "outcome": "rejected", "tone": "friendly",
+        }, headers=AUTH)
+    assert response.status_code == 200
+    assert response.get_json() == {"emails": emails, "count": 1, "template_id": "feedback_email_template@v1"}
+    mock_bulk.assert_called_once_with(["Jane"], "Designer", "rejected", "friendly", 1)
+
+    bad = client.post("/generate-feedback/bulk", json={
+        "candidate_names": "Jane", "job_title": "Designer", "outcome": "rejected",
+    }, headers=AUTH)
+    assert bad.status_code == 400
+    bad = client.post("/generate-feedback/bulk", json={
+        "candidate_names": ["Jane"], "job_title": "Designer", "outcome": "rejected", "variants": 99,
+    }, headers=AUTH)
+    assert bad.status_code == 400
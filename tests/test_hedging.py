@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from app.utils import metrics
+from app.utils.hedging import Hedger
+
+
+def slow_then_fast():
+    # The primary stalls until cancelled; the hedge answers immediately
+    calls = []
+
+    def call(attempt):
+        calls.append(attempt)
+        if attempt.label == "primary":
+            attempt.cancelled.wait(2)
+            return "primary" if not attempt.cancelled.is_set() else None
+        return "hedge"
+    return call, calls
+
+def test_hedge_wins_and_cancels_slow_primary():
+    metrics.reset()
+    hedger = Hedger(max_rate=1.0, max_workers=4)
+    call, calls = slow_then_fast()
+    assert hedger.run(call, delay=0.01, name="unit") == "hedge"
+    assert [attempt.label for attempt in calls] == ["primary", "hedge"]
+    assert calls[0].cancelled.is_set()
+    assert metrics.counter("hedge.unit.fired") == 1
+    assert metrics.counter("hedge.unit.hedge_wins") == 1
+
+def test_no_hedge_without_delay_or_after_first_output():
+    hedger = Hedger(max_rate=1.0, max_workers=4)
+
+    def streaming(attempt):
+        attempt.first_output.set()
+        time.sleep(0.05)
+        return "streamed"
+
+    assert hedger.run(streaming, delay=0.01) == "streamed"
+    assert hedger.run(lambda attempt: "direct", delay=None) == "direct"
+
+def test_hedge_rate_is_capped():
+    metrics.reset()
+    hedger = Hedger(max_rate=0.5, max_workers=4)
+
+    def slow(attempt):
+        time.sleep(0.03)
+        return attempt.label
+
+    results = [hedger.run(slow, delay=0.001, name="capped") for _ in range(6)]
+    assert metrics.counter("hedge.capped.fired") <= 3
+    assert results.count("primary") >= 3
+
+def test_hedge_falls_back_to_other_attempt_on_error():
+    hedger = Hedger(max_rate=1.0, max_workers=4)
+
+    def flaky(attempt):
+        if attempt.label == "hedge":
+            raise RuntimeError("boom")
+        time.sleep(0.05)
+        return "primary"
+
+    assert hedger.run(flaky, delay=0.01) == "primary"
+
+    def broken(attempt):
+        time.sleep(0.02)
+        raise RuntimeError("both failed")
+
+    with pytest.raises(RuntimeError):
+        hedger.run(broken, delay=0.005)
@@ -0,0 +1,55 @@
+import base64
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+LONG_JD = "Senior Backend Engineer. " + "We need Python, Flask and Kubernetes experience. " * 60
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         app.test_client() as client:
+        yield client
+
+def _register(client, headers=None):
+    return client.post("/jds", json={"job_description": LONG_JD}, headers={**AUTH, **(headers or {})})
+
+def test_large_json_is_gzipped_when_accepted(client):
+    plain = client.get("/jds/" + _register(client).get_json()["id"], headers=AUTH)
+    assert "Content-Encoding" not in plain.headers
+
+    response = client.get(plain.request.path, headers={**AUTH, "Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.data)) == plain.get_json()
+    assert response.headers["ETag"] != plain.headers["ETag"]
+
+def test_matching_if_none_match_returns_304(client):
+    first = client.get("/jds/" + _register(client).get_json()["id"], headers=AUTH)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    second = client.get(first.request.path, headers={**AUTH, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+
+    stale = client.get(first.request.path, headers={**AUTH, "If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+def test_small_and_error_responses_pass_through(client):
+    health = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in health.headers
+    assert health.get_json() == {"status": "ok"}
+
+    missing = client.get("/jds/jd_missing", headers={**AUTH, "Accept-Encoding": "gzip"})
+    assert missing.status_code == 404
+    assert "ETag" not in missing.headers
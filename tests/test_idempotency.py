@@ -0,0 +1,93 @@
+import base64
+import io
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+JD_BODY = {"title": "Backend Engineer", "skills": ["Python"]}
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"):
+        yield app
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+def _headers(key):
+    return {**AUTH, "Idempotency-Key": key}
+
+@patch("app.services.openai_service.generate_job_description", return_value="A job description")
+def test_duplicate_request_replays_stored_response(mock_generate, client):
+    first = client.post("/generate-jd", json=JD_BODY, headers=_headers("retry-1"))
+    second = client.post("/generate-jd", json=JD_BODY, headers=_headers("retry-1"))
+
+    assert first.status_code == second.status_code == 200
+    assert second.get_json() == first.get_json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert mock_generate.call_count == 1
+
+    client.post("/generate-jd", json=JD_BODY, headers=AUTH)
+    client.post("/generate-jd", json=JD_BODY, headers=_headers("retry-2"))
+    assert mock_generate.call_count == 3
+
+@patch("app.services.openai_service.generate_job_description", return_value="A job description")
+def test_key_reused_with_different_body_is_rejected(mock_generate, client):
+    client.post("/generate-jd", json=JD_BODY, headers=_headers("retry-1"))
+    response = client.post("/generate-jd", json={**JD_BODY, "title": "Designer"}, headers=_headers("retry-1"))
+    assert response.status_code == 422
+    assert mock_generate.call_count == 1
+
+@patch("app.services.openai_service.generate_job_description", side_effect=Exception("API Error"))
+def test_server_error_releases_key(mock_generate, client):
+    assert client.post("/generate-jd", json=JD_BODY, headers=_headers("retry-1")).status_code == 500
+    assert client.post("/generate-jd", json=JD_BODY, headers=_headers("retry-1")).status_code == 500
+    assert mock_generate.call_count == 2
+
+@patch("app.routes.ai_routes.extract_text_from_resume", return_value="Resume text")
+@patch("app.services.openai_service.screen_resume", return_value="Fit Score: 80")
+def test_multipart_uploads_are_fingerprinted_by_content(mock_screen, mock_extract, client):
+    def post(content):
+        data = {"job_description": "Python developer", "resume": (io.BytesIO(content), "resume.pdf")}
+        return client.post("/screen-resume", data=data, content_type="multipart/form-data", headers=_headers("upload-1"))
+
+    assert post(b"%PDF-1.4 one").status_code == 200
+    assert post(b"%PDF-1.4 one").headers["Idempotent-Replayed"] == "true"
+    assert post(b"%PDF-1.4 two").status_code == 422
+    assert mock_screen.call_count == 1
+
+def test_concurrent_duplicates_wait_for_the_first_request(app):
+    calls = []
+
+    def slow_generate(*args):
+        calls.append(args)
+        time.sleep(0.3)
+        return "A job description"
+
+    responses = []
+
+    def post():
+        with app.test_client() as client:
+            responses.append(client.post("/generate-jd", json=JD_BODY, headers=_headers("concurrent-1")))
+
+    with patch("app.services.openai_service.generate_job_description", side_effect=slow_generate):
+        threads = [threading.Thread(target=post) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(calls) == 1
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert len({response.get_data() for response in responses}) == 1
@@ -0,0 +1,90 @@
+import base64
+import io
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+from app.services import jd_registry
+from app.utils.kv_store import KVStore
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+JD = "Senior Backend Engineer\n\nWe need   Python, Flask and Kubernetes experience.\n"
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         app.test_client() as client:
+        yield client
+
+def test_kv_store_add_get_and_ttl(tmp_path):
+    store = KVStore(str(tmp_path / "kv.sqlite3"))
+    assert store.add("ns", "a", {"n": 1})
+    assert not store.add("ns", "a", {"n": 2})
+    assert store.get("ns", "a") == {"n": 1}
+    store.set("ns", "short", "lived", ttl=0.01)
+    time.sleep(0.02)
+    assert store.get("ns", "short") is None
+    assert store.add("ns", "short", "again")
+    assert [key for key, _ in store.items("ns")] == ["a", "short"]
+
+def test_register_jd_precomputes_artifacts_and_is_idempotent():
+    record, created = jd_registry.register_jd(JD)
+    assert created
+    assert record["id"].startswith("jd_")
+    assert record["text"] == "Senior Backend Engineer\nWe need Python, Flask and Kubernetes experience."
+    assert record["required_skills"] == ["Flask", "Kubernetes", "Python"]
+    assert record["token_count"] > 0
+
+    again, created_again = jd_registry.register_jd("Senior Backend Engineer\nWe need Python, Flask and Kubernetes experience.")
+    assert not created_again
+    assert again["id"] == record["id"]
+    assert jd_registry.get_jd(record["id"]) == record
+
+def test_register_jd_requires_text():
+    with pytest.raises(ValueError):
+        jd_registry.register_jd("   ")
+
+def test_jd_routes(client):
+    response = client.post("/jds", json={"job_description": JD}, headers=AUTH)
+    assert response.status_code == 201
+    jd_id = response.get_json()["id"]
+    assert client.post("/jds", json={"job_description": JD}, headers=AUTH).status_code == 200
+    assert client.get(f"/jds/{jd_id}", headers=AUTH).get_json()["required_skills"] == ["Flask", "Kubernetes", "Python"]
+    assert client.get("/jds/jd_missing", headers=AUTH).status_code == 404
+
+def test_generate_jd_auto_registers(client):
+    with patch("app.services.openai_service.generate_job_description", return_value="Generated JD for Python"):
+        response = client.post("/generate-jd", json={"title": "Engineer", "seniority": "Senior", "skills": ["Python"]}, headers=AUTH)
+    jd_id = response.get_json()["jd_id"]
+    assert jd_registry.get_jd(jd_id)["source"] == "generate-jd"
+
+def test_screen_resume_by_jd_id(client):
+    record, _ = jd_registry.register_jd(JD)
+    with patch("app.routes.ai_routes.extract_text_from_resume", return_value="Python and Flask developer"), \
+         patch("app.services.openai_service.screen_resume", return_value="Screened!") as mock_screen:
+        response = client.post(
+            "/screen-resume",
+            data={"jd_id": record["id"], "resume": (io.BytesIO(b"%PDF-1.4 mock"), "resume.pdf")},
+            content_type="multipart/form-data",
+            headers=AUTH,
+        )
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["jd_id"] == record["id"]
+    assert body["skill_match"]["missing"] == ["Kubernetes"]
+    assert mock_screen.call_args[0][0] == record["text"]
+
+def test_screen_resume_unknown_jd_id(client):
+    response = client.post(
+        "/screen-resume",
+        data={"jd_id": "jd_nope", "resume": (io.BytesIO(b"%PDF-1.4 mock"), "resume.pdf")},
+        content_type="multipart/form-data",
+        headers=AUTH,
+    )
+    assert response.status_code == 404
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+from app.services import openai_service
+from app.utils.near_duplicates import LSHIndex, MinHasher, estimate_similarity, shingles
+
+RESUME = (
+    "Senior backend engineer with eight years of experience building Python and Flask services. "
+    "Led the migration of a monolith to microservices on Kubernetes, cut p99 latency by forty percent, "
+    "and mentored a team of five engineers. Designed PostgreSQL schemas, tuned slow queries, built CI/CD "
+    "pipelines with GitHub Actions and owned on-call for the payments platform serving two million users. "
+    "Earlier worked as a data analyst writing SQL reports and dashboards for the finance organisation."
+)
+EDITED = RESUME.replace("five engineers", "six engineers").replace("Earlier worked", "Previously worked")
+UNRELATED = (
+    "Pastry chef with a decade in fine dining kitchens, responsible for seasonal dessert menus, "
+    "supplier relationships, food cost control and training junior cooks in lamination and sugar work."
+)
+
+
+def fake_openai_response(content):
+    FakeMsg = type("FakeMsg", (object,), {"content": content})
+    FakeChoice = type("FakeChoice", (object,), {"message": FakeMsg()})
+    return type("FakeResp", (object,), {"choices": [FakeChoice()]})()
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+def test_minhash_estimates_jaccard_similarity():
+    hasher = MinHasher(num_perm=128)
+    exact = jaccard(shingles(RESUME), shingles(EDITED))
+    estimate = estimate_similarity(hasher.signature(RESUME), hasher.signature(EDITED))
+    assert abs(exact - estimate) < 0.15
+    assert estimate_similarity(hasher.signature(RESUME), hasher.signature(UNRELATED)) < 0.1
+
+def test_lsh_index_finds_near_duplicates_only():
+    hasher = MinHasher(num_perm=64)
+    index = LSHIndex(num_perm=64, bands=16)
+    index.add("original", hasher.signature(RESUME))
+    index.add("chef", hasher.signature(UNRELATED))
+    matches = index.query(hasher.signature(EDITED), threshold=0.5)
+    assert [key for key, _ in matches] == ["original"]
+
+def test_lsh_index_evicts_oldest_entries():
+    hasher = MinHasher(num_perm=16)
+    index = LSHIndex(num_perm=16, bands=4, max_entries=1)
+    index.add("first", hasher.signature(RESUME))
+    index.add("second", hasher.signature(UNRELATED))
+    assert len(index) == 1
+    assert index.query(hasher.signature(RESUME), threshold=0.9) == []
+
+def test_screen_resume_reuses_result_for_near_duplicate():
+    job_desc = "Backend engineer with Python, Flask and Kubernetes (near-duplicate test)"
+    with patch("app.services.openai_service.Config.NEAR_DUP_THRESHOLD", 0.5), \
+         patch("app.services.screening_memo.Config.NEAR_DUP_THRESHOLD", 0.5), \
+         patch("app.services.openai_service.client.chat.completions.create", return_value=fake_openai_response("Fit score: 88")) as mock_openai:
+        first = openai_service.screen_resume(job_desc, RESUME)
+        second = openai_service.screen_resume(job_desc, EDITED)
+        assert mock_openai.call_count == 1
+        assert second == first == "Fit score: 88"
+        assert second.near_duplicate_of["similarity"] >= 0.5
+        assert first.near_duplicate_of is None
+
+        # The same resume against a different job description is screened again
+        openai_service.screen_resume(job_desc + " and Go", EDITED)
+        assert mock_openai.call_count == 2
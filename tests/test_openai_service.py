@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from app.services import openai_service
 import pytest
 
@@ -164,3 +164,102 @@ def test_generate_feedback_email_acceptance():
     assert "ahmed ali" in email.lower()
     assert "machine learning engineer" in email.lower()
     assert "offer acceptance" in email.lower() or "thank you" in email.lower()
+
+def test_service_results_carry_template_id():
+    with patch("app.services.openai_service.Config.QUESTION_BANK_ENABLED", False), \
+         patch("app.services.openai_service.client.chat.completions.create", return_value=fake_openai_response("Questions")):
+        questions = openai_service.generate_screening_questions("Backend Engineer", ["Python"])
+    assert questions == "Questions"
+    assert questions.template_id.startswith("generate_questions@v")
+    assert questions.cached is False
+
+def test_response_cache_is_keyed_by_template_version():
+    from app.utils.cache import LRUCache
+    with patch("app.services.openai_service._response_cache", LRUCache(max_size=8)), \
+         patch("app.services.openai_service.client.chat.completions.create", return_value=fake_openai_response("Cached JD")) as mock_openai:
+        first = openai_service.generate_job_description("Backend Engineer", "Senior", ["Python"], "Remote")
+        second = openai_service.generate_job_description("Backend Engineer", "Senior", ["Python"], "Remote")
+        assert mock_openai.call_count == 1
+        assert first == second == "Cached JD"
+        assert second.cached is True
+
+        # A different template version must miss the cache
+        template = openai_service.prompt_templates.registry.get("generate_jd")
+        other = openai_service.prompt_templates.PromptTemplate("generate_jd", "v999", "Other {title}")
+        with patch("app.services.openai_service.prompt_templates.registry.get", return_value=other):
+            openai_service.generate_job_description("Backend Engineer", "Senior", ["Python"], "Remote")
+        assert mock_openai.call_count == 2
+        assert template.id != other.id
+
+def test_parse_fit_score():
+    assert openai_service.parse_fit_score("Fit score: 85/100\nStrengths: ...") == 85
+    assert openai_service.parse_fit_score("**Fit Score out of 100:** 42") == 42
+    assert openai_service.parse_fit_score("No score given") is None
+    assert openai_service.parse_fit_score("Fit score: 250") is None
+
+def test_model_routing_uses_task_model():
+    with patch.dict("app.services.openai_service.Config.MODEL_ROUTES", {"feedback_email": "small-model"}), \
+         patch("app.services.openai_service.client.chat.completions.create", return_value=fake_openai_response("Email")) as mock_openai:
+        email = openai_service.generate_feedback_email("Jane", "Designer", "rejected")
+    assert mock_openai.call_args[1]["model"] == "small-model"
+    assert email.model == "small-model"
+
+def test_screen_resume_cascade_keeps_confident_small_model_answer():
+    with patch("app.services.openai_service.Config.SCREEN_CASCADE_MODELS", ["small", "large"]), \
+         patch("app.services.openai_service.client.chat.completions.create", return_value=fake_openai_response("Fit score: 20")) as mock_openai:
+        result = openai_service.screen_resume("Python developer", "Barista for 5 years")
+    assert mock_openai.call_count == 1
+    assert result.model == "small"
+
+def test_screen_resume_cascade_escalates_near_threshold_and_on_invalid_output():
+    responses = [fake_openai_response("Fit score: 72"), fake_openai_response("Fit score: 90")]
+    with patch("app.services.openai_service.Config.SCREEN_CASCADE_MODELS", ["small", "large"]), \
+         patch("app.services.openai_service.Config.SCREEN_DECISION_THRESHOLD", 70), \
+         patch("app.services.openai_service.Config.SCREEN_ESCALATION_BAND", 10), \
+         patch("app.services.openai_service.client.chat.completions.create", side_effect=responses) as mock_openai:
+        result = openai_service.screen_resume("Python developer", "Python developer, 5 years")
+    assert [call[1]["model"] for call in mock_openai.call_args_list] == ["small", "large"]
+    assert result == "Fit score: 90"
+
+    responses = [fake_openai_response("I cannot evaluate this."), fake_openai_response("Fit score: 55")]
+    with patch("app.services.openai_service.Config.SCREEN_CASCADE_MODELS", ["small", "large"]), \
+         patch("app.services.openai_service.client.chat.completions.create", side_effect=responses) as mock_openai:
+        result = openai_service.screen_resume("Python developer", "Python developer, 2 years")
+    assert mock_openai.call_count == 2
+    assert result.model == "large"
+
+def fake_stream(*pieces):
+    # Helper to mimic a streamed completion: one chunk per piece
+    def chunk(text):
+        delta = type("FakeDelta", (object,), {"content": text})()
+        choice = type("FakeStreamChoice", (object,), {"delta": delta})()
+        return type("FakeChunk", (object,), {"choices": [choice], "usage": None})()
+    stream = MagicMock()
+    stream.__iter__.return_value = iter([chunk(piece) for piece in pieces])
+    return stream
+
+def test_hedged_task_streams_completion():
+    with patch("app.services.openai_service.Config.QUESTION_BANK_ENABLED", False), \
+         patch("app.services.openai_service.Config.HEDGED_TASKS", ["generate_questions"]), \
+         patch("app.services.openai_service.client.chat.completions.create", return_value=fake_stream("1. Why ", "Python?")) as mock_openai:
+        questions = openai_service.generate_screening_questions("Backend Engineer", ["Python"])
+    assert questions == "1. Why Python?"
+    assert mock_openai.call_args[1]["stream"] is True
+    mock_openai.return_value.close.assert_called_once()
+
+def test_screen_resume_sends_compact_resume_text():
+    resume_text = "Jane Doe\njane@example.com\nSKILLS\n• Python\n• Flask"
+    with patch("app.services.openai_service.client.chat.completions.create", return_value=fake_openai_response("Fit score: 80")) as mock_openai:
+        openai_service.screen_resume("Python developer", resume_text)
+    prompt = mock_openai.call_args[1]["messages"][0]["content"]
+    assert "SKILLS:\n- Python\n- Flask" in prompt
+    assert "jane@example.com" not in prompt
+
+def test_screen_resume_with_skill_match_uses_local_results():
+    skill_match = {"required": ["Flask", "Python"], "matched": ["Python"], "missing": ["Flask"], "extra": []}
+    with patch("app.services.openai_service.client.chat.completions.create", return_value=fake_openai_response("Fit score: 60")) as mock_openai:
+        result = openai_service.screen_resume("Python and Flask developer", "Python developer", skill_match=skill_match)
+    prompt = mock_openai.call_args[1]["messages"][0]["content"]
+    assert "- Missing: Flask" in prompt
+    assert "missing keywords" not in prompt
+    assert result.template_id.startswith("screen_resume_with_skills@")
@@ -0,0 +1,43 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.utils import memory, metrics, parser_pool
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "test_documents", "Ahnaf_Khan_Resume.pdf")
+
+
+@pytest.fixture(autouse=True)
+def small_parser_pool():
+    with patch("app.utils.parser_pool.Config.PARSER_WORKERS", 1):
+        yield
+        parser_pool.shutdown()
+
+def sample_bytes():
+    with open(SAMPLE_PDF, "rb") as f:
+        return f.read()
+
+def test_rss_helpers_report_plausible_values():
+    assert 0 < memory.current_rss_bytes() <= memory.peak_rss_bytes() * 1.05
+
+def test_submit_returns_text_and_keeps_pool_under_limit():
+    with patch("app.utils.parser_pool.Config.PARSER_MAX_RSS_MB", 0):
+        pool = parser_pool.get_pool()
+        assert parser_pool.submit(sample_bytes(), "\f").result().strip()
+        assert parser_pool.get_pool() is pool
+
+def test_pool_is_recycled_when_a_worker_exceeds_rss_limit():
+    before = metrics.counter("parser_pool.recycled")
+    with patch("app.utils.parser_pool.Config.PARSER_MAX_RSS_MB", 1):
+        pool = parser_pool.get_pool()
+        first = parser_pool.submit(sample_bytes())
+        assert first.result().strip()
+        assert metrics.counter("parser_pool.recycled") == before + 1
+        # Later work goes to a fresh pool
+        assert parser_pool.get_pool() is not pool
+        assert parser_pool.submit(sample_bytes()).result().strip()
+
+def test_errors_propagate_from_workers():
+    with pytest.raises(ValueError):
+        parser_pool.submit(b"%PDF-1.4 not really a pdf").result()
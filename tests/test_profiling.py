@@ -0,0 +1,75 @@
+import base64
+import pstats
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+from app.utils.profiling import StackSampler
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+QUESTIONS_BODY = {"title": "Backend Engineer", "skills": ["Python"]}
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         patch("app.utils.profiling.Config.PROFILE_DIR", str(tmp_path / "profiles")), \
+         app.test_client() as client:
+        yield client
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_stack_sampler_folds_samples_root_first():
+    done = threading.Event()
+    worker = threading.Thread(target=lambda: (_busy(0.1), done.set()))
+    worker.start()
+    sampler = StackSampler(worker.ident, interval=0.001).start()
+    done.wait()
+    sampler.stop()
+    worker.join()
+
+    lines = sampler.folded().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert stack.split(";")[0].startswith("threading:")
+    assert any("test_profiling:_busy" in line for line in lines)
+
+@patch("app.services.openai_service.generate_screening_questions", side_effect=lambda *args: _busy(0.05) or "Questions")
+def test_flagged_request_writes_profile(mock_generate, client, tmp_path):
+    response = client.post("/generate-questions", json=QUESTIONS_BODY, headers={**AUTH, "X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert "generate_questions" in profile_id
+
+    stats = pstats.Stats(str(tmp_path / "profiles" / f"{profile_id}.prof"))
+    assert any(func[2] == "generate_questions" for func in stats.stats)
+
+    assert client.get("/profiles", headers=AUTH).get_json() == {"profiles": [profile_id]}
+    folded = client.get(f"/profiles/{profile_id}", headers=AUTH)
+    assert folded.status_code == 200
+    assert "generate_questions" in folded.get_data(as_text=True)
+    assert client.get(f"/profiles/{profile_id}?format=prof", headers=AUTH).status_code == 200
+    assert client.get("/profiles/missing", headers=AUTH).status_code == 404
+
+@patch("app.services.openai_service.generate_screening_questions", return_value="Questions")
+def test_requests_are_not_profiled_unless_flagged_or_sampled(mock_generate, client):
+    response = client.post("/generate-questions", json=QUESTIONS_BODY, headers=AUTH)
+    assert "X-Profile-Id" not in response.headers
+
+    with patch("app.utils.profiling.Config.PROFILE_SAMPLE_RATE", 1.0):
+        response = client.post("/generate-questions", json=QUESTIONS_BODY, headers=AUTH)
+    assert "X-Profile-Id" in response.headers
+
+    unauthenticated = client.post("/generate-questions", json=QUESTIONS_BODY, headers={"X-Profile": "1"})
+    assert unauthenticated.status_code == 401
+    assert "X-Profile-Id" not in unauthenticated.headers
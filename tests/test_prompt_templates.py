@@ -0,0 +1,61 @@
+import pytest
+
+from app.services.prompt_templates import PromptTemplate, PromptRegistry, registry
+
+
+def write_template(directory, filename, source):
+    (directory / filename).write_text(source + "\n", encoding="utf-8")
+
+
+def test_template_renders_placeholders():
+    template = PromptTemplate("greeting", "v1", "Hello {name}, welcome to {team}.")
+    assert template.id == "greeting@v1"
+    assert template.fields == {"name", "team"}
+    assert template.render(name="Ada", team="Platform") == "Hello Ada, welcome to Platform."
+
+def test_template_does_not_reinterpret_braces_in_values():
+    template = PromptTemplate("echo", "v1", "Resume:\n{resume_text}")
+    assert template.render(resume_text="uses {curly} braces") == "Resume:\nuses {curly} braces"
+
+def test_template_missing_value_raises():
+    template = PromptTemplate("greeting", "v1", "Hello {name}")
+    with pytest.raises(ValueError) as exc_info:
+        template.render()
+    assert "name" in str(exc_info.value)
+
+def test_template_rejects_format_specs():
+    with pytest.raises(ValueError):
+        PromptTemplate("bad", "v1", "Score: {score:.2f}")
+
+def test_registry_serves_highest_version_by_default(tmp_path):
+    write_template(tmp_path, "greeting.v1.txt", "Hello {name}")
+    write_template(tmp_path, "greeting.v2.txt", "Hi {name}")
+    write_template(tmp_path, "README.md", "not a template")
+    reg = PromptRegistry.from_directory(tmp_path)
+    assert reg.names() == ["greeting"]
+    assert reg.versions("greeting") == ["v1", "v2"]
+    assert reg.get("greeting").id == "greeting@v2"
+    assert reg.get("greeting", "v1").render(name="Ada") == "Hello Ada"
+
+def test_registry_honours_pinned_version(tmp_path):
+    write_template(tmp_path, "greeting.v1.txt", "Hello {name}")
+    write_template(tmp_path, "greeting.v2.txt", "Hi {name}")
+    reg = PromptRegistry.from_directory(tmp_path, {"greeting": "v1"})
+    assert reg.get("greeting").id == "greeting@v1"
+
+def test_registry_weighted_rollout_only_serves_listed_versions(tmp_path):
+    write_template(tmp_path, "greeting.v1.txt", "Hello {name}")
+    write_template(tmp_path, "greeting.v2.txt", "Hi {name}")
+    write_template(tmp_path, "greeting.v3.txt", "Hey {name}")
+    reg = PromptRegistry.from_directory(tmp_path, {"greeting": "v1:50|v2:50"})
+    served = {reg.get("greeting").version for _ in range(200)}
+    assert served == {"v1", "v2"}
+
+def test_registry_rejects_unknown_versions(tmp_path):
+    write_template(tmp_path, "greeting.v1.txt", "Hello {name}")
+    with pytest.raises(ValueError):
+        PromptRegistry.from_directory(tmp_path, {"greeting": "v9"})
+
+def test_bundled_templates_are_loaded():
+    for name in ["generate_jd", "screen_resume", "generate_questions", "evaluate_answers", "feedback_email"]:
+        assert name in registry.names()
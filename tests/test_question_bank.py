@@ -0,0 +1,80 @@
+import base64
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import create_app
+from app.services import openai_service, question_bank
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+
+
+def fake_completion(content):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    response.usage = None
+    return response
+
+def questions_for(**kwargs):
+    # Each generated entry gets questions naming what they were generated for
+    prompt = kwargs["messages"][0]["content"]
+    subject = prompt.split(" skills.")[0].rsplit("candidate's ", 1)[-1] if "skills." in prompt else "the role"
+    return fake_completion("\n".join(f"{n}. Question {n} about {subject}?" for n in range(1, 6)))
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         app.test_client() as client:
+        yield client
+
+def test_normalize_skills_uses_taxonomy_and_dedupes():
+    assert question_bank.normalize_skills(["k8s", " Kubernetes ", "python", "Domain  Modelling"]) == [
+        ("kubernetes", "Kubernetes"),
+        ("python", "Python"),
+        ("domain modelling", "Domain Modelling"),
+    ]
+
+def test_parse_questions_strips_numbering():
+    assert question_bank.parse_questions("1. First?\n\n2) Second?\n- Third?") == ["First?", "Second?", "Third?"]
+
+def test_questions_are_assembled_from_bank_and_only_unseen_skills_hit_llm():
+    with patch("app.services.openai_service.client.chat.completions.create", side_effect=questions_for) as mock_openai:
+        first = openai_service.generate_screening_questions("Backend Engineer", ["Python", "Flask"])
+        assert mock_openai.call_count == 3  # title + two skills
+        assert first.cached is False
+        assert "generate_skill_questions@v1" in first.template_id
+
+        # Same skills in a different order and casing: served entirely from the bank
+        second = openai_service.generate_screening_questions("backend  engineer", ["flask", "PYTHON"])
+        assert mock_openai.call_count == 3
+        assert second.cached is True
+
+        third = openai_service.generate_screening_questions("Backend Engineer", ["Python", "Docker"])
+        assert mock_openai.call_count == 4
+
+    lines = first.splitlines()
+    assert len(lines) == 6
+    assert lines[0] == "1. Question 1 about the role?"
+    assert "3. Question 1 about Python?" in lines
+    assert "6. Question 2 about Flask?" in lines
+    assert "Docker" in third and "Flask" not in third
+
+def test_failed_generation_is_not_banked():
+    with patch("app.services.openai_service.client.chat.completions.create", side_effect=Exception("API Error")):
+        with pytest.raises(RuntimeError):
+            openai_service.generate_screening_questions("Backend Engineer", ["Python"])
+    assert question_bank.get_entry("skill", "python") is None
+
+def test_registering_jd_prefills_bank_in_background(client):
+    with patch("app.services.openai_service.Config.QUESTION_BANK_PREFILL", True), \
+         patch("app.services.openai_service.client.chat.completions.create", side_effect=questions_for) as mock_openai:
+        response = client.post("/jds", json={"job_description": "We need Python and Kubernetes."}, headers=AUTH)
+        assert response.status_code == 201
+        for future in list(openai_service._bank_futures.values()):
+            future.result()
+    assert mock_openai.call_count == 2
+    assert question_bank.get_entry("skill", "kubernetes")["name"] == "Kubernetes"
+    assert openai_service.prefill_question_bank(["Python", "Kubernetes"]) == 0
@@ -0,0 +1,120 @@
+import base64
+import io
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+from app.services import requisition_pipeline
+from app.utils import parser_pool
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "test_documents", "Ahnaf_Khan_Resume.pdf")
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+REQUISITION = {"title": "Backend Engineer", "seniority": "Senior", "skills": ["Python", "Flask"], "tone": "friendly"}
+
+
+@pytest.fixture(autouse=True, scope="module")
+def small_parser_pool():
+    with patch("app.utils.parser_pool.Config.PARSER_WORKERS", 2):
+        yield
+        parser_pool.shutdown()
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         app.test_client() as client:
+        yield client
+
+@pytest.fixture
+def fake_services():
+    jd_done = threading.Event()
+
+    def generate_jd(*args):
+        time.sleep(0.1)
+        jd_done.set()
+        return "Backend Engineer: Python and Flask services."
+
+    def generate_questions(title, skills):
+        # Runs alongside JD generation because the requisition lists its skills
+        return f"1. Questions while JD pending: {not jd_done.is_set()}"
+
+    def screen(job_desc, resume_text, skill_match=None):
+        return "Fit score: 85" if "Python" in resume_text else "Fit score: 30"
+
+    def feedback(names, title, outcome, tone="professional", variants=1):
+        return [{"candidate_name": names[0], "email": f"Dear {names[0]}: {outcome}", "variant": 0}], ["feedback_email_template@v1"]
+
+    with patch("app.services.openai_service.generate_job_description", side_effect=generate_jd), \
+         patch("app.services.openai_service.generate_screening_questions", side_effect=generate_questions), \
+         patch("app.services.openai_service.screen_resume", side_effect=screen), \
+         patch("app.services.openai_service.generate_feedback_emails", side_effect=feedback):
+        yield
+
+def test_pipeline_runs_stages_as_a_graph(fake_services):
+    applicants = [
+        {"candidate_name": "Jane", "resume_text": "Python developer, 5 years of Flask."},
+        {"candidate_name": "Li", "resume_text": "Barista for 5 years."},
+    ]
+    events = list(requisition_pipeline.build_pipeline({"requisition": REQUISITION, "applicants": applicants}))
+    by_task = {event["task"]: event for event in events}
+
+    assert by_task["questions"]["result"]["questions"] == "1. Questions while JD pending: True"
+    assert by_task["jd"]["result"]["jd_id"].startswith("jd_")
+    assert by_task["screen:0"]["result"]["fit_score"] == 85
+    assert by_task["screen:0"]["started_ms"] >= by_task["jd"]["started_ms"] + by_task["jd"]["elapsed_ms"]
+    assert by_task["feedback:0"]["result"]["outcome"] == "accepted"
+    assert by_task["feedback:1"]["result"]["email"] == "Dear Li: rejected"
+    assert by_task["feedback:1"]["candidate_name"] == "Li"
+
+    summary = events[-1]
+    assert summary["status"] == "summary"
+    assert (summary["ok"], summary["error"], summary["skipped"]) == (6, 0, 0)
+    assert set(summary["stage_ms"]) == {"job_description", "questions", "screen", "feedback"}
+
+def test_failed_screening_skips_only_that_applicants_feedback(fake_services):
+    applicants = [{"candidate_name": "Jane", "resume_text": "Python"}, {"candidate_name": "Li", "resume_text": "Flask"}]
+    with patch("app.services.openai_service.screen_resume", side_effect=["Fit score: 90", RuntimeError("Failed to screen resume")]):
+        events = list(requisition_pipeline.build_pipeline({
+            "requisition": {"job_description": "Python and Flask developer", "title": "Backend Engineer"},
+            "applicants": applicants,
+        }))
+    statuses = sorted(event["status"] for event in events if event["task"].startswith("feedback"))
+    assert statuses == ["ok", "skipped"]
+    assert events[-1]["error"] == 1
+
+def test_invalid_specs_are_rejected_up_front():
+    for spec in [
+        {"applicants": [{"candidate_name": "Jane", "resume_text": "x"}]},
+        {"requisition": {"title": "Engineer"}, "applicants": [{"candidate_name": "Jane", "resume_text": "x"}]},
+        {"requisition": REQUISITION, "applicants": []},
+        {"requisition": REQUISITION, "applicants": [{"candidate_name": "Jane", "resume_file": "missing"}]},
+        {"requisition": {**REQUISITION, "tone": "sarcastic"}, "applicants": [{"candidate_name": "Jane", "resume_text": "x"}]},
+        {"requisition": {"jd_id": "jd_unknown"}, "applicants": [{"candidate_name": "Jane", "resume_text": "x"}]},
+    ]:
+        with pytest.raises(ValueError):
+            requisition_pipeline.build_pipeline(spec)
+
+def test_pipeline_route_streams_ndjson_with_uploaded_resumes(client, fake_services):
+    spec = {"requisition": REQUISITION, "applicants": [{"candidate_name": "Ahnaf", "resume_file": "resume_ahnaf"}]}
+    with open(SAMPLE_PDF, "rb") as f:
+        data = {"spec": json.dumps(spec), "resume_ahnaf": (io.BytesIO(f.read()), "ahnaf.pdf")}
+    response = client.post("/pipeline", data=data, content_type="multipart/form-data", headers=AUTH)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    by_task = {event["task"]: event for event in events}
+    assert by_task["extract:0"]["status"] == "ok"
+    assert by_task["extract:0"]["result"]["resume_text"].strip()
+    assert by_task["screen:0"]["status"] == "ok"
+    assert events[-1]["status"] == "summary"
+
+    bad = client.post("/pipeline", json={"requisition": REQUISITION}, headers=AUTH)
+    assert bad.status_code == 400
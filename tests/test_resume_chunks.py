@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock, patch
+
+from app.services import openai_service, resume_chunks
+from app.utils.tokens import estimate_tokens
+
+PUBLICATIONS = [f"- Paper {n}: Scalable inference for distributed graph models, Journal of ML {2000 + n}." for n in range(60)]
+RESUME = "\n".join([
+    "Dr. Jane Doe",
+    "jane.doe@example.com",
+    "Summary",
+    "Research engineer working on large-scale machine learning systems.",
+    "Experience",
+    "- Example Labs, Staff Research Engineer (2015 - present). Built Python and Kubernetes training pipelines.",
+    "Publications",
+    *PUBLICATIONS,
+    "Skills",
+    "Python, PyTorch, Kubernetes, Spark",
+])
+
+
+def fake_completion(content):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    response.usage = None
+    return response
+
+def fake_create(**kwargs):
+    prompt = kwargs["messages"][-1]["content"]
+    if "Resume excerpt:" in prompt:
+        return fake_completion("- summarized " + prompt.split("Resume excerpt:\n")[1].split("\n")[0])
+    return fake_completion("Fit score: 82\nStrengths: ...")
+
+def test_split_chunks_keeps_sections_whole_and_splits_long_ones():
+    chunks = resume_chunks.split_chunks(RESUME, 300)
+    assert len(chunks) > 2
+    assert all(estimate_tokens(chunk) <= 330 for chunk in chunks)
+    assert chunks[0].startswith("SUMMARY:\n")
+    assert "EXPERIENCE:" in chunks[0]
+    assert any(chunk.startswith("PUBLICATIONS (part 2):") for chunk in chunks)
+    assert "jane.doe@example.com" not in "".join(chunks)
+    # Every publication survives, in order
+    joined = "\n".join(chunks)
+    assert [line for line in joined.splitlines() if line.startswith("- Paper")] == PUBLICATIONS
+
+def test_long_resume_is_screened_map_reduce_with_cached_chunk_summaries():
+    with patch("app.services.openai_service.Config.SCREEN_CHUNKED_MIN_TOKENS", 500), \
+         patch("app.services.openai_service.Config.SCREEN_CHUNK_TOKENS", 300), \
+         patch("app.services.openai_service.client.chat.completions.create", side_effect=fake_create) as mock_openai:
+        result = openai_service.screen_resume("Senior ML engineer with Python.", RESUME)
+        map_calls = mock_openai.call_count - 1
+        reduce_prompt = mock_openai.call_args.kwargs["messages"][-1]["content"]
+
+        # A different job reuses every chunk summary: only the reduce call is made
+        again = openai_service.screen_resume("Data platform lead with Spark.", RESUME)
+
+    assert map_calls == len(resume_chunks.split_chunks(openai_service.compact_resume(RESUME), 300)) > 1
+    assert mock_openai.call_count == map_calls + 2
+    assert result.template_id == "screen_resume_chunked@v1"
+    assert openai_service.parse_fit_score(result) == 82
+    assert "section summaries" in reduce_prompt and "- summarized SUMMARY:" in reduce_prompt
+    assert "Paper 59" not in reduce_prompt
+    assert openai_service.parse_fit_score(again) == 82
+
+def test_short_resume_uses_single_call():
+    with patch("app.services.openai_service.client.chat.completions.create", side_effect=fake_create) as mock_openai:
+        result = openai_service.screen_resume("Senior ML engineer with Python.", "Skills\nPython, PyTorch")
+    assert mock_openai.call_count == 1
+    assert result.template_id == "screen_resume@v1"
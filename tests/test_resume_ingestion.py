@@ -0,0 +1,95 @@
+import base64
+import io
+import json
+import os
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+from app.services import resume_ingestion
+from app.utils import parser_pool
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "test_documents", "Ahnaf_Khan_Resume.pdf")
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+
+
+@pytest.fixture(autouse=True, scope="module")
+def small_parser_pool():
+    with patch("app.utils.parser_pool.Config.PARSER_WORKERS", 2):
+        yield
+        parser_pool.shutdown()
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         app.test_client() as client:
+        yield client
+
+def build_archive():
+    with open(SAMPLE_PDF, "rb") as f:
+        pdf = f.read()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("batch/alice.pdf", pdf)
+        archive.writestr("batch/alice-copy.pdf", pdf)
+        archive.writestr("batch/broken.pdf", b"%PDF-1.4 not really a pdf")
+        archive.writestr("batch/notes.txt", b"ignored")
+        archive.writestr("__MACOSX/batch/._alice.pdf", b"resource fork")
+    buffer.seek(0)
+    return buffer
+
+def test_ingest_archive_extracts_dedupes_and_summarises():
+    records = list(resume_ingestion.ingest_archive(build_archive()))
+    by_file = {record.get("file"): record for record in records}
+
+    assert by_file["batch/alice.pdf"]["status"] == "ok"
+    assert by_file["batch/alice.pdf"]["resume_text"].strip()
+    assert by_file["batch/alice-copy.pdf"]["status"] == "duplicate"
+    assert by_file["batch/alice-copy.pdf"]["duplicate_of"] == "batch/alice.pdf"
+    assert by_file["batch/broken.pdf"]["status"] == "error"
+    assert "batch/notes.txt" not in by_file
+
+    summary = records[-1]
+    assert summary["status"] == "summary"
+    assert (summary["entries"], summary["ok"], summary["duplicate"], summary["error"]) == (3, 1, 1, 1)
+
+def test_ingest_archive_rejects_oversized_entries():
+    with patch("app.services.resume_ingestion.Config.UPLOAD_MAX_FILE_SIZE", 1024):
+        records = list(resume_ingestion.ingest_archive(build_archive()))
+    assert {record["status"] for record in records[:-1]} == {"error"}
+
+def test_ingest_archive_rejects_non_zip():
+    with pytest.raises(ValueError):
+        resume_ingestion.ingest_archive(io.BytesIO(b"not a zip"))
+
+def test_ingest_resumes_route_streams_ndjson(client):
+    with patch("app.services.openai_service.screen_resume", return_value="Fit score: 80"):
+        response = client.post(
+            "/ingest-resumes",
+            data={"archive": (build_archive(), "resumes.zip"), "job_description": "Python developer"},
+            content_type="multipart/form-data",
+            headers=AUTH,
+        )
+        body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    records = [json.loads(line) for line in body.splitlines()]
+    screened = [record for record in records if record["status"] == "ok"]
+    assert len(screened) == 1
+    assert screened[0]["screening_result"] == "Fit score: 80"
+    assert records[-1]["status"] == "summary"
+
+def test_ingest_resumes_route_rejects_bad_archive(client):
+    response = client.post(
+        "/ingest-resumes",
+        data={"archive": (io.BytesIO(b"nope"), "resumes.zip")},
+        content_type="multipart/form-data",
+        headers=AUTH,
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Archive must be a valid zip file"
@@ -51,4 +51,55 @@ def test_extract_text_from_resume_pdfplumber_raises():
         assert "Invalid file object provided for text extraction." in str(exc_info.value)
         error_calls = [call for call in mock_logger.error.call_args_list if "Error seeking to start of resume file" in str(call)]
         assert len(error_calls) > 0
-    
\ No newline at end of file
+    
+# Test cases for uploads spooled by UploadRequest
+def test_spooled_upload_hashes_and_detects_pdf():
+    import hashlib
+    from app.utils.uploads import SpooledUpload
+
+    upload = SpooledUpload(spool_size=8)
+    upload.write(b"%PDF-1.4 ")
+    upload.write(b"rest of the document")
+    assert upload.size == 29
+    assert upload.is_pdf
+    assert upload.spooled_to_disk
+    assert upload.sha256 == hashlib.sha256(b"%PDF-1.4 rest of the document").hexdigest()
+
+def test_spooled_upload_rejects_oversized_files():
+    from werkzeug.exceptions import RequestEntityTooLarge
+    from app.utils.uploads import SpooledUpload
+
+    upload = SpooledUpload(spool_size=1024, max_file_size=10)
+    with pytest.raises(RequestEntityTooLarge):
+        upload.write(b"x" * 11)
+
+def test_extract_text_from_resume_rejects_non_pdf_upload():
+    from app.utils.uploads import SpooledUpload
+
+    upload = SpooledUpload(spool_size=1024)
+    upload.write(b"PK\x03\x04 definitely a zip")
+    with patch("pdfplumber.open") as mock_open:
+        with pytest.raises(ValueError):
+            extract_text_from_resume(upload)
+    mock_open.assert_not_called()
+
+def test_extract_text_from_spooled_pdf_upload():
+    from app.utils.uploads import SpooledUpload
+
+    sample_pdf_path = os.path.join(os.path.dirname(__file__), "test_documents", "Ahnaf_Khan_Resume.pdf")
+    upload = SpooledUpload(spool_size=1024)
+    with open(sample_pdf_path, "rb") as f:
+        upload.write(f.read())
+    assert upload.spooled_to_disk
+    assert extract_text_from_resume(upload).strip()
+
+def test_extract_text_from_resume_releases_each_page():
+    from pdfplumber.page import Page
+
+    sample_pdf_path = os.path.join(os.path.dirname(__file__), "test_documents", "Ahnaf_Khan_Resume.pdf")
+    with patch.object(Page, "close", autospec=True, side_effect=Page.close) as mock_close, open(sample_pdf_path, "rb") as f:
+        text = extract_text_from_resume(f)
+    assert text.strip()
+    assert mock_close.call_count >= 1
+    closed_page = mock_close.call_args[0][0]
+    assert "_layout" not in closed_page.__dict__
@@ -0,0 +1,51 @@
+import os
+
+from app.utils.resume_parser import extract_text_from_resume
+from app.utils.resume_sections import PAGE_BREAK, compact_resume, segment_resume, strip_page_furniture
+
+MULTI_PAGE_RESUME = PAGE_BREAK.join([
+    "Jane Doe\njane@example.com | +1 555 010 0100\nEXPERIENCE\n"
+    "Backend Engineer (Acme | Remote) 2021 – Present\n• Built Flask APIs serving 2M requests\nper day\n"
+    "Page 1 of 2",
+    "Jane Doe\njane@example.com | +1 555 010 0100\nSoftware Engineer (Initech) 2018 – 2021\n"
+    "• Migrated billing to Python 3\nEducation:\nB.S. Computer Science\nSkills\n"
+    "• Python, Flask, SQL,\nDocker, Kubernetes\nPage 2 of 2",
+])
+
+
+def test_strip_page_furniture_removes_repeated_headers_and_page_numbers():
+    pages = strip_page_furniture(MULTI_PAGE_RESUME.split(PAGE_BREAK))
+    assert "Jane Doe" not in pages[1]
+    assert all("Page" not in line for page in pages for line in page)
+    assert "Software Engineer (Initech) 2018 – 2021" in pages[1]
+
+def test_single_page_keeps_its_header():
+    pages = strip_page_furniture(["Jane Doe\nEXPERIENCE\nEngineer"])
+    assert pages == [["Jane Doe", "EXPERIENCE", "Engineer"]]
+
+def test_segment_resume_groups_lines_by_section():
+    sections = segment_resume(MULTI_PAGE_RESUME)
+    assert list(sections) == ["contact", "experience", "education", "skills"]
+    assert sections["experience"] == [
+        "Backend Engineer (Acme | Remote) 2021 – Present",
+        "- Built Flask APIs serving 2M requests per day",
+        "Software Engineer (Initech) 2018 – 2021",
+        "- Migrated billing to Python 3",
+    ]
+    assert sections["skills"] == ["- Python, Flask, SQL, Docker, Kubernetes"]
+
+def test_compact_resume_omits_contact_details_by_default():
+    compact = compact_resume(MULTI_PAGE_RESUME)
+    assert compact.startswith("EXPERIENCE:\n")
+    assert "jane@example.com" not in compact
+    assert "jane@example.com" in compact_resume(MULTI_PAGE_RESUME, include_contact=True)
+    assert len(compact) < len(MULTI_PAGE_RESUME)
+
+def test_compact_resume_on_sample_pdf():
+    sample_pdf_path = os.path.join(os.path.dirname(__file__), "test_documents", "Ahnaf_Khan_Resume.pdf")
+    with open(sample_pdf_path, "rb") as f:
+        raw = extract_text_from_resume(f, page_separator=PAGE_BREAK)
+    sections = segment_resume(raw)
+    for section in ["experience", "education", "skills", "projects"]:
+        assert sections.get(section), f"{section} section should be detected"
+    assert len(compact_resume(raw)) < len(raw)
@@ -0,0 +1,68 @@
+import base64
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+from app.utils.skill_matcher import SkillMatcher, get_matcher
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+TAXONOMY = {
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Go": ["golang"],
+    "C++": ["c++"],
+    "JavaScript": ["javascript", "js"],
+    "React": ["react", "react.js"],
+    "Machine Learning": ["machine learning", "ml"],
+    "Learning Management": ["learning management"],
+}
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         app.test_client() as client:
+        yield client
+
+def test_find_resolves_aliases_case_insensitively():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.find("Deployed services on K8S with GoLang and C++.") == {"Kubernetes", "Go", "C++"}
+
+def test_find_only_counts_whole_words():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.find("html, xml and golangci-lint") == set()
+    assert matcher.find("Built a React.js front end") == {"React"}
+    assert matcher.find("Wrote plain JS") == {"JavaScript"}
+
+def test_find_reports_overlapping_aliases():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.find("machine learning management") == {"Machine Learning", "Learning Management"}
+
+def test_match_splits_required_skills():
+    matcher = SkillMatcher(TAXONOMY)
+    result = matcher.match("Must know Kubernetes, Golang and React", "5 years of golang and k8s, some ML")
+    assert result == {
+        "required": ["Go", "Kubernetes", "React"],
+        "matched": ["Go", "Kubernetes"],
+        "missing": ["React"],
+        "extra": ["Machine Learning"],
+    }
+
+def test_bundled_taxonomy_loads():
+    assert {"Kubernetes", "Python", "PostgreSQL"} <= get_matcher().find("python, postgres and k8s")
+
+def test_match_skills_route(client):
+    response = client.post("/match-skills", json={
+        "job_description": "Looking for Python and Flask experience",
+        "resume_text": "Built Flask apps",
+    }, headers=AUTH)
+    assert response.status_code == 200
+    assert response.get_json()["skill_match"]["missing"] == ["Python"]
+
+def test_match_skills_route_missing_fields(client):
+    response = client.post("/match-skills", json={"job_description": "Python"}, headers=AUTH)
+    assert response.status_code == 400
+    assert "required" in response.get_json()["error"]
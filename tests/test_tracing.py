@@ -0,0 +1,111 @@
+import base64
+import json
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import create_app
+from app.utils import tracing
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:pass").decode()}
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+class MemoryExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def by_name(self, name):
+        return next(span for span in self.spans if span.name == name)
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = MemoryExporter()
+    monkeypatch.setattr(tracing, "_exporter", exporter)
+    return exporter
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    with patch("app.routes.ai_routes.Config.USERNAME", "user"), \
+         patch("app.routes.ai_routes.Config.PASSWORD", "pass"), \
+         app.test_client() as client:
+        yield client
+
+def fake_completion(content, prompt_tokens=120, completion_tokens=40):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    response.usage = MagicMock(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    return response
+
+def test_parse_traceparent():
+    assert tracing.parse_traceparent(TRACEPARENT) == ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+    assert tracing.parse_traceparent(TRACEPARENT[:-2] + "00")[2] is False
+    assert tracing.parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert tracing.parse_traceparent("garbage") is None
+    assert tracing.parse_traceparent(None) is None
+
+def test_nested_spans_share_trace_and_record_errors(exporter):
+    with tracing.span("outer") as outer:
+        with pytest.raises(RuntimeError):
+            with tracing.span("inner", step=1):
+                raise RuntimeError("boom")
+    inner = exporter.by_name("inner")
+    assert inner.trace_id == outer.trace_id
+    assert inner.parent_span_id == outer.span_id
+    assert inner.attributes["step"] == 1
+    assert inner.status == {"code": "ERROR", "message": "boom"}
+    assert outer.status == {"code": "UNSET"}
+    assert tracing.current_span() is None
+
+def test_request_continues_caller_trace_with_stage_spans(exporter, client):
+    completion = fake_completion("Dear Jane, ...")
+    with patch("app.services.openai_service.client.chat.completions.create", return_value=completion):
+        response = client.post(
+            "/generate-feedback",
+            json={"candidate_name": "Jane", "job_title": "Designer", "outcome": "rejected"},
+            headers={**AUTH, "traceparent": TRACEPARENT},
+        )
+    assert response.status_code == 200
+
+    server = exporter.by_name("POST /generate-feedback")
+    assert server.kind == "server"
+    assert server.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert server.parent_span_id == "00f067aa0ba902b7"
+    assert server.attributes["http.response.status_code"] == 200
+    assert response.headers["traceparent"] == server.traceparent
+
+    for name in ("auth", "prompt.render", "llm.completion"):
+        assert exporter.by_name(name).parent_span_id == server.span_id
+    llm = exporter.by_name("llm.completion")
+    assert llm.attributes["gen_ai.usage.input_tokens"] == 120
+    assert llm.attributes["gen_ai.usage.output_tokens"] == 40
+    assert llm.attributes["llm.cache_hit"] is False
+    assert exporter.by_name("prompt.render").attributes["prompt.template_id"] == "feedback_email@v1"
+
+def test_unsampled_caller_trace_is_not_exported(exporter, client):
+    response = client.get("/health", headers={"traceparent": TRACEPARENT[:-2] + "00"})
+    assert response.headers["traceparent"].endswith("-00")
+    assert exporter.spans == []
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    exporter = tracing.FileExporter(str(tmp_path / "traces" / "spans.jsonl"))
+    span = tracing.start_span("work", attributes={"resume.page_count": 2})
+    span.end_time_unix_nano = span.start_time_unix_nano + 1000
+    exporter.export(span)
+    record = json.loads((tmp_path / "traces" / "spans.jsonl").read_text())
+    assert record["name"] == "work"
+    assert record["traceId"] == span.trace_id
+    assert record["attributes"] == {"resume.page_count": 2}
+
+def test_log_records_carry_trace_ids():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+    with tracing.span("outer") as outer:
+        tracing.TraceContextFilter().filter(record)
+    assert (record.trace_id, record.span_id) == (outer.trace_id, outer.span_id)
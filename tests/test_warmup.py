@@ -0,0 +1,72 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import create_app
+from app.services import warmup
+from app.utils import parser_pool
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(warmup, "_state", {"pid": None, "status": "idle", "steps": {}, "elapsed_ms": None})
+
+
+def wait_until_ready(timeout=30):
+    deadline = time.time() + timeout
+    while not warmup.is_ready():
+        assert time.time() < deadline, "warm-up did not finish"
+        time.sleep(0.01)
+
+
+def test_health_reports_not_ready_until_warmup_finishes():
+    release = threading.Event()
+    steps = (("slow", lambda: release.wait(5) and {}),)
+    with patch.object(warmup, "STEPS", steps), \
+         patch("app.Config.WARMUP_ON_STARTUP", True):
+        client = create_app().test_client()
+        response = client.get("/health")
+        assert response.status_code == 503
+        assert response.get_json()["status"] == "warming_up"
+
+        release.set()
+        wait_until_ready()
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.get_json() == {"status": "ok"}
+
+
+def test_failed_step_is_recorded_but_does_not_block_readiness():
+    def broken():
+        raise ConnectionError("upstream unreachable")
+
+    with patch.object(warmup, "STEPS", (("upstream", broken), ("fine", lambda: {"n": 1}))):
+        assert warmup.start() is True
+        assert warmup.start() is False  # Once per process
+        wait_until_ready()
+
+    status = warmup.status()
+    assert status["steps"]["upstream"]["status"] == "error"
+    assert "unreachable" in status["steps"]["upstream"]["error"]
+    assert status["steps"]["fine"] == {"status": "ok", "n": 1, "elapsed_ms": status["steps"]["fine"]["elapsed_ms"]}
+
+
+def test_default_steps_warm_local_paths_and_upstream_connection():
+    fake_client = MagicMock()
+    with patch.object(warmup.openai_service, "client", fake_client), \
+         patch("app.services.warmup.Config.PARSER_WORKERS", 1), \
+         patch("app.utils.parser_pool.Config.PARSER_WORKERS", 1):
+        try:
+            warmup.start()
+            wait_until_ready()
+        finally:
+            parser_pool.shutdown()
+
+    steps = warmup.status()["steps"]
+    assert [name for name, _ in warmup.STEPS] == list(steps)
+    assert all(step["status"] == "ok" for step in steps.values()), steps
+    assert steps["extraction"]["chars"] > 0
+    assert steps["prompt_templates"]["templates"] > 0
+    fake_client.with_options.return_value.models.list.assert_called_once()